@@ -14,16 +14,27 @@ __all__ = [
     "BufferSerializeFlags",
     "BufferSerializeFormat",
     "Color",
+    "ColorGlyphBitmapCache",
     "ColorLine",
     "ColorStop",
     "DrawFuncs",
     "Face",
     "Font",
+    "FontCollection",
     "FontExtents",
     "FontFuncs",
+    "FontRegistry",
+    "FontRegistryStats",
     "GlyphExtents",
     "GlyphFlags",
     "GlyphInfo",
+    "GlyphAtlas",
+    "GlyphAtlasEntry",
+    "GlyphAtlasPage",
+    "GlyphBitmapCache",
+    "GlyphBitmapCacheStats",
+    "GlyphOutline",
+    "GlyphPaint",
     "GlyphPosition",
     "HBObject",
     "HarfBuzzError",
@@ -46,24 +57,38 @@ __all__ = [
     "OTVarAxisFlags",
     "OTVarAxisInfo",
     "OTVarNamedInstance",
+    "OutlineCacheStats",
+    "OutlineVerb",
     "PaintCompositeMode",
     "PaintExtend",
     "PaintFuncs",
+    "PaintOp",
+    "PaintOperation",
     "RasterDraw",
     "RasterExtents",
     "RasterFormat",
     "RasterImage",
+    "RasterImagePool",
+    "RasterImagePoolStats",
+    "RasterImageView",
     "RasterPaint",
     "RepackerError",
     "SerializerError",
     "Set",
     "SetIter",
     "StyleTag",
+    "SubsetBatch",
+    "SubsetCache",
+    "SubsetCacheStats",
     "SubsetFlags",
     "SubsetInput",
     "SubsetInputSets",
     "SubsetPlan",
+    "VariationInstanceCache",
     "__version__",
+    "draw_buffer",
+    "fit_variation",
+    "measure_variations",
     "ot_color_glyph_get_layers",
     "ot_color_glyph_get_png",
     "ot_color_glyph_get_svg",
@@ -100,12 +125,15 @@ __all__ = [
     "ot_math_is_glyph_extended_shape",
     "ot_tag_to_language",
     "ot_tag_to_script",
+    "rasterize_glyphs",
     "repack",
     "repack_with_tag",
     "serialize",
     "serialize_with_tag",
     "shape",
     "subset",
+    "subset_batch",
     "subset_preprocess",
+    "subset_to_bytes",
     "version_string",
 ]
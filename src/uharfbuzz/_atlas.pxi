@@ -0,0 +1,475 @@
+class GlyphAtlasEntry(NamedTuple):
+    """The location and metrics of a glyph in a :class:`GlyphAtlas`.
+
+    Pixel coordinates are measured from the top-left corner of the page,
+    with rows growing downwards. Bearings are measured in pixels from the
+    glyph origin, with the y-axis pointing up as in the font.
+    """
+    page: int
+    """Index of the page holding the glyph, or ``-1`` if the glyph has no
+    ink."""
+    x: int
+    """Left edge of the glyph in the page."""
+    y: int
+    """Top edge of the glyph in the page."""
+    width: int
+    """Width of the glyph, in pixels."""
+    height: int
+    """Height of the glyph, in pixels."""
+    u0: float
+    """Left edge of the glyph, as a fraction of the page width."""
+    v0: float
+    """Top edge of the glyph, as a fraction of the page height."""
+    u1: float
+    """Right edge of the glyph, as a fraction of the page width."""
+    v1: float
+    """Bottom edge of the glyph, as a fraction of the page height."""
+    x_bearing: int
+    """Distance from the glyph origin to the left edge of the glyph."""
+    y_bearing: int
+    """Distance from the glyph origin to the top edge of the glyph."""
+
+
+cdef class GlyphAtlasPage:
+    """A page of a :class:`GlyphAtlas`, holding the pixels of the glyphs
+    packed into it.
+
+    Pages are created by the atlas and are reused when evicted, so their
+    pixels change as glyphs are added; :attr:`generation` changes every time
+    the page is evicted.
+    """
+
+    cdef uint8_t* _pixels
+    cdef int _index
+    cdef int _width
+    cdef int _height
+    cdef int _stride
+    cdef int _generation
+    cdef object _format
+    # Shelf packing state: one [y, height, next_x] list per shelf
+    cdef list _shelves
+    cdef int _next_y
+    cdef list _keys
+    cdef size_t _last_used
+
+    def __cinit__(self):
+        self._pixels = NULL
+
+    def __dealloc__(self):
+        free(self._pixels)
+
+    @staticmethod
+    cdef GlyphAtlasPage create(int index, int width, int height, object format):
+        cdef GlyphAtlasPage page = GlyphAtlasPage.__new__(GlyphAtlasPage)
+        cdef int bpp = 4 if format == RasterFormat.BGRA32 else 1
+        page._index = index
+        page._width = width
+        page._height = height
+        page._stride = width * bpp
+        page._generation = 0
+        page._format = format
+        page._pixels = <uint8_t*>calloc(<size_t>height * page._stride, 1)
+        if page._pixels is NULL:
+            raise MemoryError()
+        page._shelves = []
+        page._next_y = 0
+        page._keys = []
+        page._last_used = 0
+        return page
+
+    @property
+    def index(self) -> int:
+        """The index of the page in :attr:`GlyphAtlas.pages`.
+
+        :type: int
+        """
+        return self._index
+
+    @property
+    def width(self) -> int:
+        """The width of the page, in pixels.
+
+        :type: int
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """The height of the page, in pixels.
+
+        :type: int
+        """
+        return self._height
+
+    @property
+    def stride(self) -> int:
+        """The number of bytes per row.
+
+        :type: int
+        """
+        return self._stride
+
+    @property
+    def generation(self) -> int:
+        """The number of times the page has been evicted.
+
+        :type: int
+        """
+        return self._generation
+
+    @property
+    def format(self) -> RasterFormat:
+        """The pixel format of the page, as for :class:`RasterImage`.
+
+        :type: RasterFormat
+        """
+        return self._format
+
+    @property
+    def data(self) -> memoryview:
+        """The pixels of the page, as a read-only :class:`memoryview` of
+        :attr:`height` rows of :attr:`stride` bytes, stored top-to-bottom.
+        The view is not a copy and reflects later insertions.
+
+        :type: memoryview
+        """
+        return _memoryview_from_ptr(
+            self, self._pixels, <size_t>self._height * self._stride)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    cdef bint _allocate(self, int width, int height, int padding,
+                        int* x, int* y):
+        cdef list shelf
+        cdef list best = None
+        cdef int w = width + padding
+        cdef int h = height + padding
+        for shelf in self._shelves:
+            if (shelf[1] >= h and shelf[2] + w <= self._width
+                    and (best is None or shelf[1] < best[1])):
+                best = shelf
+        if best is None:
+            if (self._next_y + h + padding > self._height
+                    or padding + w > self._width):
+                return False
+            best = [self._next_y, h, padding]
+            self._shelves.append(best)
+            self._next_y += h
+        x[0] = best[2]
+        y[0] = best[0] + padding
+        best[2] += w
+        return True
+
+    cdef void _reset(self):
+        memset(self._pixels, 0, <size_t>self._height * self._stride)
+        self._shelves = []
+        self._next_y = 0
+        self._keys = []
+        self._generation += 1
+
+
+cdef class GlyphAtlas:
+    """Rasterizes glyphs on demand and packs them into fixed-size pages,
+    suitable for uploading as GPU textures.
+
+    Glyphs are rendered with :class:`RasterDraw` for
+    :attr:`RasterFormat.A8` atlases, and with :class:`RasterPaint`, in
+    color, for :attr:`RasterFormat.BGRA32` atlases. They are packed on
+    shelves, leaving ``padding`` pixels between glyphs and around the page
+    edges.
+
+    When a glyph does not fit in any page and ``max_pages`` pages exist,
+    the least recently used page is evicted: its glyphs are dropped, and
+    the page is cleared and reused. Entries returned earlier for glyphs of
+    an evicted page are then stale; see :attr:`GlyphAtlasPage.generation`.
+    Pages holding glyphs of an :meth:`add_glyphs` batch are not evicted
+    while the batch is packed, so all its entries stay valid.
+
+    Glyphs are keyed by font, glyph ID, size, subpixel offset and the font
+    settings that affect outlines, so fonts may be modified between calls.
+
+    :param width: The width of the pages, in pixels.
+    :param height: The height of the pages, in pixels.
+    :param format: The pixel format of the pages.
+    :param padding: The number of blank pixels around glyphs.
+    :param max_pages: The maximum number of pages, or ``0`` for no limit.
+    """
+
+    cdef int _width
+    cdef int _height
+    cdef int _padding
+    cdef int _max_pages
+    cdef object _format
+    cdef list _pages
+    cdef dict _entries
+    cdef size_t _tick
+    # Indexes of the pages that must not be evicted.
+    cdef set _pinned
+    cdef RasterDraw _draw
+    cdef RasterPaint _paint
+
+    def __init__(self, width: int = 1024, height: int = 1024,
+                 format: RasterFormat = RasterFormat.A8,
+                 padding: int = 1, max_pages: int = 0):
+        if width <= 0 or height <= 0:
+            raise ValueError("atlas pages must not be empty")
+        if padding < 0 or max_pages < 0:
+            raise ValueError("padding and max_pages must not be negative")
+        self._width = width
+        self._height = height
+        self._padding = padding
+        self._max_pages = max_pages
+        self._format = RasterFormat(format)
+        self._pages = []
+        self._entries = {}
+        self._tick = 0
+        self._pinned = set()
+        if self._format == RasterFormat.BGRA32:
+            self._paint = RasterPaint()
+        else:
+            self._draw = RasterDraw()
+
+    @property
+    def width(self) -> int:
+        """The width of the pages, in pixels.
+
+        :type: int
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """The height of the pages, in pixels.
+
+        :type: int
+        """
+        return self._height
+
+    @property
+    def padding(self) -> int:
+        """The number of blank pixels around glyphs.
+
+        :type: int
+        """
+        return self._padding
+
+    @property
+    def max_pages(self) -> int:
+        """The maximum number of pages, or ``0`` for no limit.
+
+        :type: int
+        """
+        return self._max_pages
+
+    @property
+    def format(self) -> RasterFormat:
+        """The pixel format of the pages.
+
+        :type: RasterFormat
+        """
+        return self._format
+
+    @property
+    def pages(self) -> List[GlyphAtlasPage]:
+        """The pages of the atlas.
+
+        :type: list[GlyphAtlasPage]
+        """
+        return list(self._pages)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drops all glyphs and pages."""
+        self._pages = []
+        self._entries = {}
+
+    cdef RasterImage _render(self, Font font, const _RasterJob* job):
+        cdef hb_raster_draw_t* draw = NULL
+        cdef hb_raster_paint_t* paint = NULL
+        cdef hb_raster_image_t* img
+        if self._paint is not None:
+            paint = self._paint._hb_raster_paint
+        else:
+            draw = self._draw._hb_raster_draw
+        img = _raster_glyph(draw, paint, font._hb_font, job)
+        if img is NULL:
+            raise MemoryError()
+        return RasterImage.from_ptr(img)
+
+    cdef GlyphAtlasPage _page_for(self, int width, int height, int* x, int* y):
+        cdef GlyphAtlasPage page
+        cdef GlyphAtlasPage lru = None
+        for page in self._pages:
+            if page._allocate(width, height, self._padding, x, y):
+                return page
+        if not self._max_pages or len(self._pages) < self._max_pages:
+            page = GlyphAtlasPage.create(len(self._pages), self._width,
+                                         self._height, self._format)
+            self._pages.append(page)
+        else:
+            for page in self._pages:
+                if page._index in self._pinned:
+                    continue
+                if lru is None or page._last_used < lru._last_used:
+                    lru = page
+            if lru is None:
+                raise ValueError(
+                    f"glyphs of one batch do not fit in {self._max_pages} "
+                    f"atlas pages")
+            for key in lru._keys:
+                del self._entries[key]
+            lru._reset()
+            page = lru
+        page._allocate(width, height, self._padding, x, y)
+        return page
+
+    cdef tuple _key(self, Font font, tuple state, gid, size, dx, dy):
+        return (font, state, gid, size, dx, dy)
+
+    cdef object _lookup(self, tuple key):
+        self._tick += 1
+        entry = self._entries.get(key)
+        if entry is not None and entry.page >= 0:
+            (<GlyphAtlasPage>self._pages[entry.page])._last_used = self._tick
+        return entry
+
+    cdef object _insert(self, tuple key, RasterImage image):
+        cdef hb_raster_extents_t ext
+        cdef const uint8_t* pixels
+        cdef GlyphAtlasPage page
+        cdef int x, y, row
+        cdef int bpp = 4 if self._format == RasterFormat.BGRA32 else 1
+        hb_raster_image_get_extents(image._hb_raster_image, &ext)
+        if not ext.width or not ext.height:
+            entry = GlyphAtlasEntry(-1, 0, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0, 0)
+            self._entries[key] = entry
+            return entry
+        if (ext.width + 2 * self._padding > <unsigned int>self._width
+                or ext.height + 2 * self._padding > <unsigned int>self._height):
+            raise ValueError(
+                f"glyph of {ext.width}x{ext.height} pixels does not fit in "
+                f"atlas pages of {self._width}x{self._height} pixels"
+            )
+
+        page = self._page_for(ext.width, ext.height, &x, &y)
+        # Image rows are stored bottom-to-top, page rows top-to-bottom
+        pixels = hb_raster_image_get_buffer(image._hb_raster_image)
+        for row in range(ext.height):
+            memcpy(&page._pixels[(y + ext.height - 1 - row) * page._stride + x * bpp],
+                   &pixels[row * ext.stride], ext.width * bpp)
+        page._keys.append(key)
+        page._last_used = self._tick
+        entry = GlyphAtlasEntry(
+            page=page._index,
+            x=x,
+            y=y,
+            width=ext.width,
+            height=ext.height,
+            u0=x / self._width,
+            v0=y / self._height,
+            u1=(x + ext.width) / self._width,
+            v1=(y + ext.height) / self._height,
+            x_bearing=ext.x_origin,
+            y_bearing=ext.y_origin + <int>ext.height,
+        )
+        self._entries[key] = entry
+        return entry
+
+    def add(self, font: Font, gid: int, size: float | None = None,
+            subpixel_offset: Tuple[float, float] = (0.0, 0.0)) -> GlyphAtlasEntry:
+        """Returns the atlas entry of a glyph, rasterizing and packing it
+        first if it is not in the atlas yet.
+
+        :param font: The :class:`Font` to render the glyph with.
+        :param gid: The glyph ID.
+        :param size: The size to render the glyph at, in pixels per em, or
+            ``None`` to render one pixel per unit of the font scale.
+        :param subpixel_offset: A ``(dx, dy)`` offset, in pixels, added to
+            the glyph origin before rasterizing.
+
+        :returns: The :class:`GlyphAtlasEntry` of the glyph.
+
+        :raises ValueError: If the glyph does not fit in an empty page.
+        """
+        cdef _RasterJob job
+        dx, dy = subpixel_offset
+        key = self._key(font, _font_draw_state(font._hb_font,
+                                               _font_serials(font._hb_font)),
+                        gid, size, dx, dy)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+        job.gid = gid
+        job.dx = dx
+        job.dy = dy
+        _raster_job_scale(font, size, &job)
+        return self._insert(key, self._render(font, &job))
+
+    def add_glyphs(self, font: Font, glyphs: Sequence[int],
+                   size: float | None = None,
+                   threads: int | None = None) -> List[GlyphAtlasEntry]:
+        """Returns the atlas entries of many glyphs, as :meth:`add` does,
+        rasterizing the glyphs that are not in the atlas yet in parallel,
+        as :func:`rasterize_glyphs` does, before packing them in order.
+
+        :param font: The :class:`Font` to render the glyphs with.
+        :param glyphs: The glyph IDs.
+        :param size: The size to render the glyphs at, in pixels per em, or
+            ``None`` to render one pixel per unit of the font scale.
+        :param threads: The number of threads to use. Defaults to the
+            number of CPUs.
+
+        :returns: A list with the :class:`GlyphAtlasEntry` of each glyph.
+
+        :raises ValueError: If a glyph does not fit in an empty page, if
+            the glyphs do not fit in ``max_pages`` pages together, if
+            ``threads`` is less than 1, or if the face of ``font`` has no
+            font data.
+        """
+        cdef tuple state = _font_draw_state(font._hb_font,
+                                            _font_serials(font._hb_font))
+        cdef list keys = [self._key(font, state, gid, size, 0.0, 0.0)
+                          for gid in glyphs]
+        cdef dict entries = {}
+        cdef dict missing = {}
+        cdef _RasterJob* jobs
+        cdef size_t i
+        for key, gid in zip(keys, glyphs):
+            if key in entries or key in missing:
+                continue
+            entry = self._lookup(key)
+            if entry is None:
+                missing[key] = gid
+            else:
+                entries[key] = entry
+                if entry.page >= 0:
+                    self._pinned.add(entry.page)
+        jobs = <_RasterJob*>calloc(len(missing), sizeof(_RasterJob))
+        if jobs is NULL and missing:
+            self._pinned.clear()
+            raise MemoryError()
+        try:
+            for i, gid in enumerate(missing.values()):
+                jobs[i].gid = gid
+                _raster_job_scale(font, size, &jobs[i])
+            _raster_jobs(font, self._paint is not None, jobs, len(missing),
+                         threads)
+            for i, key in enumerate(missing):
+                if jobs[i].image is NULL:
+                    raise MemoryError()
+                image = RasterImage.from_ptr(jobs[i].image)
+                jobs[i].image = NULL
+                self._tick += 1
+                entry = self._insert(key, image)
+                entries[key] = entry
+                if entry.page >= 0:
+                    self._pinned.add(entry.page)
+        finally:
+            self._pinned.clear()
+            for i in range(len(missing)):
+                hb_raster_image_destroy(jobs[i].image)
+            free(jobs)
+        return [entries[key] for key in keys]
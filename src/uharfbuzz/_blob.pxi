@@ -1,3 +1,77 @@
+cdef object _memoryview_from_ptr(object owner, const void* data, size_t size):
+    """Returns a read-only :class:`memoryview` of ``size`` bytes at ``data``
+    that keeps ``owner`` alive for as long as the view, or any view derived
+    from it, exists.
+
+    The buffer protocol is not part of the Limited API before Python 3.11,
+    so the memory is exported through a :mod:`ctypes` array instead of a
+    ``__getbuffer__`` implementation.
+    """
+    if data is NULL or size == 0:
+        return memoryview(b"")
+    array = (ctypes.c_ubyte * size).from_address(<size_t>data)
+    array._owner = owner
+    return memoryview(array).cast("B").toreadonly()
+
+
+class _SharedMemoryMapping:
+    def __init__(self, shm, size, owner):
+        self.shm = shm
+        self.owner = owner
+        self.array = (ctypes.c_char * size).from_buffer(shm.buf)
+
+    def release(self):
+        # The exported buffer must be released before the segment is closed
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+cdef void _shared_memory_destroy(void* mapping) noexcept with gil:
+    (<object>mapping).release()
+    Py_DECREF(<object>mapping)
+
+
+# Live shared memory blobs of this process, created or attached, by segment
+# name. Segments are unmapped once no blob uses them.
+_shared_blobs = weakref.WeakValueDictionary()
+
+# Blobs attached to segments created by other processes, most recently used
+# last. They are kept alive so that a segment is mapped once per process,
+# even when the objects unpickled from it are short-lived; the least
+# recently used one is dropped, and its segment unmapped once unused, when
+# there are more than _ATTACHED_BLOBS_MAX.
+_attached_blobs = OrderedDict()
+_ATTACHED_BLOBS_MAX = 32
+
+
+def _attach_shared_blob(name: str, size: int) -> Blob:
+    blob = _attached_blobs.get(name)
+    if blob is not None:
+        _attached_blobs.move_to_end(name)
+        return blob
+    blob = _shared_blobs.get(name)
+    if blob is None:
+        from multiprocessing import shared_memory
+        if sys.version_info >= (3, 13):
+            # The creating process owns the segment
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                # Attaching registers the segment with the resource tracker
+                # of this process, which would unlink it when this process
+                # exits, under the process that owns it.
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+        blob = Blob.from_shared_memory(shm, size, False)
+        _attached_blobs[name] = blob
+        if len(_attached_blobs) > _ATTACHED_BLOBS_MAX:
+            _attached_blobs.popitem(last=False)
+    return blob
+
+
 cdef class Blob:
     """Binary data containers.
 
@@ -14,6 +88,8 @@ cdef class Blob:
     """
 
     cdef hb_blob_t* _hb_blob
+    cdef object _shared_memory
+    cdef object __weakref__
 
     def __cinit__(self, bytes data = None):
         if data is not None:
@@ -56,6 +132,66 @@ cdef class Blob:
         inst._hb_blob = blob
         return inst
 
+    @staticmethod
+    cdef Blob from_shared_memory(object shm, Py_ssize_t size, bint owner):
+        """Create a read-only Blob over the first ``size`` bytes of a
+        :class:`~multiprocessing.shared_memory.SharedMemory` segment."""
+        mapping = _SharedMemoryMapping(shm, size, owner)
+        cdef Blob inst = Blob.__new__(Blob)
+        Py_INCREF(mapping)
+        inst._hb_blob = hb_blob_create(
+            <char*><size_t>ctypes.addressof(mapping.array), size,
+            HB_MEMORY_MODE_READONLY, <void*>mapping, _shared_memory_destroy)
+        inst._shared_memory = shm
+        _shared_blobs[shm.name] = inst
+        return inst
+
+    def to_shared_memory(self) -> Blob:
+        """Copies the data of a blob into a new shared memory segment and
+        returns a blob backed by it.
+
+        Pickling the returned blob, or a :class:`Face` or :class:`Font`
+        created from it, only transfers the name of the segment. Each
+        process maps the segment on first use and keeps the mapping for
+        later unpickling, so the font data is never copied. Mappings of the
+        least recently used segments are released once many segments have
+        been attached.
+        The segment is unlinked once the returned blob is destroyed.
+
+        :returns: A new :class:`Blob` backed by shared memory.
+
+        :raises ValueError: If the blob is empty.
+        """
+        from multiprocessing import shared_memory
+
+        cdef unsigned int blob_length = len(self)
+        if blob_length == 0:
+            raise ValueError("cannot share an empty blob")
+        shm = shared_memory.SharedMemory(create=True, size=blob_length)
+        try:
+            shm.buf[:blob_length] = self.data_view
+            return Blob.from_shared_memory(shm, blob_length, True)
+        except:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @property
+    def shared_memory_name(self) -> str | None:
+        """The name of the shared memory segment backing the blob, or
+        ``None`` if the blob is not backed by shared memory.
+
+        :type: str | None
+        """
+        if self._shared_memory is None:
+            return None
+        return self._shared_memory.name
+
+    def __reduce__(self):
+        if self._shared_memory is not None:
+            return _attach_shared_blob, (self._shared_memory.name, len(self))
+        return Blob, (self.data,)
+
     def __dealloc__(self):
         hb_blob_destroy(self._hb_blob)
 
@@ -67,7 +203,8 @@ cdef class Blob:
 
     @property
     def data(self) -> bytes:
-        """Fetches the data from a blob.
+        """Fetches a copy of the data from a blob. Use :attr:`data_view` to
+        access the data without copying it.
 
         :type: bytes
 
@@ -79,3 +216,18 @@ cdef class Blob:
         cdef unsigned int blob_length
         cdef const_char* blob_data = hb_blob_get_data(self._hb_blob, &blob_length)
         return blob_data[:blob_length]
+
+    @property
+    def data_view(self) -> memoryview:
+        """A read-only :class:`memoryview` of the data of a blob, without
+        copying it. The view keeps the blob alive, so it stays valid after
+        the :class:`Blob` object itself is discarded.
+
+        :type: memoryview
+
+        Wraps `hb_blob_get_data()
+        <https://harfbuzz.github.io/harfbuzz-hb-blob.html#hb-blob-get-data>`_.
+        """
+        cdef unsigned int blob_length
+        cdef const_char* blob_data = hb_blob_get_data(self._hb_blob, &blob_length)
+        return _memoryview_from_ptr(self, blob_data, blob_length)
@@ -467,6 +467,104 @@ cdef class Buffer:
     def __dealloc__(self):
         hb_buffer_destroy(self._hb_buffer)
 
+    def __reduce__(self):
+        cdef hb_segment_properties_t props
+        cdef unsigned int length
+        cdef unsigned int i
+        cdef hb_glyph_info_t* infos = hb_buffer_get_glyph_infos(
+            self._hb_buffer, &length)
+        cdef hb_glyph_position_t* positions
+        cdef uint32_t* info_values
+        cdef int32_t* position_values
+        hb_buffer_get_segment_properties(self._hb_buffer, &props)
+        content_type = hb_buffer_get_content_type(self._hb_buffer)
+        info_values = <uint32_t*>malloc(3 * length * sizeof(uint32_t) + 1)
+        if info_values is NULL:
+            raise MemoryError()
+        try:
+            for i in range(length):
+                info_values[3 * i] = infos[i].codepoint
+                info_values[3 * i + 1] = infos[i].mask
+                info_values[3 * i + 2] = infos[i].cluster
+            info_array = array.array(
+                "I", (<char*>info_values)[:3 * length * sizeof(uint32_t)])
+        finally:
+            free(info_values)
+        position_array = None
+        if content_type == HB_BUFFER_CONTENT_TYPE_GLYPHS:
+            positions = hb_buffer_get_glyph_positions(self._hb_buffer, &length)
+            position_values = <int32_t*>malloc(4 * length * sizeof(int32_t) + 1)
+            if position_values is NULL:
+                raise MemoryError()
+            try:
+                for i in range(length):
+                    position_values[4 * i] = positions[i].x_advance
+                    position_values[4 * i + 1] = positions[i].y_advance
+                    position_values[4 * i + 2] = positions[i].x_offset
+                    position_values[4 * i + 3] = positions[i].y_offset
+                position_array = array.array(
+                    "i", (<char*>position_values)[:4 * length * sizeof(int32_t)])
+            finally:
+                free(position_values)
+        state = (
+            content_type,
+            props.direction,
+            props.script,
+            self.language,
+            hb_buffer_get_flags(self._hb_buffer),
+            hb_buffer_get_cluster_level(self._hb_buffer),
+            hb_buffer_get_replacement_codepoint(self._hb_buffer),
+            hb_buffer_get_invisible_glyph(self._hb_buffer),
+            hb_buffer_get_not_found_glyph(self._hb_buffer),
+            info_array,
+            position_array,
+        )
+        return Buffer, (), state
+
+    def __setstate__(self, state):
+        cdef unsigned int length
+        cdef unsigned int i
+        cdef hb_glyph_info_t* infos
+        cdef hb_glyph_position_t* positions
+        cdef bytes packed
+        cdef const uint32_t* info_values
+        cdef const int32_t* position_values
+        (content_type, direction, script, language, flags, cluster_level,
+         replacement_codepoint, invisible_glyph, not_found_glyph,
+         info_array, position_array) = state
+        hb_buffer_reset(self._hb_buffer)
+        hb_buffer_set_direction(self._hb_buffer, direction)
+        hb_buffer_set_script(self._hb_buffer, script)
+        if language is not None:
+            self.language = language
+        hb_buffer_set_flags(self._hb_buffer, flags)
+        hb_buffer_set_cluster_level(self._hb_buffer, cluster_level)
+        hb_buffer_set_replacement_codepoint(self._hb_buffer, replacement_codepoint)
+        hb_buffer_set_invisible_glyph(self._hb_buffer, invisible_glyph)
+        hb_buffer_set_not_found_glyph(self._hb_buffer, not_found_glyph)
+        length = len(info_array) // 3
+        if not length:
+            return
+        if not hb_buffer_set_length(self._hb_buffer, length):
+            raise MemoryError()
+        hb_buffer_set_content_type(self._hb_buffer, content_type)
+        packed = info_array.tobytes()
+        info_values = <const uint32_t*><const char*>packed
+        infos = hb_buffer_get_glyph_infos(self._hb_buffer, NULL)
+        for i in range(length):
+            infos[i].codepoint = info_values[3 * i]
+            infos[i].mask = info_values[3 * i + 1]
+            infos[i].cluster = info_values[3 * i + 2]
+        if position_array is not None:
+            packed = position_array.tobytes()
+            position_values = <const int32_t*><const char*>packed
+            positions = hb_buffer_get_glyph_positions(self._hb_buffer, NULL)
+            for i in range(length):
+                positions[i].x_advance = position_values[4 * i]
+                positions[i].y_advance = position_values[4 * i + 1]
+                positions[i].x_offset = position_values[4 * i + 2]
+                positions[i].y_offset = position_values[4 * i + 3]
+
     @classmethod
     @deprecated("Buffer()", since="0.10.0")
     def create(cls) -> Buffer:
@@ -957,3 +1055,17 @@ cdef class Buffer:
             packed += cstr[:consumed]
 
         return packed.decode()
+
+
+cdef int _get_shaped_glyphs(Buffer buffer,
+                            unsigned int* length,
+                            hb_glyph_info_t** infos,
+                            hb_glyph_position_t** positions) except -1:
+    """Fetches the glyph infos and positions of a buffer, checking that it
+    has been shaped. Empty buffers are accepted."""
+    length[0] = hb_buffer_get_length(buffer._hb_buffer)
+    if length[0] and hb_buffer_get_content_type(buffer._hb_buffer) != HB_BUFFER_CONTENT_TYPE_GLYPHS:
+        raise ValueError("buffer must be shaped")
+    infos[0] = hb_buffer_get_glyph_infos(buffer._hb_buffer, NULL)
+    positions[0] = hb_buffer_get_glyph_positions(buffer._hb_buffer, NULL)
+    return 0
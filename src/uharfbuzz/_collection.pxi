@@ -0,0 +1,128 @@
+cdef class FontCollection:
+    """A font collection (``.ttc`` or ``.otc`` file) whose faces all share a
+    single :class:`Blob`.
+
+    Font files are loaded with :meth:`Blob.from_file_path`, which maps the
+    file into memory when possible. :class:`Face` objects are created on
+    first access and cached. A single font file is treated as a collection
+    with one face.
+
+    :param source: A font file path, or the font data as :class:`bytes` or
+        :class:`Blob`.
+
+    :raises HarfBuzzError: If the font file cannot be opened or read.
+    """
+
+    cdef Blob _blob
+    cdef list _faces
+    cdef dict _postscript_names
+    cdef dict _family_names
+
+    def __init__(self, source: Union[str, Path, bytes, Blob]):
+        if isinstance(source, Blob):
+            self._blob = source
+        elif isinstance(source, (str, Path)):
+            self._blob = Blob.from_file_path(source)
+        else:
+            self._blob = Blob(source)
+        self._faces = [None] * hb_face_count(self._blob._hb_blob)
+        self._postscript_names = None
+        self._family_names = None
+
+    @property
+    def blob(self) -> Blob:
+        """The blob shared by all faces of the collection.
+
+        :type: Blob
+        """
+        return self._blob
+
+    def __len__(self) -> int:
+        return len(self._faces)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Face, List[Face]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._faces)))]
+        face = self._faces[index]
+        if face is None:
+            if index < 0:
+                index += len(self._faces)
+            face = Face(self._blob, index)
+            self._faces[index] = face
+        return face
+
+    def __iter__(self):
+        for i in range(len(self._faces)):
+            yield self[i]
+
+    cdef _build_name_index(self):
+        cdef dict postscript_names = {}
+        cdef dict family_names = {}
+        cdef Face face
+        cdef int i
+        for i in range(len(self._faces)):
+            face = self[i]
+            name = face.get_name(OTNameIdPredefined.POSTSCRIPT_NAME)
+            if name is not None:
+                postscript_names.setdefault(name, i)
+            for name_id in (OTNameIdPredefined.TYPOGRAPHIC_FAMILY,
+                            OTNameIdPredefined.FONT_FAMILY):
+                name = face.get_name(name_id)
+                if name is None:
+                    continue
+                indices = family_names.setdefault(name, [])
+                if not indices or indices[-1] != i:
+                    indices.append(i)
+        self._postscript_names = postscript_names
+        self._family_names = family_names
+
+    @property
+    def postscript_names(self) -> Dict[str, int]:
+        """A mapping of PostScript names to face indices. The name index is
+        built on first use and cached.
+
+        :type: dict[str, int]
+        """
+        if self._postscript_names is None:
+            self._build_name_index()
+        return dict(self._postscript_names)
+
+    @property
+    def family_names(self) -> Dict[str, List[int]]:
+        """A mapping of family names to the indices of the faces in each
+        family. Both the typographic family name and the legacy family name
+        of each face are indexed. The name index is built on first use and
+        cached.
+
+        :type: dict[str, list[int]]
+        """
+        if self._family_names is None:
+            self._build_name_index()
+        return {name: list(indices)
+                for name, indices in self._family_names.items()}
+
+    def get_face_by_postscript_name(self, name: str) -> Face | None:
+        """Returns the face with the given PostScript name.
+
+        :param name: The PostScript name of the face.
+
+        :returns: The :class:`Face`, or ``None`` if not found.
+        """
+        if self._postscript_names is None:
+            self._build_name_index()
+        index = self._postscript_names.get(name)
+        if index is None:
+            return None
+        return self[index]
+
+    def get_faces_by_family_name(self, name: str) -> List[Face]:
+        """Returns the faces of the given family, matching either the
+        typographic or the legacy family name.
+
+        :param name: The family name.
+
+        :returns: A list of :class:`Face` objects, in collection order.
+        """
+        if self._family_names is None:
+            self._build_name_index()
+        return [self[i] for i in self._family_names.get(name, ())]
@@ -193,3 +193,787 @@ cdef class DrawFuncs:
             user_data_p = <void*>func
         hb_draw_funcs_set_close_path_func(
             self._hb_drawfuncs, func_p, user_data_p, NULL)
+
+
+class OutlineVerb(IntEnum):
+    """The path commands of a :class:`GlyphOutline`.
+
+    .. attribute:: MOVE_TO
+
+       Starts a new contour, taking one point.
+
+    .. attribute:: LINE_TO
+
+       A straight line, taking one point.
+
+    .. attribute:: QUADRATIC_TO
+
+       A quadratic Bézier curve, taking a control point and an end point.
+
+    .. attribute:: CUBIC_TO
+
+       A cubic Bézier curve, taking two control points and an end point.
+
+    .. attribute:: CLOSE_PATH
+
+       Closes the current contour, taking no points.
+    """
+    MOVE_TO = 0
+    LINE_TO = 1
+    QUADRATIC_TO = 2
+    CUBIC_TO = 3
+    CLOSE_PATH = 4
+
+
+cdef struct _OutlineRecording:
+    uint8_t* verbs
+    size_t verb_count
+    size_t verb_capacity
+    float* coords
+    size_t coord_count
+    size_t coord_capacity
+    bint failed
+
+
+cdef bint _outline_reserve(_OutlineRecording* rec,
+                           size_t verb_count,
+                           size_t coord_count) noexcept nogil:
+    cdef size_t capacity
+    cdef void* p
+    if rec.failed:
+        return False
+    if rec.verb_count + verb_count > rec.verb_capacity:
+        capacity = max(2 * rec.verb_capacity, rec.verb_count + verb_count, 32)
+        p = realloc(rec.verbs, capacity * sizeof(uint8_t))
+        if p is NULL:
+            rec.failed = True
+            return False
+        rec.verbs = <uint8_t*>p
+        rec.verb_capacity = capacity
+    if rec.coord_count + coord_count > rec.coord_capacity:
+        capacity = max(2 * rec.coord_capacity, rec.coord_count + coord_count, 64)
+        p = realloc(rec.coords, capacity * sizeof(float))
+        if p is NULL:
+            rec.failed = True
+            return False
+        rec.coords = <float*>p
+        rec.coord_capacity = capacity
+    return True
+
+
+cdef inline void _outline_add(_OutlineRecording* rec, uint8_t verb,
+                              float* coords, size_t coord_count) noexcept nogil:
+    if not _outline_reserve(rec, 1, coord_count):
+        return
+    rec.verbs[rec.verb_count] = verb
+    rec.verb_count += 1
+    if coord_count:
+        memcpy(&rec.coords[rec.coord_count], coords, coord_count * sizeof(float))
+        rec.coord_count += coord_count
+
+
+cdef void _outline_move_to_func(hb_draw_funcs_t *dfuncs,
+                                void *draw_data,
+                                hb_draw_state_t *st,
+                                float to_x,
+                                float to_y,
+                                void *user_data) noexcept nogil:
+    cdef float coords[2]
+    coords[0] = to_x
+    coords[1] = to_y
+    _outline_add(<_OutlineRecording*>draw_data, 0, coords, 2)
+
+cdef void _outline_line_to_func(hb_draw_funcs_t *dfuncs,
+                                void *draw_data,
+                                hb_draw_state_t *st,
+                                float to_x,
+                                float to_y,
+                                void *user_data) noexcept nogil:
+    cdef float coords[2]
+    coords[0] = to_x
+    coords[1] = to_y
+    _outline_add(<_OutlineRecording*>draw_data, 1, coords, 2)
+
+cdef void _outline_quadratic_to_func(hb_draw_funcs_t *dfuncs,
+                                     void *draw_data,
+                                     hb_draw_state_t *st,
+                                     float c1_x,
+                                     float c1_y,
+                                     float to_x,
+                                     float to_y,
+                                     void *user_data) noexcept nogil:
+    cdef float coords[4]
+    coords[0] = c1_x
+    coords[1] = c1_y
+    coords[2] = to_x
+    coords[3] = to_y
+    _outline_add(<_OutlineRecording*>draw_data, 2, coords, 4)
+
+cdef void _outline_cubic_to_func(hb_draw_funcs_t *dfuncs,
+                                 void *draw_data,
+                                 hb_draw_state_t *st,
+                                 float c1_x,
+                                 float c1_y,
+                                 float c2_x,
+                                 float c2_y,
+                                 float to_x,
+                                 float to_y,
+                                 void *user_data) noexcept nogil:
+    cdef float coords[6]
+    coords[0] = c1_x
+    coords[1] = c1_y
+    coords[2] = c2_x
+    coords[3] = c2_y
+    coords[4] = to_x
+    coords[5] = to_y
+    _outline_add(<_OutlineRecording*>draw_data, 3, coords, 6)
+
+cdef void _outline_close_path_func(hb_draw_funcs_t *dfuncs,
+                                   void *draw_data,
+                                   hb_draw_state_t *st,
+                                   void *user_data) noexcept nogil:
+    _outline_add(<_OutlineRecording*>draw_data, 4, NULL, 0)
+
+
+cdef hb_draw_funcs_t* _outline_drawfuncs = NULL
+
+cdef hb_draw_funcs_t* _get_outline_drawfuncs() noexcept:
+    global _outline_drawfuncs
+    if _outline_drawfuncs is NULL:
+        _outline_drawfuncs = hb_draw_funcs_create()
+        hb_draw_funcs_set_move_to_func(
+            _outline_drawfuncs, _outline_move_to_func, NULL, NULL)
+        hb_draw_funcs_set_line_to_func(
+            _outline_drawfuncs, _outline_line_to_func, NULL, NULL)
+        hb_draw_funcs_set_quadratic_to_func(
+            _outline_drawfuncs, _outline_quadratic_to_func, NULL, NULL)
+        hb_draw_funcs_set_cubic_to_func(
+            _outline_drawfuncs, _outline_cubic_to_func, NULL, NULL)
+        hb_draw_funcs_set_close_path_func(
+            _outline_drawfuncs, _outline_close_path_func, NULL, NULL)
+    return _outline_drawfuncs
+
+
+cdef class GlyphOutline:
+    """A recorded glyph outline, stored as an array of :class:`OutlineVerb`
+    values and an array of ``float32`` coordinates.
+
+    Both arrays are exposed through the buffer protocol, as
+    :class:`memoryview` objects, without copying. The coordinates of each
+    verb follow those of the previous one, as ``x, y`` pairs: two values
+    for :attr:`OutlineVerb.MOVE_TO` and :attr:`OutlineVerb.LINE_TO`, four
+    for :attr:`OutlineVerb.QUADRATIC_TO`, six for
+    :attr:`OutlineVerb.CUBIC_TO`, and none for
+    :attr:`OutlineVerb.CLOSE_PATH`.
+
+    Outlines are created by :meth:`Font.get_glyph_outline` and
+    :func:`draw_buffer`, and are immutable.
+    """
+
+    cdef _OutlineRecording _rec
+
+    def __cinit__(self):
+        self._rec.verbs = NULL
+        self._rec.verb_count = self._rec.verb_capacity = 0
+        self._rec.coords = NULL
+        self._rec.coord_count = self._rec.coord_capacity = 0
+        self._rec.failed = False
+
+    def __dealloc__(self):
+        free(self._rec.verbs)
+        free(self._rec.coords)
+
+    @staticmethod
+    cdef GlyphOutline from_recording(_OutlineRecording* rec):
+        """Create GlyphOutline from a recording, taking ownership of its
+        arrays."""
+        cdef GlyphOutline outline = GlyphOutline.__new__(GlyphOutline)
+        if rec.failed:
+            free(rec.verbs)
+            free(rec.coords)
+            raise MemoryError()
+        outline._rec = rec[0]
+        return outline
+
+    cdef size_t _nbytes(self):
+        return (sizeof(GlyphOutline) + self._rec.verb_capacity * sizeof(uint8_t)
+                + self._rec.coord_capacity * sizeof(float))
+
+    def __len__(self) -> int:
+        return self._rec.verb_count
+
+    @property
+    def verbs(self) -> memoryview:
+        """The path commands, as a read-only ``uint8`` :class:`memoryview`
+        of :class:`OutlineVerb` values.
+
+        :type: memoryview
+        """
+        return _memoryview_from_ptr(
+            self, self._rec.verbs, self._rec.verb_count * sizeof(uint8_t))
+
+    @property
+    def coords(self) -> memoryview:
+        """The coordinates, as a read-only ``float32`` :class:`memoryview`.
+
+        :type: memoryview
+        """
+        return _memoryview_from_ptr(
+            self, self._rec.coords,
+            self._rec.coord_count * sizeof(float)).cast("f")
+
+    def replay(self, pen):
+        """Draws the outline using a fontTools-style pen, like
+        :meth:`Font.draw_glyph_with_pen`.
+
+        :param pen: An object with ``moveTo``, ``lineTo``, ``curveTo``,
+            ``qCurveTo``, and ``closePath`` methods.
+        """
+        cdef const float* c = self._rec.coords
+        cdef size_t i
+        moveTo = pen.moveTo
+        lineTo = pen.lineTo
+        curveTo = pen.curveTo
+        qCurveTo = pen.qCurveTo
+        closePath = pen.closePath
+        for i in range(self._rec.verb_count):
+            verb = self._rec.verbs[i]
+            if verb == 0:
+                moveTo((c[0], c[1]))
+                c += 2
+            elif verb == 1:
+                lineTo((c[0], c[1]))
+                c += 2
+            elif verb == 2:
+                qCurveTo((c[0], c[1]), (c[2], c[3]))
+                c += 4
+            elif verb == 3:
+                curveTo((c[0], c[1]), (c[2], c[3]), (c[4], c[5]))
+                c += 6
+            else:
+                closePath()
+
+
+cdef struct _SvgPath:
+    char* data
+    size_t length
+    size_t capacity
+    int precision
+    double scale  # 10 ** precision
+    bint relative
+    double x  # current point, rounded
+    double y
+    double start_x  # start of the current contour, rounded
+    double start_y
+    double origin_x  # offset applied to all points
+    double origin_y
+    bint failed
+
+
+cdef void _svg_path_init(_SvgPath* path, int precision, bint relative) noexcept:
+    memset(path, 0, sizeof(_SvgPath))
+    path.precision = precision
+    path.scale = pow(10, precision)
+    path.relative = relative
+
+
+cdef str _svg_path_finish(_SvgPath* path):
+    """Returns the path data as a string, and frees the path."""
+    try:
+        if path.failed:
+            raise MemoryError()
+        if path.length == 0:
+            return ""
+        return path.data[:path.length].decode("ascii")
+    finally:
+        free(path.data)
+        path.data = NULL
+
+
+cdef bint _svg_reserve(_SvgPath* path, size_t size) noexcept nogil:
+    cdef size_t capacity
+    cdef char* data
+    if path.failed:
+        return False
+    if path.length + size > path.capacity:
+        capacity = max(2 * path.capacity, path.length + size, 256)
+        data = <char*>realloc(path.data, capacity)
+        if data is NULL:
+            path.failed = True
+            return False
+        path.data = data
+        path.capacity = capacity
+    return True
+
+
+cdef void _svg_append_command(_SvgPath* path, char command) noexcept nogil:
+    if not _svg_reserve(path, 1):
+        return
+    if path.relative:
+        command += 32  # lowercase
+    path.data[path.length] = command
+    path.length += 1
+
+
+cdef void _svg_append_number(_SvgPath* path, double value, bint separator) noexcept nogil:
+    cdef char number[64]
+    cdef int length = snprintf(number, sizeof(number), "%.*f", path.precision, value)
+    if length <= 0 or length >= <int>sizeof(number):
+        path.failed = True
+        return
+    if path.precision > 0:
+        while number[length - 1] == b'0':
+            length -= 1
+        if number[length - 1] == b'.':
+            length -= 1
+    if length == 2 and number[0] == b'-' and number[1] == b'0':
+        number[0] = b'0'
+        length = 1
+    if not _svg_reserve(path, length + 1):
+        return
+    if separator:
+        path.data[path.length] = b' '
+        path.length += 1
+    memcpy(&path.data[path.length], number, length)
+    path.length += length
+
+
+cdef void _svg_append_point(_SvgPath* path, float x, float y,
+                            bint separator, bint end) noexcept nogil:
+    cdef double rx = floor((x + path.origin_x) * path.scale + 0.5) / path.scale
+    cdef double ry = floor((y + path.origin_y) * path.scale + 0.5) / path.scale
+    if path.relative:
+        _svg_append_number(path, rx - path.x, separator)
+        _svg_append_number(path, ry - path.y, True)
+    else:
+        _svg_append_number(path, rx, separator)
+        _svg_append_number(path, ry, True)
+    if end:
+        path.x = rx
+        path.y = ry
+
+
+cdef void _svg_move_to_func(hb_draw_funcs_t *dfuncs,
+                            void *draw_data,
+                            hb_draw_state_t *st,
+                            float to_x,
+                            float to_y,
+                            void *user_data) noexcept nogil:
+    cdef _SvgPath* path = <_SvgPath*>draw_data
+    _svg_append_command(path, b'M')
+    _svg_append_point(path, to_x, to_y, False, True)
+    path.start_x = path.x
+    path.start_y = path.y
+
+cdef void _svg_line_to_func(hb_draw_funcs_t *dfuncs,
+                            void *draw_data,
+                            hb_draw_state_t *st,
+                            float to_x,
+                            float to_y,
+                            void *user_data) noexcept nogil:
+    cdef _SvgPath* path = <_SvgPath*>draw_data
+    _svg_append_command(path, b'L')
+    _svg_append_point(path, to_x, to_y, False, True)
+
+cdef void _svg_quadratic_to_func(hb_draw_funcs_t *dfuncs,
+                                 void *draw_data,
+                                 hb_draw_state_t *st,
+                                 float c1_x,
+                                 float c1_y,
+                                 float to_x,
+                                 float to_y,
+                                 void *user_data) noexcept nogil:
+    cdef _SvgPath* path = <_SvgPath*>draw_data
+    _svg_append_command(path, b'Q')
+    _svg_append_point(path, c1_x, c1_y, False, False)
+    _svg_append_point(path, to_x, to_y, True, True)
+
+cdef void _svg_cubic_to_func(hb_draw_funcs_t *dfuncs,
+                             void *draw_data,
+                             hb_draw_state_t *st,
+                             float c1_x,
+                             float c1_y,
+                             float c2_x,
+                             float c2_y,
+                             float to_x,
+                             float to_y,
+                             void *user_data) noexcept nogil:
+    cdef _SvgPath* path = <_SvgPath*>draw_data
+    _svg_append_command(path, b'C')
+    _svg_append_point(path, c1_x, c1_y, False, False)
+    _svg_append_point(path, c2_x, c2_y, True, False)
+    _svg_append_point(path, to_x, to_y, True, True)
+
+cdef void _svg_close_path_func(hb_draw_funcs_t *dfuncs,
+                               void *draw_data,
+                               hb_draw_state_t *st,
+                               void *user_data) noexcept nogil:
+    cdef _SvgPath* path = <_SvgPath*>draw_data
+    _svg_append_command(path, b'Z')
+    path.x = path.start_x
+    path.y = path.start_y
+
+
+cdef hb_draw_funcs_t* _svg_drawfuncs = NULL
+
+cdef hb_draw_funcs_t* _get_svg_drawfuncs() noexcept:
+    global _svg_drawfuncs
+    if _svg_drawfuncs is NULL:
+        _svg_drawfuncs = hb_draw_funcs_create()
+        hb_draw_funcs_set_move_to_func(
+            _svg_drawfuncs, _svg_move_to_func, NULL, NULL)
+        hb_draw_funcs_set_line_to_func(
+            _svg_drawfuncs, _svg_line_to_func, NULL, NULL)
+        hb_draw_funcs_set_quadratic_to_func(
+            _svg_drawfuncs, _svg_quadratic_to_func, NULL, NULL)
+        hb_draw_funcs_set_cubic_to_func(
+            _svg_drawfuncs, _svg_cubic_to_func, NULL, NULL)
+        hb_draw_funcs_set_close_path_func(
+            _svg_drawfuncs, _svg_close_path_func, NULL, NULL)
+    return _svg_drawfuncs
+
+
+cdef void _svg_path_draw_glyphs(hb_font_t* font,
+                                hb_glyph_info_t* infos,
+                                hb_glyph_position_t* positions,
+                                unsigned int length,
+                                hb_draw_funcs_t* funcs,
+                                _SvgPath* path) noexcept nogil:
+    """Draws the glyphs of a shaped run to ``path`` with the SVG draw funcs
+    ``funcs``, each glyph placed at its position in the run."""
+    cdef unsigned int i
+    cdef double x = 0
+    cdef double y = 0
+    for i in range(length):
+        path.origin_x = x + positions[i].x_offset
+        path.origin_y = y + positions[i].y_offset
+        hb_font_draw_glyph_nogil(font, infos[i].codepoint, funcs, path)
+        x += positions[i].x_advance
+        y += positions[i].y_advance
+
+
+cdef struct _Bounds:
+    bint has_ink
+    double x_min
+    double y_min
+    double x_max
+    double y_max
+    double origin_x  # offset applied to all points
+    double origin_y
+    float x  # current point, before the offset
+    float y
+
+
+cdef inline void _bounds_add(_Bounds* b, double x, double y) noexcept nogil:
+    x += b.origin_x
+    y += b.origin_y
+    if not b.has_ink:
+        b.x_min = b.x_max = x
+        b.y_min = b.y_max = y
+        b.has_ink = True
+        return
+    if x < b.x_min:
+        b.x_min = x
+    if x > b.x_max:
+        b.x_max = x
+    if y < b.y_min:
+        b.y_min = y
+    if y > b.y_max:
+        b.y_max = y
+
+
+cdef inline void _bounds_union(_Bounds* b, const _Bounds* other) noexcept nogil:
+    if other.has_ink:
+        _bounds_add(b, other.x_min - b.origin_x, other.y_min - b.origin_y)
+        _bounds_add(b, other.x_max - b.origin_x, other.y_max - b.origin_y)
+
+
+cdef inline void _bounds_add_quadratic(_Bounds* b, double t,
+                                       double c1_x, double c1_y,
+                                       double to_x, double to_y) noexcept nogil:
+    cdef double u = 1 - t
+    if 0 < t < 1:
+        _bounds_add(b,
+                    u * u * b.x + 2 * u * t * c1_x + t * t * to_x,
+                    u * u * b.y + 2 * u * t * c1_y + t * t * to_y)
+
+
+cdef inline void _bounds_add_cubic(_Bounds* b, double t,
+                                   double c1_x, double c1_y,
+                                   double c2_x, double c2_y,
+                                   double to_x, double to_y) noexcept nogil:
+    cdef double u = 1 - t
+    if 0 < t < 1:
+        _bounds_add(b,
+                    u * u * u * b.x + 3 * u * u * t * c1_x
+                    + 3 * u * t * t * c2_x + t * t * t * to_x,
+                    u * u * u * b.y + 3 * u * u * t * c1_y
+                    + 3 * u * t * t * c2_y + t * t * t * to_y)
+
+
+cdef inline void _cubic_extrema(double p0, double p1, double p2, double p3,
+                                double* t) noexcept nogil:
+    # Roots of the derivative of a cubic Bezier along one axis; -1 if none.
+    cdef double a = -p0 + 3 * p1 - 3 * p2 + p3
+    cdef double b = 2 * (p0 - 2 * p1 + p2)
+    cdef double c = p1 - p0
+    cdef double d
+    t[0] = t[1] = -1
+    if a == 0:
+        if b != 0:
+            t[0] = -c / b
+        return
+    d = b * b - 4 * a * c
+    if d < 0:
+        return
+    d = sqrt(d)
+    t[0] = (-b + d) / (2 * a)
+    t[1] = (-b - d) / (2 * a)
+
+
+cdef void _bounds_move_to_func(hb_draw_funcs_t *dfuncs,
+                               void *draw_data,
+                               hb_draw_state_t *st,
+                               float to_x,
+                               float to_y,
+                               void *user_data) noexcept nogil:
+    cdef _Bounds* b = <_Bounds*>draw_data
+    _bounds_add(b, to_x, to_y)
+    b.x = to_x
+    b.y = to_y
+
+cdef void _bounds_quadratic_to_func(hb_draw_funcs_t *dfuncs,
+                                    void *draw_data,
+                                    hb_draw_state_t *st,
+                                    float c1_x,
+                                    float c1_y,
+                                    float to_x,
+                                    float to_y,
+                                    void *user_data) noexcept nogil:
+    cdef _Bounds* b = <_Bounds*>draw_data
+    cdef double d = b.x - 2 * c1_x + to_x
+    if d != 0:
+        _bounds_add_quadratic(b, (b.x - c1_x) / d, c1_x, c1_y, to_x, to_y)
+    d = b.y - 2 * c1_y + to_y
+    if d != 0:
+        _bounds_add_quadratic(b, (b.y - c1_y) / d, c1_x, c1_y, to_x, to_y)
+    _bounds_move_to_func(dfuncs, draw_data, st, to_x, to_y, user_data)
+
+cdef void _bounds_cubic_to_func(hb_draw_funcs_t *dfuncs,
+                                void *draw_data,
+                                hb_draw_state_t *st,
+                                float c1_x,
+                                float c1_y,
+                                float c2_x,
+                                float c2_y,
+                                float to_x,
+                                float to_y,
+                                void *user_data) noexcept nogil:
+    cdef _Bounds* b = <_Bounds*>draw_data
+    cdef double t[2]
+    _cubic_extrema(b.x, c1_x, c2_x, to_x, t)
+    _bounds_add_cubic(b, t[0], c1_x, c1_y, c2_x, c2_y, to_x, to_y)
+    _bounds_add_cubic(b, t[1], c1_x, c1_y, c2_x, c2_y, to_x, to_y)
+    _cubic_extrema(b.y, c1_y, c2_y, to_y, t)
+    _bounds_add_cubic(b, t[0], c1_x, c1_y, c2_x, c2_y, to_x, to_y)
+    _bounds_add_cubic(b, t[1], c1_x, c1_y, c2_x, c2_y, to_x, to_y)
+    _bounds_move_to_func(dfuncs, draw_data, st, to_x, to_y, user_data)
+
+
+cdef hb_draw_funcs_t* _bounds_drawfuncs = NULL
+
+cdef hb_draw_funcs_t* _get_bounds_drawfuncs() noexcept:
+    global _bounds_drawfuncs
+    if _bounds_drawfuncs is NULL:
+        _bounds_drawfuncs = hb_draw_funcs_create()
+        hb_draw_funcs_set_move_to_func(
+            _bounds_drawfuncs, _bounds_move_to_func, NULL, NULL)
+        # Line ends are all that matters for straight segments.
+        hb_draw_funcs_set_line_to_func(
+            _bounds_drawfuncs, _bounds_move_to_func, NULL, NULL)
+        hb_draw_funcs_set_quadratic_to_func(
+            _bounds_drawfuncs, _bounds_quadratic_to_func, NULL, NULL)
+        hb_draw_funcs_set_cubic_to_func(
+            _bounds_drawfuncs, _bounds_cubic_to_func, NULL, NULL)
+    return _bounds_drawfuncs
+
+
+cdef struct _PlacedDraw:
+    hb_draw_funcs_t* funcs  # the draw funcs to forward to
+    void* data
+    hb_draw_state_t st
+    double origin_x  # glyph origin, before the transform
+    double origin_y
+    double xx  # affine transform
+    double yx
+    double xy
+    double yy
+    double dx
+    double dy
+
+
+cdef inline void _placed_point(_PlacedDraw* d, float x, float y,
+                               float* out_x, float* out_y) noexcept nogil:
+    cdef double px = x + d.origin_x
+    cdef double py = y + d.origin_y
+    out_x[0] = <float>(d.xx * px + d.xy * py + d.dx)
+    out_y[0] = <float>(d.yx * px + d.yy * py + d.dy)
+
+
+cdef void _placed_move_to_func(hb_draw_funcs_t *dfuncs,
+                               void *draw_data,
+                               hb_draw_state_t *st,
+                               float to_x,
+                               float to_y,
+                               void *user_data) noexcept nogil:
+    cdef _PlacedDraw* d = <_PlacedDraw*>draw_data
+    _placed_point(d, to_x, to_y, &to_x, &to_y)
+    hb_draw_move_to_nogil(d.funcs, d.data, &d.st, to_x, to_y)
+
+cdef void _placed_line_to_func(hb_draw_funcs_t *dfuncs,
+                               void *draw_data,
+                               hb_draw_state_t *st,
+                               float to_x,
+                               float to_y,
+                               void *user_data) noexcept nogil:
+    cdef _PlacedDraw* d = <_PlacedDraw*>draw_data
+    _placed_point(d, to_x, to_y, &to_x, &to_y)
+    hb_draw_line_to_nogil(d.funcs, d.data, &d.st, to_x, to_y)
+
+cdef void _placed_quadratic_to_func(hb_draw_funcs_t *dfuncs,
+                                    void *draw_data,
+                                    hb_draw_state_t *st,
+                                    float c1_x,
+                                    float c1_y,
+                                    float to_x,
+                                    float to_y,
+                                    void *user_data) noexcept nogil:
+    cdef _PlacedDraw* d = <_PlacedDraw*>draw_data
+    _placed_point(d, c1_x, c1_y, &c1_x, &c1_y)
+    _placed_point(d, to_x, to_y, &to_x, &to_y)
+    hb_draw_quadratic_to_nogil(d.funcs, d.data, &d.st, c1_x, c1_y, to_x, to_y)
+
+cdef void _placed_cubic_to_func(hb_draw_funcs_t *dfuncs,
+                                void *draw_data,
+                                hb_draw_state_t *st,
+                                float c1_x,
+                                float c1_y,
+                                float c2_x,
+                                float c2_y,
+                                float to_x,
+                                float to_y,
+                                void *user_data) noexcept nogil:
+    cdef _PlacedDraw* d = <_PlacedDraw*>draw_data
+    _placed_point(d, c1_x, c1_y, &c1_x, &c1_y)
+    _placed_point(d, c2_x, c2_y, &c2_x, &c2_y)
+    _placed_point(d, to_x, to_y, &to_x, &to_y)
+    hb_draw_cubic_to_nogil(d.funcs, d.data, &d.st,
+                           c1_x, c1_y, c2_x, c2_y, to_x, to_y)
+
+cdef void _placed_close_path_func(hb_draw_funcs_t *dfuncs,
+                                  void *draw_data,
+                                  hb_draw_state_t *st,
+                                  void *user_data) noexcept nogil:
+    cdef _PlacedDraw* d = <_PlacedDraw*>draw_data
+    hb_draw_close_path_nogil(d.funcs, d.data, &d.st)
+
+
+cdef hb_draw_funcs_t* _placed_drawfuncs = NULL
+
+cdef hb_draw_funcs_t* _get_placed_drawfuncs() noexcept:
+    global _placed_drawfuncs
+    if _placed_drawfuncs is NULL:
+        _placed_drawfuncs = hb_draw_funcs_create()
+        hb_draw_funcs_set_move_to_func(
+            _placed_drawfuncs, _placed_move_to_func, NULL, NULL)
+        hb_draw_funcs_set_line_to_func(
+            _placed_drawfuncs, _placed_line_to_func, NULL, NULL)
+        hb_draw_funcs_set_quadratic_to_func(
+            _placed_drawfuncs, _placed_quadratic_to_func, NULL, NULL)
+        hb_draw_funcs_set_cubic_to_func(
+            _placed_drawfuncs, _placed_cubic_to_func, NULL, NULL)
+        hb_draw_funcs_set_close_path_func(
+            _placed_drawfuncs, _placed_close_path_func, NULL, NULL)
+    return _placed_drawfuncs
+
+
+cdef void _draw_glyphs_placed(hb_font_t* font,
+                              hb_glyph_info_t* infos,
+                              hb_glyph_position_t* positions,
+                              unsigned int length,
+                              hb_draw_funcs_t* funcs,
+                              _PlacedDraw* d) noexcept nogil:
+    cdef unsigned int i
+    cdef double x = 0
+    cdef double y = 0
+    for i in range(length):
+        d.origin_x = x + positions[i].x_offset
+        d.origin_y = y + positions[i].y_offset
+        hb_font_draw_glyph_nogil(font, infos[i].codepoint, funcs, d)
+        x += positions[i].x_advance
+        y += positions[i].y_advance
+
+
+def draw_buffer(font: Font, buffer: Buffer,
+                draw_funcs: DrawFuncs | None = None,
+                draw_state: object = None,
+                transform: Sequence[float] | None = None) -> GlyphOutline | None:
+    """Draws the glyphs of a shaped buffer as a single path, placing each
+    glyph according to the glyph positions of the buffer, starting at the
+    origin.
+
+    The outlines are passed to the callbacks of ``draw_funcs``, with
+    ``draw_state`` passed to them, as with :meth:`Font.draw_glyph`. If
+    ``draw_funcs`` is ``None``, the outlines are recorded natively, with the
+    GIL released unless the font calls back into Python, and returned as a
+    single :class:`GlyphOutline`.
+
+    :param font: The :class:`Font` the buffer was shaped with.
+    :param buffer: A shaped :class:`Buffer`.
+    :param draw_funcs: The :class:`DrawFuncs` to draw to, or ``None`` to
+        record the outlines.
+    :param draw_state: User data to pass to the draw callbacks.
+    :param transform: An affine transform ``(xx, yx, xy, yy, dx, dy)``
+        applied to all points after the glyphs are placed, mapping
+        ``(x, y)`` to ``(xx * x + xy * y + dx, yx * x + yy * y + dy)``.
+
+    :returns: The recorded :class:`GlyphOutline` if ``draw_funcs`` is
+        ``None``, otherwise ``None``.
+
+    :raises ValueError: If ``buffer`` has not been shaped.
+    """
+    cdef _PlacedDraw d
+    cdef _OutlineRecording rec
+    cdef unsigned int length
+    cdef hb_glyph_info_t* infos
+    cdef hb_glyph_position_t* positions
+    cdef hb_draw_funcs_t* funcs = _get_placed_drawfuncs()
+    cdef hb_font_t* c_font = font._hb_font
+    cdef hb_font_t* private_font
+    memset(&d, 0, sizeof(d))
+    if transform is None:
+        d.xx = d.yy = 1
+    else:
+        d.xx, d.yx, d.xy, d.yy, d.dx, d.dy = transform
+    _get_shaped_glyphs(buffer, &length, &infos, &positions)
+
+    if draw_funcs is not None:
+        d.funcs = draw_funcs._hb_drawfuncs
+        d.data = <void *>draw_state
+        if PyCapsule_IsValid(draw_state, NULL):
+            d.data = <void *>PyCapsule_GetPointer(draw_state, NULL)
+        _draw_glyphs_placed(c_font, infos, positions, length, funcs, &d)
+        return None
+
+    memset(&rec, 0, sizeof(rec))
+    d.funcs = _get_outline_drawfuncs()
+    d.data = &rec
+    private_font = _font_acquire_private(font)
+    if private_font is NULL:
+        _draw_glyphs_placed(c_font, infos, positions, length, funcs, &d)
+    else:
+        with nogil:
+            _draw_glyphs_placed(private_font, infos, positions, length, funcs,
+                                &d)
+        _font_release_private(font)
+    return GlyphOutline.from_recording(&rec)
@@ -178,6 +178,25 @@ class OTLayoutGlyphClass(IntEnum):
 cdef hb_user_data_key_t k
 
 
+cdef void _decref_destroy(void* obj) noexcept with gil:
+    Py_DECREF(<object>obj)
+
+
+cdef hb_blob_t* _blob_create_for_bytes(bytes data) noexcept:
+    """Creates a read-only blob over ``data`` that keeps it alive."""
+    Py_INCREF(data)
+    return hb_blob_create(
+        data, len(data), HB_MEMORY_MODE_READONLY, <void*>data, _decref_destroy)
+
+
+cdef hb_blob_t* _blob_create_for_table_data(object data) except NULL:
+    if isinstance(data, Blob):
+        return hb_blob_reference((<Blob>data)._hb_blob)
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    return _blob_create_for_bytes(data)
+
+
 cdef hb_blob_t* _reference_table_func(
         hb_face_t* face, hb_tag_t tag, void* user_data) noexcept:
     cdef Face py_face = <object>(hb_face_get_user_data(face, &k))
@@ -191,8 +210,7 @@ cdef hb_blob_t* _reference_table_func(
         py_face, packed.decode(), <object>user_data)
     if table is None:
         return NULL
-    return hb_blob_create(
-        table, len(table), HB_MEMORY_MODE_READONLY, NULL, NULL)
+    return _blob_create_for_bytes(table)
 
 
 cdef unsigned int _get_table_tags_func(
@@ -230,6 +248,130 @@ cdef unsigned int _get_table_tags_func(
     return population
 
 
+cdef struct _TableCache:
+    hb_tag_t* tags
+    hb_blob_t** blobs  # NULL for tables not loaded yet
+    unsigned int count
+    unsigned int allocated
+    bint closed  # only the declared tags are served
+    void* loader  # owned reference, or NULL
+
+
+cdef bint _table_cache_append(
+        _TableCache* cache, hb_tag_t tag, hb_blob_t* blob) noexcept:
+    cdef unsigned int allocated
+    cdef hb_tag_t* tags
+    cdef hb_blob_t** blobs
+    if cache.count == cache.allocated:
+        allocated = cache.allocated * 2 if cache.allocated else 16
+        tags = <hb_tag_t*>realloc(cache.tags, allocated * sizeof(hb_tag_t))
+        if tags is NULL:
+            return False
+        cache.tags = tags
+        blobs = <hb_blob_t**>realloc(cache.blobs, allocated * sizeof(hb_blob_t*))
+        if blobs is NULL:
+            return False
+        cache.blobs = blobs
+        cache.allocated = allocated
+    cache.tags[cache.count] = tag
+    cache.blobs[cache.count] = blob
+    cache.count += 1
+    return True
+
+
+cdef hb_blob_t* _table_cache_load(_TableCache* cache, hb_tag_t tag) noexcept:
+    # Exceptions raised by the loader are reported as unraisable, and NULL
+    # is returned.
+    cdef char cstr[5]
+    hb_tag_to_string(tag, cstr)
+    cstr[4] = b'\0'
+    cdef bytes packed = cstr
+    data = (<object>cache.loader)(packed.decode())
+    if data is None:
+        return hb_blob_get_empty()
+    return _blob_create_for_table_data(data)
+
+
+cdef hb_blob_t* _table_cache_reference_table(
+        hb_face_t* face, hb_tag_t tag, void* user_data) noexcept:
+    cdef _TableCache* cache = <_TableCache*>user_data
+    cdef unsigned int i
+    cdef hb_blob_t* blob
+    if tag == 0:
+        return NULL
+    for i in range(cache.count):
+        if cache.tags[i] == tag:
+            if cache.blobs[i] is NULL:
+                cache.blobs[i] = _table_cache_load(cache, tag)
+                # Failed loads are cached as empty tables, so that the
+                # loader is not called again.
+                if cache.blobs[i] is NULL:
+                    cache.blobs[i] = hb_blob_get_empty()
+            return hb_blob_reference(cache.blobs[i])
+    if cache.closed:
+        return NULL
+    blob = _table_cache_load(cache, tag)
+    if blob is NULL:
+        blob = hb_blob_get_empty()
+    if not _table_cache_append(cache, tag, blob):
+        return blob
+    return hb_blob_reference(blob)
+
+
+cdef unsigned int _table_cache_get_table_tags(
+        const hb_face_t* face,
+        unsigned int start_offset,
+        unsigned int* table_count,
+        hb_tag_t* table_tags,
+        void* user_data) noexcept:
+    cdef _TableCache* cache = <_TableCache*>user_data
+    cdef unsigned int i
+    if table_count is NULL:
+        return cache.count
+    if start_offset >= cache.count:
+        table_count[0] = 0
+        return cache.count
+    table_count[0] = min(table_count[0], cache.count - start_offset)
+    for i in range(table_count[0]):
+        table_tags[i] = cache.tags[start_offset + i]
+    return cache.count
+
+
+cdef void _table_cache_destroy(void* user_data) noexcept with gil:
+    cdef _TableCache* cache = <_TableCache*>user_data
+    cdef unsigned int i
+    for i in range(cache.count):
+        if cache.blobs[i] is not NULL:
+            hb_blob_destroy(cache.blobs[i])
+    if cache.loader is not NULL:
+        Py_DECREF(<object>cache.loader)
+    free(cache.tags)
+    free(cache.blobs)
+    free(cache)
+
+
+cdef hb_face_t* _face_create_private(hb_face_t* face,
+                                     hb_blob_t* blob) except NULL:
+    """Creates a face on a new blob over the data of ``blob``, the font data
+    of ``face``, with the index, units per em and glyph count of ``face``,
+    so that it shares no HarfBuzz objects with ``face`` and can be used
+    from another thread. The font data is kept alive by the new blob."""
+    cdef unsigned int length
+    cdef const char* data = hb_blob_get_data(blob, &length)
+    cdef hb_blob_t* private_blob
+    cdef hb_face_t* private_face
+    if not length:
+        raise ValueError("font face has no font data")
+    private_blob = hb_blob_create(data, length, HB_MEMORY_MODE_READONLY,
+                                  hb_blob_reference(blob),
+                                  <hb_destroy_func_t>hb_blob_destroy)
+    private_face = hb_face_create(private_blob, hb_face_get_index(face))
+    hb_blob_destroy(private_blob)
+    hb_face_set_upem(private_face, hb_face_get_upem(face))
+    hb_face_set_glyph_count(private_face, hb_face_get_glyph_count(face))
+    return private_face
+
+
 class OTNameIdPredefined(IntEnum):
     """Predefined values for the OpenType ``name`` table Name ID.
 
@@ -406,7 +548,12 @@ cdef class Face:
     cdef hb_face_t* _hb_face
     cdef object _reference_table_func
     cdef object _get_table_tags_func
+    cdef object _reference_table_user_data
+    cdef object _get_table_tags_user_data
     cdef Blob _blob
+    # Whether table lookups may call back into Python
+    cdef bint _python_tables
+    cdef object _variation_instances
 
     def __cinit__(self, blob: Union[Blob, bytes] = None, int index=0):
         if blob is not None:
@@ -423,6 +570,12 @@ cdef class Face:
         hb_face_destroy(self._hb_face)
         self._blob = None
 
+    def __reduce__(self):
+        blob = self._blob if self._blob is not None else self.blob
+        if not blob and self._hb_face != hb_face_get_empty():
+            raise TypeError("cannot pickle a Face without font data")
+        return Face, (blob, self.index)
+
     @staticmethod
     cdef Face from_ptr(hb_face_t* hb_face):
         """Create Face from a pointer, taking ownership of it."""
@@ -468,6 +621,82 @@ cdef class Face:
             _reference_table_func, <void*>user_data, NULL)
         hb_face_set_user_data(inst._hb_face, &k, <void*>inst, NULL, 0)
         inst._reference_table_func = func
+        inst._reference_table_user_data = user_data
+        inst._python_tables = True
+        return inst
+
+    @classmethod
+    def create_for_table_data(cls,
+                              tables: Union[
+                                  Dict[str, Union[Blob, bytes]],
+                                  Callable[[str], Union[Blob, bytes, None]]
+                              ],
+                              tags: Sequence[str] | None = None) -> Face:
+        """Creates a new face object from per-table data, like
+        :meth:`create_for_tables`, but caches the table blobs natively for
+        the lifetime of the face, so that repeated table lookups do not call
+        back into Python.
+
+        ``tables`` is either a mapping from table tags to table data, or a
+        loader callable that takes a table tag and returns the table data,
+        or ``None`` if the table is not present. A loader is called at most
+        once per tag; if it raises, the exception is reported with
+        :func:`sys.unraisablehook` and the table is treated as missing.
+        Table data given as :class:`Blob` or :class:`bytes` is used without
+        copying; other bytes-like objects are copied.
+
+        :attr:`table_tags` reports the tags of the mapping, or ``tags`` when
+        a loader is given.
+
+        :param tables: A mapping of table tags to table data, or a loader.
+        :param tags: The tags of the tables available from the loader. If
+            given, only these tables are requested from the loader.
+            Otherwise, the loader is consulted for every table tag and
+            :attr:`table_tags` is empty.
+
+        Wraps `hb_face_create_for_tables()
+        <https://harfbuzz.github.io/harfbuzz-hb-face.html#hb-face-create-for-tables>`_.
+        """
+        cdef Face inst = cls(None)
+        cdef _TableCache* cache = <_TableCache*>calloc(1, sizeof(_TableCache))
+        cdef bytes packed
+        cdef hb_blob_t* blob
+        if cache is NULL:
+            raise MemoryError()
+        try:
+            if callable(tables):
+                Py_INCREF(tables)
+                cache.loader = <void*>tables
+                cache.closed = tags is not None
+                inst._python_tables = True
+                items = [(tag, None) for tag in tags or ()]
+            elif tags is not None:
+                raise ValueError("tags can only be given with a table loader")
+            else:
+                cache.closed = True
+                items = tables.items()
+            for tag, data in items:
+                packed = tag.encode()
+                if cache.loader is not NULL:
+                    blob = NULL
+                elif data is None:
+                    blob = hb_blob_get_empty()
+                else:
+                    blob = _blob_create_for_table_data(data)
+                if not _table_cache_append(
+                        cache, hb_tag_from_string(<char*>packed, -1), blob):
+                    hb_blob_destroy(blob)
+                    raise MemoryError()
+        except:
+            _table_cache_destroy(cache)
+            raise
+        inst._hb_face = hb_face_create_for_tables(
+            _table_cache_reference_table, cache, _table_cache_destroy)
+        if inst._hb_face == hb_face_get_empty():
+            raise MemoryError()
+        if cache.closed:
+            hb_face_set_get_table_tags_func(
+                inst._hb_face, _table_cache_get_table_tags, cache, NULL)
         return inst
 
     @property
@@ -555,7 +784,8 @@ cdef class Face:
         :param tag: The four-character tag of the table to query.
 
         :returns: A :class:`Blob` with the table data, or an empty blob if
-            referencing table data is not possible.
+            referencing table data is not possible. Use
+            :attr:`Blob.data_view` to inspect the table without copying it.
 
         Wraps `hb_face_reference_table()
         <https://harfbuzz.github.io/harfbuzz-hb-face.html#hb-face-reference-table>`_.
@@ -582,6 +812,7 @@ cdef class Face:
         <https://harfbuzz.github.io/harfbuzz-hb-face.html#hb-face-set-get-table-tags-func>`_.
         """
         self._get_table_tags_func = func
+        self._get_table_tags_user_data = user_data
         hb_face_set_get_table_tags_func(
             self._hb_face, _get_table_tags_func, <void*>user_data, NULL)
 
@@ -736,6 +967,19 @@ cdef class Face:
         free(coords)
         return instances
 
+    @property
+    def variation_instances(self) -> VariationInstanceCache:
+        """The cache of variation instances of this face, created on first
+        use. Its instances have the settings of a new :class:`Font` for
+        this face; create a :class:`VariationInstanceCache` for a font to
+        cache instances with other settings.
+
+        :type: VariationInstanceCache
+        """
+        if self._variation_instances is None:
+            self._variation_instances = VariationInstanceCache(self)
+        return self._variation_instances
+
     # math
     @property
     def has_math_data(self) -> bool:
@@ -277,6 +277,282 @@ class StyleTag(IntEnum):
     WIDTH = HB_STYLE_TAG_WIDTH
     WEIGHT = HB_STYLE_TAG_WEIGHT
 
+
+class OutlineCacheStats(NamedTuple):
+    """Statistics of the glyph outline cache of a :class:`Font`."""
+    hits: int
+    """Number of outlines served from the cache."""
+    misses: int
+    """Number of outlines that had to be drawn."""
+    evictions: int
+    """Number of outlines evicted to stay within the memory budget."""
+    resident_bytes: int
+    """Approximate memory used by the cached outlines."""
+
+
+cdef GlyphOutline _draw_glyph_outline(hb_font_t* font, hb_codepoint_t gid):
+    cdef _OutlineRecording rec
+    memset(&rec, 0, sizeof(rec))
+    hb_font_draw_glyph(font, gid, _get_outline_drawfuncs(), &rec)
+    return GlyphOutline.from_recording(&rec)
+
+
+cdef _Bounds* _buffer_glyph_bounds(Font font, Buffer buffer, bint exact,
+                                   unsigned int* length) except NULL:
+    """Returns the ink bounds of each glyph of a shaped buffer, placed at its
+    position in the run. The caller owns the returned array."""
+    cdef hb_glyph_info_t* infos
+    cdef hb_glyph_position_t* positions
+    cdef hb_draw_funcs_t* funcs = _get_bounds_drawfuncs()
+    cdef hb_font_t* private_font
+    cdef _Bounds* bounds
+    cdef unsigned int n
+    _get_shaped_glyphs(buffer, &n, &infos, &positions)
+    private_font = _font_acquire_private(font)
+    bounds = <_Bounds*>calloc(max(n, 1), sizeof(_Bounds))
+    if bounds is NULL:
+        if private_font is not NULL:
+            _font_release_private(font)
+        raise MemoryError()
+    if private_font is NULL:
+        _placed_glyph_bounds(font._hb_font, infos, positions, n, exact, funcs,
+                             bounds)
+    else:
+        with nogil:
+            _placed_glyph_bounds(private_font, infos, positions, n, exact,
+                                 funcs, bounds)
+        _font_release_private(font)
+    length[0] = n
+    return bounds
+
+
+cdef void _placed_glyph_bounds(hb_font_t* font,
+                               hb_glyph_info_t* infos,
+                               hb_glyph_position_t* positions,
+                               unsigned int length,
+                               bint exact,
+                               hb_draw_funcs_t* funcs,
+                               _Bounds* bounds) noexcept nogil:
+    cdef unsigned int i
+    cdef double x = 0
+    cdef double y = 0
+    cdef hb_glyph_extents_t extents
+    cdef _Bounds* b
+    for i in range(length):
+        b = &bounds[i]
+        b.origin_x = x + positions[i].x_offset
+        b.origin_y = y + positions[i].y_offset
+        if exact:
+            hb_font_draw_glyph_nogil(font, infos[i].codepoint, funcs, b)
+        elif (hb_font_get_glyph_extents_nogil(font, infos[i].codepoint, &extents)
+              and (extents.width or extents.height)):
+            _bounds_add(b, extents.x_bearing, extents.y_bearing)
+            _bounds_add(b, extents.x_bearing + extents.width,
+                        extents.y_bearing + extents.height)
+        x += positions[i].x_advance
+        y += positions[i].y_advance
+
+
+cdef int _buffer_ink_bounds(Font font, Buffer buffer, bint exact,
+                            _Bounds* total) except -1:
+    cdef unsigned int length
+    cdef unsigned int i
+    cdef _Bounds* bounds = _buffer_glyph_bounds(font, buffer, exact, &length)
+    memset(total, 0, sizeof(_Bounds))
+    for i in range(length):
+        _bounds_union(total, &bounds[i])
+    free(bounds)
+    return 0
+
+
+cdef void _bounds_to_glyph_extents(const _Bounds* b,
+                                   hb_glyph_extents_t* extents) noexcept:
+    cdef double x_min, y_min, x_max, y_max
+    if not b.has_ink:
+        memset(extents, 0, sizeof(hb_glyph_extents_t))
+        return
+    x_min = floor(b.x_min)
+    y_min = floor(b.y_min)
+    x_max = ceil(b.x_max)
+    y_max = ceil(b.y_max)
+    extents.x_bearing = <hb_position_t>x_min
+    extents.y_bearing = <hb_position_t>y_max
+    extents.width = <hb_position_t>(x_max - x_min)
+    extents.height = <hb_position_t>(y_min - y_max)
+
+
+cdef object _bounds_to_extents(const _Bounds* b):
+    cdef hb_glyph_extents_t extents
+    _bounds_to_glyph_extents(b, &extents)
+    return GlyphExtents(extents.x_bearing, extents.y_bearing,
+                        extents.width, extents.height)
+
+
+cdef bint _font_calls_python(Font font):
+    """Returns whether glyph lookups on a font may call back into Python,
+    through custom font functions of the font or of its parents, or through
+    the table callbacks of its face. The GIL is kept for such fonts."""
+    while font is not None:
+        if font._ffuncs is not None or font._face._python_tables:
+            return True
+        font = font._parent
+    return False
+
+
+cdef hb_font_t* _font_create_private(hb_font_t* font) except NULL:
+    """Creates a font with the outline settings of ``font`` on a private
+    face over the same font data, so that it shares no HarfBuzz objects
+    with ``font`` and can be used from another thread."""
+    cdef hb_face_t* face = hb_font_get_face(font)
+    cdef hb_blob_t* blob = hb_face_reference_blob(face)
+    cdef hb_face_t* private_face
+    cdef hb_font_t* private_font
+    cdef int x_scale, y_scale
+    cdef unsigned int x_ppem, y_ppem, length
+    cdef float x_embolden, y_embolden
+    cdef hb_bool_t in_place
+    cdef const int* coords
+    try:
+        private_face = _face_create_private(face, blob)
+    finally:
+        hb_blob_destroy(blob)
+    private_font = hb_font_create(private_face)
+    hb_face_destroy(private_face)
+
+    hb_font_get_scale(font, &x_scale, &y_scale)
+    hb_font_set_scale(private_font, x_scale, y_scale)
+    hb_font_get_ppem(font, &x_ppem, &y_ppem)
+    hb_font_set_ppem(private_font, x_ppem, y_ppem)
+    hb_font_set_ptem(private_font, hb_font_get_ptem(font))
+    hb_font_get_synthetic_bold(font, &x_embolden, &y_embolden, &in_place)
+    hb_font_set_synthetic_bold(private_font, x_embolden, y_embolden, in_place)
+    hb_font_set_synthetic_slant(private_font, hb_font_get_synthetic_slant(font))
+    coords = hb_font_get_var_coords_normalized(font, &length)
+    if length:
+        hb_font_set_var_coords_normalized(private_font, coords, length)
+    return private_font
+
+
+cdef hb_font_t* _font_acquire_private(Font font) except? NULL:
+    """Returns a private copy of a font to use with the GIL released, or
+    NULL if the font itself has to be used with the GIL held: when it calls
+    back into Python, has no font data of its own, or its copy is in use by
+    another thread. HarfBuzz is built without thread-safety, so a font
+    shared with other Python threads must not be used without the GIL.
+
+    The copy is kept with the font and created again after the font
+    changes. It has to be handed back with :func:`_font_release_private`."""
+    cdef unsigned int serial
+    cdef hb_blob_t* blob
+    cdef unsigned int length
+    if font._private_busy or _font_calls_python(font):
+        return NULL
+    serial = hb_font_get_serial(font._hb_font)
+    if font._private_font is NULL or font._private_serial != serial:
+        blob = hb_face_reference_blob(hb_font_get_face(font._hb_font))
+        length = hb_blob_get_length(blob)
+        hb_blob_destroy(blob)
+        if not length:
+            return NULL
+        hb_font_destroy(font._private_font)
+        font._private_font = NULL
+        font._private_font = _font_create_private(font._hb_font)
+        font._private_serial = serial
+    font._private_busy = True
+    return font._private_font
+
+
+cdef void _font_release_private(Font font) noexcept:
+    font._private_busy = False
+
+
+cdef tuple _font_serials(hb_font_t* font):
+    """Returns the serials of a font and of its parents. The serial of a font
+    changes with every setter call."""
+    cdef list serials = []
+    cdef hb_font_t* empty = hb_font_get_empty()
+    while font is not NULL and font is not empty:
+        serials.append(hb_font_get_serial(font))
+        font = hb_font_get_parent(font)
+    return tuple(serials)
+
+
+cdef tuple _font_draw_state(hb_font_t* font, tuple serials):
+    """Returns a hashable snapshot of the settings of a font that affect its
+    glyph outlines. Sub-fonts draw with the settings of their parents, whose
+    serials are made part of the state."""
+    cdef int x_scale, y_scale
+    cdef float x_embolden, y_embolden
+    cdef hb_bool_t in_place
+    cdef unsigned int length
+    cdef const int* coords
+    hb_font_get_scale(font, &x_scale, &y_scale)
+    hb_font_get_synthetic_bold(font, &x_embolden, &y_embolden, &in_place)
+    coords = hb_font_get_var_coords_normalized(font, &length)
+    return (
+        x_scale, y_scale,
+        tuple([coords[i] for i in range(length)]),
+        x_embolden, y_embolden, bool(in_place),
+        hb_font_get_synthetic_slant(font),
+        serials[1:],
+    )
+
+
+cdef class _OutlineCache:
+    """LRU cache of glyph outlines, keyed by glyph ID and by the font
+    settings that affect outlines."""
+
+    cdef object _entries
+    cdef size_t max_bytes
+    cdef size_t resident_bytes
+    cdef size_t hits
+    cdef size_t misses
+    cdef size_t evictions
+    cdef tuple _serials
+    cdef tuple _state
+
+    def __cinit__(self, size_t max_bytes):
+        self._entries = OrderedDict()
+        self.max_bytes = max_bytes
+        self.resident_bytes = self.hits = self.misses = self.evictions = 0
+        self._serials = self._state = None
+
+    cdef tuple _font_state(self, hb_font_t* font):
+        # The settings are only read again when the serial of the font or of
+        # one of its parents has changed.
+        cdef tuple serials = _font_serials(font)
+        if self._serials != serials:
+            self._state = _font_draw_state(font, serials)
+            self._serials = serials
+        return self._state
+
+    cdef GlyphOutline get(self, hb_font_t* font, hb_codepoint_t gid):
+        cdef GlyphOutline outline
+        key = (gid, self._font_state(font))
+        outline = self._entries.get(key)
+        if outline is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return outline
+        self.misses += 1
+        outline = _draw_glyph_outline(font, gid)
+        self._entries[key] = outline
+        self.resident_bytes += outline._nbytes()
+        self.evict()
+        return outline
+
+    cdef void evict(self):
+        cdef GlyphOutline outline
+        while self.resident_bytes > self.max_bytes and self._entries:
+            _, outline = self._entries.popitem(last=False)
+            self.resident_bytes -= outline._nbytes()
+            self.evictions += 1
+
+    cdef void clear(self):
+        self._entries.clear()
+        self.resident_bytes = 0
+
+
 cdef class Font:
     """Font objects.
 
@@ -289,6 +565,11 @@ cdef class Font:
     implement the basic, lower-level queries of font objects. This set of
     font functions is defined by the virtual methods in :class:`FontFuncs`.
 
+    Fonts can be pickled, together with their face, size, synthetic and
+    variation settings, unless they use custom font functions. See
+    :meth:`Blob.to_shared_memory` to avoid copying the font data to every
+    process.
+
     :param face_or_font: A :class:`Face` to create a font from, or another
         :class:`Font` to create a sub-font from. If ``None``, the empty font
         is returned.
@@ -301,6 +582,12 @@ cdef class Font:
     # GC bookkeeping
     cdef Face _face
     cdef FontFuncs _ffuncs
+    cdef Font _parent
+    cdef _OutlineCache _outline_cache
+    # Private copy for use without the GIL, see _font_acquire_private()
+    cdef hb_font_t* _private_font
+    cdef unsigned int _private_serial
+    cdef bint _private_busy
 
     def __cinit__(self, face_or_font: Union[Face, Font] = None):
         if face_or_font is not None:
@@ -319,10 +606,29 @@ cdef class Font:
     cdef __create_sub_font(self, Font font):
         self._hb_font = hb_font_create_sub_font(font._hb_font)
         self._face = font._face
+        self._parent = font
 
     def __dealloc__(self):
+        hb_font_destroy(self._private_font)
         hb_font_destroy(self._hb_font)
-        self._face = self._ffuncs = None
+        self._face = self._ffuncs = self._parent = None
+
+    def __reduce__(self):
+        if self._ffuncs is not None:
+            raise TypeError("cannot pickle a Font with custom font functions")
+        state = (self.scale, self.ppem, self.ptem, self.synthetic_bold,
+                 self.synthetic_slant, self.get_var_coords_normalized())
+        return Font, (self._face,), state
+
+    def __setstate__(self, state):
+        scale, ppem, ptem, synthetic_bold, synthetic_slant, coords = state
+        self.scale = scale
+        self.ppem = ppem
+        self.ptem = ptem
+        self.synthetic_bold = synthetic_bold
+        self.synthetic_slant = synthetic_slant
+        if coords:
+            self.set_var_coords_normalized(coords)
 
     @staticmethod
     cdef Font from_ptr(hb_font_t* hb_font):
@@ -645,6 +951,77 @@ cdef class Font:
         else:
             return None
 
+    def get_buffer_extents(self, buffer: Buffer, exact: bool = False) -> GlyphExtents:
+        """Computes the ink bounding box of a shaped buffer, placing each
+        glyph according to the glyph positions of the buffer, starting at the
+        origin.
+
+        By default the bounding box is combined from the glyph extents of
+        the font, as returned by :meth:`get_glyph_extents`. With ``exact``,
+        the glyph outlines are drawn and the tight bounds of the curves are
+        used instead, rounded outwards to integers.
+
+        The GIL is released during the computation, unless the font calls
+        back into Python, so the buffer must not be modified from other
+        threads.
+
+        :param buffer: A :class:`Buffer` shaped with this font.
+        :param exact: Whether to use exact outline bounds.
+
+        :returns: The :class:`GlyphExtents` of the run, all zero if it has
+            no ink.
+
+        :raises ValueError: If ``buffer`` has not been shaped.
+        """
+        cdef _Bounds total
+        _buffer_ink_bounds(self, buffer, exact, &total)
+        return _bounds_to_extents(&total)
+
+    def get_buffer_cluster_extents(self, buffer: Buffer,
+                                   exact: bool = False) -> Dict[int, GlyphExtents]:
+        """Computes the ink bounding box of each cluster of a shaped buffer.
+
+        See :meth:`get_buffer_extents` for the placement of the glyphs and the
+        meaning of ``exact``.
+
+        :param buffer: A :class:`Buffer` shaped with this font.
+        :param exact: Whether to use exact outline bounds.
+
+        :returns: A dictionary mapping cluster values to the
+            :class:`GlyphExtents` of the glyphs of each cluster, in buffer
+            order. Clusters without ink have all-zero extents.
+
+        :raises ValueError: If ``buffer`` has not been shaped.
+        """
+        cdef unsigned int length
+        cdef unsigned int i
+        cdef unsigned int start = 0
+        cdef uint32_t cluster
+        cdef _Bounds total
+        cdef hb_glyph_info_t* infos = hb_buffer_get_glyph_infos(buffer._hb_buffer, NULL)
+        cdef _Bounds* bounds = _buffer_glyph_bounds(self, buffer, exact, &length)
+        cdef dict clusters = {}
+        try:
+            while start < length:
+                cluster = infos[start].cluster
+                memset(&total, 0, sizeof(total))
+                i = start
+                while i < length and infos[i].cluster == cluster:
+                    _bounds_union(&total, &bounds[i])
+                    i += 1
+                if cluster in clusters:
+                    # Non-contiguous cluster
+                    previous = clusters[cluster]
+                    if previous.width or previous.height:
+                        _bounds_add(&total, previous.x_bearing, previous.y_bearing)
+                        _bounds_add(&total, previous.x_bearing + previous.width,
+                                    previous.y_bearing + previous.height)
+                clusters[cluster] = _bounds_to_extents(&total)
+                start = i
+        finally:
+            free(bounds)
+        return clusters
+
     def get_glyph_h_advance(self, gid: int) -> int:
         """Fetches the advance for a glyph ID, for horizontal text segments.
 
@@ -933,6 +1310,226 @@ cdef class Font:
 
         hb_font_draw_glyph(self._hb_font, gid, drawfuncs, <void*>&methods)
 
+    def get_glyph_outline(self, gid: int) -> GlyphOutline:
+        """Records the outline of a glyph natively, without calling back
+        into Python.
+
+        :param gid: The glyph ID.
+
+        If the outline cache is enabled (see
+        :attr:`outline_cache_max_bytes`), outlines are served from it and
+        the same :class:`GlyphOutline` object may be returned again.
+
+        :returns: A :class:`GlyphOutline`, empty if the glyph has no
+            outline.
+
+        Wraps `hb_font_draw_glyph()
+        <https://harfbuzz.github.io/harfbuzz-hb-font.html#hb-font-draw-glyph>`_.
+        """
+        if self._outline_cache is not None:
+            return self._outline_cache.get(self._hb_font, gid)
+        return _draw_glyph_outline(self._hb_font, gid)
+
+    def get_glyph_paint(self, gid: int, palette_index: int = 0,
+                        foreground: Color | None = None) -> GlyphPaint:
+        """Records the paint operations of a glyph natively, without
+        calling back into Python, as :meth:`paint_glyph` would emit them.
+
+        :param gid: The glyph ID.
+        :param palette_index: The index of the font's color palette to use.
+        :param foreground: The foreground color, unpremultiplied.
+
+        :returns: A :class:`GlyphPaint`, which can be inspected or replayed
+            into a :class:`PaintFuncs`.
+
+        Wraps `hb_font_paint_glyph()
+        <https://harfbuzz.github.io/harfbuzz-hb-font.html#hb-font-paint-glyph>`_.
+        """
+        cdef hb_color_t c_foreground = 0x000000FF
+        if foreground is not None:
+            c_foreground = foreground.to_int()
+        return _record_glyph_paint(self, gid, palette_index, c_foreground)
+
+    def paint_glyph_to_svg(self, gid: int, palette_index: int = 0,
+                           foreground: Color | None = None,
+                           precision: int = 2) -> str:
+        """Converts the paint of a glyph to an SVG document, natively,
+        without calling back into Python. The GIL is released while the
+        document is generated, unless the font calls back into Python.
+
+        The document is sized to the extents of the glyph, in units of the
+        font scale, and is upright. Layers, transforms, clips, solid colors
+        and linear and radial gradients map to their SVG equivalents. Sweep
+        gradients, which SVG lacks, are approximated by wedges of solid
+        color, and composite modes by the closest ``mix-blend-mode``. Of
+        glyph images, only PNG images are embedded.
+
+        :param gid: The glyph ID.
+        :param palette_index: The index of the font's color palette to use.
+        :param foreground: The foreground color, unpremultiplied.
+        :param precision: The number of decimal places of coordinates.
+
+        :returns: The SVG document.
+        """
+        return self.paint_glyphs_to_svg([gid], palette_index, foreground,
+                                        precision)[0]
+
+    def paint_glyphs_to_svg(self, glyphs: Sequence[int],
+                            palette_index: int = 0,
+                            foreground: Color | None = None,
+                            precision: int = 2) -> List[str]:
+        """Converts the paint of many glyphs to SVG documents, as
+        :meth:`paint_glyph_to_svg` does, releasing the GIL once for all of
+        them.
+
+        :param glyphs: The glyph IDs.
+        :param palette_index: The index of the font's color palette to use.
+        :param foreground: The foreground color, unpremultiplied.
+        :param precision: The number of decimal places of coordinates.
+
+        :returns: The SVG documents, in the order of ``glyphs``.
+        """
+        cdef hb_color_t c_foreground = 0x000000FF
+        if foreground is not None:
+            c_foreground = foreground.to_int()
+        if not 0 <= precision <= 16:
+            raise ValueError("precision must be between 0 and 16")
+        return _paint_glyphs_to_svg(self, glyphs, palette_index,
+                                    c_foreground, precision)
+
+    @property
+    def outline_cache_max_bytes(self) -> int:
+        """The memory budget of the glyph outline cache used by
+        :meth:`get_glyph_outline`, in bytes. The cache is disabled when this
+        is ``0``, the default.
+
+        Outlines are cached per glyph ID, scale, normalized variation
+        coordinates and synthetic bold and slant settings, and evicted in
+        least-recently-used order. Changing any of these settings on the
+        font, or on its parent font, is detected automatically, and
+        outlines recorded with other settings are never returned.
+
+        Setting this to ``0`` drops all cached outlines.
+
+        :type: int
+        """
+        if self._outline_cache is None:
+            return 0
+        return self._outline_cache.max_bytes
+
+    @outline_cache_max_bytes.setter
+    def outline_cache_max_bytes(self, value: int):
+        if value < 0:
+            raise ValueError("outline_cache_max_bytes must not be negative")
+        if value == 0:
+            self._outline_cache = None
+        elif self._outline_cache is None:
+            self._outline_cache = _OutlineCache(value)
+        else:
+            self._outline_cache.max_bytes = value
+            self._outline_cache.evict()
+
+    @property
+    def outline_cache_stats(self) -> OutlineCacheStats:
+        """The statistics of the glyph outline cache. All zero when the
+        cache is disabled.
+
+        :type: OutlineCacheStats
+        """
+        cdef _OutlineCache cache = self._outline_cache
+        if cache is None:
+            return OutlineCacheStats(0, 0, 0, 0)
+        return OutlineCacheStats(
+            hits=cache.hits,
+            misses=cache.misses,
+            evictions=cache.evictions,
+            resident_bytes=cache.resident_bytes,
+        )
+
+    def clear_outline_cache(self):
+        """Drops all outlines from the glyph outline cache. Statistics are
+        kept.
+        """
+        if self._outline_cache is not None:
+            self._outline_cache.clear()
+
+    def glyph_to_svg_path(self, gid: int, precision: int = 2,
+                          relative: bool = False) -> str:
+        """Converts the outline of a glyph to SVG path data.
+
+        Coordinates are in font units, with the y-axis pointing up as in the
+        font, so the path needs to be flipped (for example with a
+        ``scale(1, -1)`` transform) to display upright in SVG. The GIL is
+        released while the path is generated, unless the font calls back
+        into Python.
+
+        :param gid: The glyph ID.
+        :param precision: The number of decimal places of coordinates.
+        :param relative: Whether to use relative (lowercase) path commands
+            instead of absolute ones.
+
+        :returns: The path data, suitable for the ``d`` attribute of an SVG
+            ``<path>`` element, or an empty string if the glyph has no
+            outline.
+        """
+        cdef _SvgPath path
+        cdef hb_codepoint_t c_gid = gid
+        cdef hb_draw_funcs_t* funcs = _get_svg_drawfuncs()
+        cdef hb_font_t* private_font
+        if not 0 <= precision <= 16:
+            raise ValueError("precision must be between 0 and 16")
+        _svg_path_init(&path, precision, relative)
+        private_font = _font_acquire_private(self)
+        if private_font is NULL:
+            hb_font_draw_glyph(self._hb_font, c_gid, funcs, &path)
+        else:
+            with nogil:
+                hb_font_draw_glyph_nogil(private_font, c_gid, funcs, &path)
+            _font_release_private(self)
+        return _svg_path_finish(&path)
+
+    def buffer_to_svg_path(self, buffer: Buffer, precision: int = 2,
+                           relative: bool = False) -> str:
+        """Converts the glyphs of a shaped buffer to a single SVG path,
+        placing each glyph according to the glyph positions of the buffer,
+        starting at the origin.
+
+        See :meth:`glyph_to_svg_path` for the coordinate system. The GIL is
+        released while the path is generated, unless the font calls back
+        into Python.
+
+        :param buffer: A :class:`Buffer` shaped with this font.
+        :param precision: The number of decimal places of coordinates.
+        :param relative: Whether to use relative (lowercase) path commands
+            instead of absolute ones.
+
+        :returns: The path data.
+
+        :raises ValueError: If ``buffer`` has not been shaped.
+        """
+        cdef _SvgPath path
+        cdef unsigned int length
+        cdef hb_glyph_info_t* infos
+        cdef hb_glyph_position_t* positions
+        cdef hb_draw_funcs_t* funcs = _get_svg_drawfuncs()
+        cdef hb_font_t* private_font
+        if not 0 <= precision <= 16:
+            raise ValueError("precision must be between 0 and 16")
+        _get_shaped_glyphs(buffer, &length, &infos, &positions)
+        if not length:
+            return ""
+        _svg_path_init(&path, precision, relative)
+        private_font = _font_acquire_private(self)
+        if private_font is NULL:
+            _svg_path_draw_glyphs(self._hb_font, infos, positions, length,
+                                  funcs, &path)
+        else:
+            with nogil:
+                _svg_path_draw_glyphs(private_font, infos, positions, length,
+                                      funcs, &path)
+            _font_release_private(self)
+        return _svg_path_finish(&path)
+
     # math
     def get_math_constant(self, constant: OTMathConstant) -> int:
         """Fetches the specified math constant.
@@ -1373,6 +1970,172 @@ cdef hb_bool_t _font_v_extents_func(hb_font_t* font, void* font_data,
     return 0
 
 
+cdef Font _font_create_instance(Font font):
+    """Creates a font for the face of ``font`` with the same size and
+    synthetic settings, at the default variation location. Sub-fonts would
+    take their glyph metrics and outlines from the parent, at the parent's
+    location."""
+    cdef Font inst = Font(font._face)
+    cdef int x, y
+    cdef unsigned int x_ppem, y_ppem
+    cdef float x_embolden, y_embolden
+    cdef hb_bool_t in_place
+    hb_font_get_scale(font._hb_font, &x, &y)
+    hb_font_set_scale(inst._hb_font, x, y)
+    hb_font_get_ppem(font._hb_font, &x_ppem, &y_ppem)
+    hb_font_set_ppem(inst._hb_font, x_ppem, y_ppem)
+    hb_font_set_ptem(inst._hb_font, hb_font_get_ptem(font._hb_font))
+    hb_font_get_synthetic_bold(font._hb_font, &x_embolden, &y_embolden, &in_place)
+    hb_font_set_synthetic_bold(inst._hb_font, x_embolden, y_embolden, in_place)
+    hb_font_set_synthetic_slant(
+        inst._hb_font, hb_font_get_synthetic_slant(font._hb_font))
+    return inst
+
+
+cdef class VariationInstanceCache:
+    """A cache of variation instances of a font.
+
+    Each instance is a font for the face of ``font``, with the same size
+    and synthetic settings, and its variation coordinates set. Switching
+    between locations therefore does not reset the caches HarfBuzz keeps
+    for each font. Instances are keyed by their normalized
+    coordinates, so different design-space locations that normalize to the
+    same coordinates share an instance. The least recently used instance is
+    evicted when the cache is full.
+
+    Instances are shared between callers asking for the same location and
+    must not be modified. They take the settings ``font`` had when they
+    were created, and use the built-in OpenType font functions.
+    :attr:`Face.variation_instances` is a cache kept with the face.
+
+    The cache may be used from several threads, but HarfBuzz is built
+    without thread-safety, so an instance must not be used by more than
+    one thread at a time. Threads working at the same location should each
+    use their own cache.
+
+    :param font: The parent :class:`Font`, or a :class:`Face` to create one
+        from.
+    :param maxsize: The maximum number of cached instances.
+    """
+
+    cdef Font _font
+    cdef unsigned int _axis_count
+    cdef object _instances
+    cdef object _lock
+    cdef Py_ssize_t _maxsize
+
+    def __init__(self, font: Union[Font, Face], Py_ssize_t maxsize = 128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self._font = font if isinstance(font, Font) else Font(font)
+        self._axis_count = hb_ot_var_get_axis_count(self._font._face._hb_face)
+        self._instances = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+
+    @property
+    def font(self) -> Font:
+        """The parent font of the cached instances.
+
+        :type: Font
+        """
+        return self._font
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of cached instances.
+
+        :type: int
+        """
+        return self._maxsize
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    cdef Font _get_instance(self, int* coords):
+        cdef unsigned int i
+        key = tuple([coords[i] for i in range(self._axis_count)])
+        with self._lock:
+            font = self._instances.get(key)
+            if font is not None:
+                self._instances.move_to_end(key)
+                return font
+        font = _font_create_instance(self._font)
+        hb_font_set_var_coords_normalized(
+            (<Font>font)._hb_font, coords, self._axis_count)
+        with self._lock:
+            font = self._instances.setdefault(key, font)
+            self._instances.move_to_end(key)
+            while len(self._instances) > self._maxsize:
+                self._instances.popitem(last=False)
+        return font
+
+    def get(self, variations: Dict[str, float] | None = None) -> Font:
+        """Returns the instance at the given design-space location, creating
+        it if needed. Axes not included in ``variations`` are set to their
+        default values.
+
+        :param variations: A mapping of axis-tag string to value.
+
+        Wraps `hb_ot_var_normalize_variations()
+        <https://harfbuzz.github.io/harfbuzz-hb-ot-var.html#hb-ot-var-normalize-variations>`_.
+        """
+        cdef unsigned int size = len(variations) if variations else 0
+        cdef hb_variation_t* hb_variations
+        cdef int* coords
+        cdef bytes packed
+        cdef unsigned int i
+        hb_variations = <hb_variation_t*>malloc(
+            (size + 1) * sizeof(hb_variation_t))
+        coords = <int*>malloc((self._axis_count + 1) * sizeof(int))
+        if hb_variations is NULL or coords is NULL:
+            free(hb_variations)
+            free(coords)
+            raise MemoryError()
+        try:
+            if size:
+                for i, (name, value) in enumerate(variations.items()):
+                    packed = name.encode()
+                    hb_variations[i].tag = hb_tag_from_string(packed, -1)
+                    hb_variations[i].value = value
+            hb_ot_var_normalize_variations(
+                self._font._face._hb_face, hb_variations, size,
+                coords, self._axis_count)
+            return self._get_instance(coords)
+        finally:
+            free(hb_variations)
+            free(coords)
+
+    def get_normalized(self, coords: Sequence[float]) -> Font:
+        """Returns the instance at the given normalized coordinates,
+        creating it if needed. Axes not included in ``coords`` are set to
+        their default values.
+
+        :param coords: The normalized coordinates, in axis order.
+        """
+        cdef unsigned int length = len(coords)
+        cdef int* coords_2dot14
+        cdef unsigned int i
+        if length > self._axis_count:
+            raise ValueError(
+                f"expected at most {self._axis_count} coordinates, got {length}")
+        coords_2dot14 = <int*>calloc(self._axis_count + 1, sizeof(int))
+        if coords_2dot14 is NULL:
+            raise MemoryError()
+        try:
+            for i in range(length):
+                # Convert from float to 2.14 fixed: multiply by 1 << 14
+                coords_2dot14[i] = round(coords[i] * 0x4000)
+            return self._get_instance(coords_2dot14)
+        finally:
+            free(coords_2dot14)
+
+    def clear(self):
+        """Drops all cached instances."""
+        with self._lock:
+            self._instances.clear()
+
+
 cdef class FontFuncs:
     """The virtual methods that define the font functions used by a
     :class:`Font` for the basic, lower-level queries against a font object.
@@ -0,0 +1,542 @@
+class GlyphBitmapCacheStats(NamedTuple):
+    """Statistics of a :class:`GlyphBitmapCache` or a
+    :class:`ColorGlyphBitmapCache`."""
+    hits: int
+    """Number of bitmaps served from the cache."""
+    misses: int
+    """Number of bitmaps that had to be rendered."""
+    evictions: int
+    """Number of bitmaps evicted to stay within the memory budget."""
+    resident_bytes: int
+    """Approximate memory used by the cached bitmaps."""
+
+
+cdef struct _PlacedBitmap:
+    const uint8_t* pixels
+    hb_raster_extents_t extents
+    int x
+    int y
+
+
+cdef size_t _raster_image_cache_nbytes(RasterImage image):
+    return sizeof(RasterImage) + _raster_image_nbytes(image._hb_raster_image)
+
+
+cdef void _composite_bitmaps(uint8_t* dst, const hb_raster_extents_t* dst_extents,
+                             const _PlacedBitmap* bitmaps, unsigned int count,
+                             unsigned int bpp) noexcept nogil:
+    """Composites bitmaps with premultiplied source-over blending. The
+    bitmaps are placed with their origin at ``(x, y)`` in pixel space."""
+    cdef unsigned int i, row, col, c
+    cdef const _PlacedBitmap* bitmap
+    cdef const uint8_t* src
+    cdef uint8_t* out
+    cdef unsigned int alpha
+    for i in range(count):
+        bitmap = &bitmaps[i]
+        for row in range(bitmap.extents.height):
+            src = bitmap.pixels + <size_t>row * bitmap.extents.stride
+            out = (dst
+                   + <size_t>(bitmap.y + bitmap.extents.y_origin + <int>row
+                              - dst_extents.y_origin) * dst_extents.stride
+                   + <size_t>(bitmap.x + bitmap.extents.x_origin
+                              - dst_extents.x_origin) * bpp)
+            for col in range(bitmap.extents.width):
+                alpha = src[col * bpp + bpp - 1]
+                if not alpha:
+                    continue
+                for c in range(bpp):
+                    out[col * bpp + c] = src[col * bpp + c] + (
+                        out[col * bpp + c] * (255 - alpha) + 127) // 255
+
+
+cdef RasterImage _composite_run(list images, _PlacedBitmap* placed,
+                               hb_raster_format_t format):
+    """Composites glyph bitmaps into a new image sized to fit them all.
+    ``placed[i]`` holds the pixel position of the origin of ``images[i]``;
+    its other fields are filled in here. Bitmaps without ink are
+    skipped."""
+    cdef unsigned int i, count = 0
+    cdef unsigned int bpp = 4 if format == HB_RASTER_FORMAT_BGRA32 else 1
+    cdef RasterImage image
+    cdef RasterImage output = RasterImage()
+    cdef hb_raster_extents_t extents
+    cdef uint8_t* pixels
+    cdef int left, bottom, right, top
+    cdef int x_min = 0, y_min = 0, x_max = 0, y_max = 0
+    for i in range(len(images)):
+        image = images[i]
+        placed[count].x = placed[i].x
+        placed[count].y = placed[i].y
+        hb_raster_image_get_extents(image._hb_raster_image,
+                                    &placed[count].extents)
+        if not placed[count].extents.width or not placed[count].extents.height:
+            continue
+        placed[count].pixels = hb_raster_image_get_buffer(image._hb_raster_image)
+        left = placed[count].x + placed[count].extents.x_origin
+        bottom = placed[count].y + placed[count].extents.y_origin
+        right = left + <int>placed[count].extents.width
+        top = bottom + <int>placed[count].extents.height
+        if not count:
+            x_min, y_min, x_max, y_max = left, bottom, right, top
+        else:
+            x_min = min(x_min, left)
+            y_min = min(y_min, bottom)
+            x_max = max(x_max, right)
+            y_max = max(y_max, top)
+        count += 1
+
+    extents.x_origin = x_min
+    extents.y_origin = y_min
+    extents.width = x_max - x_min
+    extents.height = y_max - y_min
+    extents.stride = 0
+    if not hb_raster_image_configure(output._hb_raster_image, format, &extents):
+        raise MemoryError()
+    if count:
+        hb_raster_image_clear(output._hb_raster_image)
+        hb_raster_image_get_extents(output._hb_raster_image, &extents)
+        pixels = <uint8_t*>hb_raster_image_get_buffer(output._hb_raster_image)
+        with nogil:
+            _composite_bitmaps(pixels, &extents, placed, count, bpp)
+    return output
+
+
+cdef class _BitmapCacheEntries:
+    """The least-recently-used store shared by the glyph bitmap caches,
+    with their statistics and a memo of the settings of the last font."""
+
+    cdef size_t _max_bytes
+    cdef object _entries
+    cdef size_t _resident_bytes
+    cdef size_t _hits
+    cdef size_t _misses
+    cdef size_t _evictions
+    cdef Font _font
+    cdef tuple _serials
+    cdef tuple _state
+
+    def __init__(self, max_bytes):
+        self._entries = OrderedDict()
+        self.set_max_bytes(max_bytes)
+
+    cdef int set_max_bytes(self, object value) except -1:
+        if value < 0:
+            raise ValueError("max_bytes must not be negative")
+        self._max_bytes = value
+        self.evict()
+        return 0
+
+    cdef object stats(self):
+        return GlyphBitmapCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            resident_bytes=self._resident_bytes,
+        )
+
+    cdef void clear(self):
+        self._entries.clear()
+        self._resident_bytes = 0
+        self._font = None
+        self._serials = self._state = None
+
+    cdef tuple font_state(self, Font font):
+        # The settings are only read again for another font, or when the
+        # serial of the font or of one of its parents has changed.
+        cdef tuple serials = _font_serials(font._hb_font)
+        if self._font is not font or self._serials != serials:
+            self._state = _font_draw_state(font._hb_font, serials)
+            self._font = font
+            self._serials = serials
+        return self._state
+
+    cdef RasterImage lookup(self, object key):
+        """Returns the cached bitmap for ``key``, or ``None``, counting a
+        hit or a miss."""
+        cdef RasterImage image = self._entries.get(key)
+        if image is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return image
+
+    cdef void store(self, object key, RasterImage image):
+        self._entries[key] = image
+        self._resident_bytes += _raster_image_cache_nbytes(image)
+        self.evict()
+
+    cdef void evict(self):
+        cdef RasterImage image
+        while self._resident_bytes > self._max_bytes and self._entries:
+            _, image = self._entries.popitem(last=False)
+            self._resident_bytes -= _raster_image_cache_nbytes(image)
+            self._evictions += 1
+
+
+cdef class GlyphBitmapCache:
+    """A cache of :attr:`RasterFormat.A8` glyph bitmaps, rendered with
+    :class:`RasterDraw` at quantized subpixel offsets, for drawing text with
+    subpixel positioning without rasterizing every glyph again.
+
+    Bitmaps are keyed by font, glyph ID, size and subpixel phase, and by
+    the font settings that affect outlines, so fonts may be modified
+    between calls. A glyph rendered at phase ``p`` has its origin shifted
+    right by ``p / subpixel_positions`` pixels. Bitmaps are evicted in
+    least-recently-used order when their total size exceeds
+    ``max_bytes``.
+
+    :param max_bytes: The memory budget for cached bitmaps, in bytes.
+    :param subpixel_positions: The number of horizontal subpixel phases.
+    """
+
+    cdef _BitmapCacheEntries _cache
+    cdef int _subpixel_positions
+    cdef RasterDraw _draw
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024,
+                 subpixel_positions: int = 4):
+        if subpixel_positions < 1:
+            raise ValueError("subpixel_positions must be at least 1")
+        self._cache = _BitmapCacheEntries(max_bytes)
+        self._subpixel_positions = subpixel_positions
+        self._draw = RasterDraw()
+
+    def __len__(self) -> int:
+        return len(self._cache._entries)
+
+    @property
+    def max_bytes(self) -> int:
+        """The memory budget for cached bitmaps, in bytes. Lowering it
+        evicts bitmaps immediately.
+
+        :type: int
+        """
+        return self._cache._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        self._cache.set_max_bytes(value)
+
+    @property
+    def subpixel_positions(self) -> int:
+        """The number of horizontal subpixel phases.
+
+        :type: int
+        """
+        return self._subpixel_positions
+
+    @property
+    def stats(self) -> GlyphBitmapCacheStats:
+        """The statistics of the cache.
+
+        :type: GlyphBitmapCacheStats
+        """
+        return self._cache.stats()
+
+    def clear(self):
+        """Drops all cached bitmaps. Statistics are kept."""
+        self._cache.clear()
+
+    cdef RasterImage _get(self, Font font, tuple state, hb_codepoint_t gid,
+                          object size, int phase):
+        cdef _RasterJob job
+        cdef hb_raster_image_t* img
+        cdef RasterImage image
+        key = (font, state, gid, size, phase)
+        image = self._cache.lookup(key)
+        if image is not None:
+            return image
+        job.gid = gid
+        job.dx = <float>phase / self._subpixel_positions
+        job.dy = 0
+        _raster_job_scale(font, size, &job)
+        img = _raster_glyph(self._draw._hb_raster_draw, NULL, font._hb_font, &job)
+        if img is NULL:
+            raise MemoryError()
+        image = RasterImage.from_ptr(img)
+        self._cache.store(key, image)
+        return image
+
+    def get(self, font: Font, gid: int, size: float | None = None,
+            phase: int = 0) -> RasterImage:
+        """Returns the bitmap of a glyph, rendering it first if it is not
+        cached. The bitmap is shared with the cache and must not be
+        modified.
+
+        The :attr:`~RasterImage.extents` of the bitmap give the position of
+        its bottom-left corner relative to the glyph origin, in pixels.
+
+        :param font: The :class:`Font` to render the glyph with.
+        :param gid: The glyph ID.
+        :param size: The size to render the glyph at, in pixels per em, or
+            ``None`` to render one pixel per unit of the font scale.
+        :param phase: The subpixel phase, from ``0`` to
+            :attr:`subpixel_positions` ``- 1``.
+
+        :returns: The :class:`RasterImage` of the glyph.
+
+        :raises ValueError: If ``phase`` is out of range.
+        """
+        if not 0 <= phase < self._subpixel_positions:
+            raise ValueError(
+                f"phase must be between 0 and {self._subpixel_positions - 1}")
+        return self._get(font, self._cache.font_state(font), gid, size, phase)
+
+    def render_buffer(self, font: Font, buffer: Buffer,
+                      size: float | None = None) -> RasterImage:
+        """Renders a shaped buffer into a single :attr:`RasterFormat.A8`
+        :class:`RasterImage`, composited from cached glyph bitmaps.
+
+        Each glyph is placed according to the glyph positions of the
+        buffer, starting at the origin. Horizontal glyph positions are
+        rounded to the nearest subpixel phase, and vertical positions to
+        the nearest pixel. The image is sized to fit the whole run, and
+        its :attr:`~RasterImage.extents` give the position of its
+        bottom-left corner relative to the origin, in pixels.
+
+        :param font: The :class:`Font` the buffer was shaped with.
+        :param buffer: A shaped :class:`Buffer`.
+        :param size: The size to render the glyphs at, in pixels per em, or
+            ``None`` to render one pixel per unit of the font scale.
+
+        :returns: The rendered :class:`RasterImage`, empty if the run has
+            no ink.
+
+        :raises ValueError: If ``buffer`` has not been shaped.
+        """
+        cdef unsigned int length, i
+        cdef hb_glyph_info_t* infos
+        cdef hb_glyph_position_t* positions
+        cdef _PlacedBitmap* placed
+        cdef _RasterJob scale
+        cdef double x = 0
+        cdef double y = 0
+        cdef double px
+        cdef int phase
+        cdef tuple state = self._cache.font_state(font)
+        cdef int n = self._subpixel_positions
+        _get_shaped_glyphs(buffer, &length, &infos, &positions)
+        _raster_job_scale(font, size, &scale)
+        placed = <_PlacedBitmap*>malloc(max(length, 1) * sizeof(_PlacedBitmap))
+        if placed is NULL:
+            raise MemoryError()
+        # Keeps the bitmaps alive if they are evicted while rendering
+        bitmaps = []
+        try:
+            for i in range(length):
+                px = (x + positions[i].x_offset) * scale.x_scale
+                placed[i].x = <int>floor(px)
+                phase = <int>floor((px - placed[i].x) * n + 0.5)
+                if phase == n:
+                    placed[i].x += 1
+                    phase = 0
+                placed[i].y = <int>floor(
+                    (y + positions[i].y_offset) * scale.y_scale + 0.5)
+                x += positions[i].x_advance
+                y += positions[i].y_advance
+                bitmaps.append(
+                    self._get(font, state, infos[i].codepoint, size, phase))
+            return _composite_run(bitmaps, placed, HB_RASTER_FORMAT_A8)
+        finally:
+            free(placed)
+
+
+cdef class ColorGlyphBitmapCache:
+    """A cache of :attr:`RasterFormat.BGRA32` color glyph bitmaps, rendered
+    with :class:`RasterPaint`, for drawing color glyphs such as emoji
+    without evaluating their paint graph again.
+
+    Bitmaps are keyed by font, glyph ID and the font settings that affect
+    outlines, and by the :attr:`~RasterPaint.transform`,
+    :attr:`~RasterPaint.scale_factor`, :attr:`~RasterPaint.foreground`,
+    :attr:`~RasterPaint.palette` and custom palette colors of the paint
+    context they are requested with, so any of them may be changed between
+    calls. Bitmaps are rendered with a transparent background, on a paint
+    context of the cache configured with these settings, so the paint
+    context passed in is never drawn to. They are evicted in
+    least-recently-used order when their total size exceeds
+    ``max_bytes``.
+
+    :param max_bytes: The memory budget for cached bitmaps, in bytes.
+    """
+
+    cdef _BitmapCacheEntries _cache
+    cdef RasterPaint _paint
+    cdef tuple _configured
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self._cache = _BitmapCacheEntries(max_bytes)
+        self._paint = RasterPaint()
+
+    def __len__(self) -> int:
+        return len(self._cache._entries)
+
+    @property
+    def max_bytes(self) -> int:
+        """The memory budget for cached bitmaps, in bytes. Lowering it
+        evicts bitmaps immediately.
+
+        :type: int
+        """
+        return self._cache._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        self._cache.set_max_bytes(value)
+
+    @property
+    def stats(self) -> GlyphBitmapCacheStats:
+        """The statistics of the cache.
+
+        :type: GlyphBitmapCacheStats
+        """
+        return self._cache.stats()
+
+    def clear(self):
+        """Drops all cached bitmaps. Statistics are kept."""
+        self._cache.clear()
+
+    cdef tuple _paint_state(self, RasterPaint paint):
+        cdef float xx, yx, xy, yy, dx, dy, sx, sy
+        hb_raster_paint_get_transform(paint._hb_raster_paint,
+                                      &xx, &yx, &xy, &yy, &dx, &dy)
+        hb_raster_paint_get_scale_factor(paint._hb_raster_paint, &sx, &sy)
+        return (
+            (xx, yx, xy, yy, dx, dy),
+            (sx, sy),
+            hb_raster_paint_get_foreground(paint._hb_raster_paint),
+            hb_raster_paint_get_palette(paint._hb_raster_paint),
+            tuple(sorted(paint._custom_palette_colors.items())),
+        )
+
+    cdef void _configure(self, tuple paint_state):
+        """Applies the settings of a paint state to the paint context of
+        the cache."""
+        cdef hb_raster_paint_t* paint = self._paint._hb_raster_paint
+        if paint_state == self._configured:
+            return
+        transform, scale_factor, foreground, palette, colors = paint_state
+        xx, yx, xy, yy, dx, dy = transform
+        sx, sy = scale_factor
+        hb_raster_paint_set_transform(paint, xx, yx, xy, yy, dx, dy)
+        hb_raster_paint_set_scale_factor(paint, sx, sy)
+        hb_raster_paint_set_foreground(paint, foreground)
+        hb_raster_paint_set_background(paint, 0)
+        hb_raster_paint_set_palette(paint, palette)
+        hb_raster_paint_clear_custom_palette_colors(paint)
+        for color_index, color in colors:
+            hb_raster_paint_set_custom_palette_color(paint, color_index, color)
+        self._configured = paint_state
+
+    cdef RasterImage _get(self, Font font, tuple state, tuple paint_state,
+                          hb_codepoint_t gid):
+        cdef hb_glyph_extents_t glyph_extents
+        cdef hb_raster_extents_t c_extents
+        cdef hb_raster_image_t* img = NULL
+        cdef hb_raster_paint_t* paint = self._paint._hb_raster_paint
+        cdef hb_font_t* private_font
+        cdef RasterImage image
+        key = (font, state, paint_state, gid)
+        image = self._cache.lookup(key)
+        if image is not None:
+            return image
+        self._configure(paint_state)
+        if (hb_font_get_glyph_extents(font._hb_font, gid, &glyph_extents)
+                and hb_raster_paint_set_glyph_extents(paint, &glyph_extents)):
+            private_font = _font_acquire_private(font)
+            if private_font is NULL:
+                img = _raster_paint_glyph(paint, font._hb_font, gid)
+            else:
+                with nogil:
+                    img = _raster_paint_glyph(paint, private_font, gid)
+                _font_release_private(font)
+            if img is NULL:
+                raise MemoryError()
+            image = RasterImage.from_ptr(img)
+        else:
+            # Glyphs without ink are cached as empty bitmaps
+            image = RasterImage()
+            c_extents.x_origin = c_extents.y_origin = 0
+            c_extents.width = c_extents.height = c_extents.stride = 0
+            if not hb_raster_image_configure(image._hb_raster_image,
+                                             HB_RASTER_FORMAT_BGRA32, &c_extents):
+                raise MemoryError()
+        self._cache.store(key, image)
+        return image
+
+    def get(self, paint: RasterPaint, font: Font, gid: int) -> RasterImage:
+        """Returns the bitmap of a glyph as painted with the settings of
+        ``paint``, rendering it first if it is not cached. The bitmap is
+        shared with the cache and must not be modified.
+
+        The :attr:`~RasterImage.extents` of the bitmap give the position of
+        its bottom-left corner in pixel space.
+
+        :param paint: The :class:`RasterPaint` whose settings to render the
+            glyph with.
+        :param font: The :class:`Font` to paint the glyph from.
+        :param gid: The glyph ID.
+
+        :returns: The :class:`RasterImage` of the glyph, empty if the glyph
+            has no ink.
+        """
+        return self._get(font, self._cache.font_state(font),
+                         self._paint_state(paint), gid)
+
+    def render_buffer(self, paint: RasterPaint, font: Font,
+                      buffer: Buffer) -> RasterImage:
+        """Renders a shaped buffer into a single
+        :attr:`RasterFormat.BGRA32` :class:`RasterImage`, composited from
+        cached glyph bitmaps.
+
+        Each glyph is placed according to the glyph positions of the
+        buffer, mapped to pixel space with the linear part of the
+        :attr:`~RasterPaint.transform` of ``paint`` and rounded to the
+        nearest pixel. The image is sized to fit the whole run, and its
+        :attr:`~RasterImage.extents` give the position of its bottom-left
+        corner in pixel space.
+
+        :param paint: The :class:`RasterPaint` whose settings to render the
+            glyphs with.
+        :param font: The :class:`Font` the buffer was shaped with.
+        :param buffer: A shaped :class:`Buffer`.
+
+        :returns: The rendered :class:`RasterImage`, empty if the run has
+            no ink.
+
+        :raises ValueError: If ``buffer`` has not been shaped.
+        """
+        cdef unsigned int length, i
+        cdef hb_glyph_info_t* infos
+        cdef hb_glyph_position_t* positions
+        cdef _PlacedBitmap* placed
+        cdef float xx, yx, xy, yy, dx, dy, sx, sy
+        cdef double x = 0
+        cdef double y = 0
+        cdef double gx, gy
+        cdef tuple state = self._cache.font_state(font)
+        cdef tuple paint_state = self._paint_state(paint)
+        _get_shaped_glyphs(buffer, &length, &infos, &positions)
+        hb_raster_paint_get_transform(paint._hb_raster_paint,
+                                      &xx, &yx, &xy, &yy, &dx, &dy)
+        hb_raster_paint_get_scale_factor(paint._hb_raster_paint, &sx, &sy)
+        placed = <_PlacedBitmap*>malloc(max(length, 1) * sizeof(_PlacedBitmap))
+        if placed is NULL:
+            raise MemoryError()
+        # Keeps the bitmaps alive if they are evicted while rendering
+        bitmaps = []
+        try:
+            for i in range(length):
+                gx = x + positions[i].x_offset
+                gy = y + positions[i].y_offset
+                placed[i].x = <int>floor((xx * gx + xy * gy) / sx + 0.5)
+                placed[i].y = <int>floor((yx * gx + yy * gy) / sy + 0.5)
+                x += positions[i].x_advance
+                y += positions[i].y_advance
+                bitmaps.append(
+                    self._get(font, state, paint_state, infos[i].codepoint))
+            return _composite_run(bitmaps, placed, HB_RASTER_FORMAT_BGRA32)
+        finally:
+            free(placed)
@@ -1,16 +1,26 @@
 #cython: language_level=3
 cimport cython
+import array
+import ctypes
+import hashlib
+import itertools
 import os
+import sys
+import threading
 import warnings
+import weakref
 from enum import IntEnum, IntFlag
 from .charfbuzz cimport *
-from libc.stdlib cimport free, malloc, calloc
-from libc.string cimport const_char
-from libc.math cimport isnan, NAN
+from libc.stdlib cimport free, malloc, calloc, realloc
+from libc.string cimport const_char, memcpy, memset, strlen
+from libc.math cimport ceil, cos, fabs, floor, isnan, pow, sin, sqrt, M_PI, NAN
+from libc.stdio cimport snprintf
 from cpython.pycapsule cimport PyCapsule_GetPointer, PyCapsule_IsValid
 from cpython.unicode cimport PyUnicode_GetLength, PyUnicode_AsUCS4Copy
 from cpython.mem cimport PyMem_Free
-from typing import Callable, Dict, List, Sequence, Tuple, Union, NamedTuple
+from cpython.ref cimport Py_INCREF, Py_DECREF
+from typing import BinaryIO, Callable, Dict, Iterable, List, Sequence, Tuple, Union, NamedTuple
+from collections import OrderedDict
 from pathlib import Path
 from functools import wraps
 
@@ -83,16 +93,64 @@ include "_map.pxi"
 include "_blob.pxi"
 include "_buffer.pxi"
 include "_face.pxi"
+include "_collection.pxi"
 include "_draw.pxi"
 include "_paint.pxi"
+include "_paint_svg.pxi"
 include "_font.pxi"
 include "_raster.pxi"
+include "_atlas.pxi"
+include "_glyph_cache.pxi"
 include "_serialize.pxi"
 include "_subset.pxi"
+include "_registry.pxi"
 
 # Generated by setup.py
 include "_generated_docs.pxi"
 
+cdef hb_feature_t* _features_from_dict(object features, unsigned int* size) except? NULL:
+    """Converts a :func:`shape` features mapping to a newly allocated
+    ``hb_feature_t`` array, storing its length in ``size``."""
+    cdef hb_feature_t* hb_features
+    cdef bytes packed
+    cdef hb_feature_t feat
+    size[0] = 0
+    if not features:
+        return NULL
+    for value in features.values():
+        if isinstance(value, int):
+            size[0] += 1
+        else:
+            size[0] += len(value)
+    if size[0] == 0:
+        return NULL
+    hb_features = <hb_feature_t*>malloc(size[0] * sizeof(hb_feature_t))
+    if hb_features is NULL:
+        raise MemoryError()
+    try:
+        i = 0
+        for name, value in features.items():
+            assert i < size[0], "index out of range for feature array capacity"
+            packed = name.encode()
+            if isinstance(value, int):
+                hb_feature_from_string(packed, len(packed), &feat)
+                feat.value = value
+                hb_features[i] = feat
+                i += 1
+            else:
+                feat.tag = hb_tag_from_string(packed, -1)
+                for start, end, value in value:
+                    feat.value = value
+                    feat.start = start
+                    feat.end = end
+                    hb_features[i] = feat
+                    i += 1
+    except:
+        free(hb_features)
+        raise
+    return hb_features
+
+
 def shape(font: Font, buffer: Buffer,
         features: Dict[str,Union[int,bool,Sequence[Tuple[int,int,Union[int,bool]]]]] | None = None,
         shapers: List[str] | None = None):
@@ -128,35 +186,9 @@ def shape(font: Font, buffer: Buffer,
     cdef unsigned int size
     cdef hb_feature_t* hb_features
     cdef bytes packed
-    cdef hb_feature_t feat
     cdef const char* c_shapers[10]
-    size = 0
-    hb_features = NULL
+    hb_features = _features_from_dict(features, &size)
     try:
-        if features:
-            for value in features.values():
-                if isinstance(value, int):
-                    size += 1
-                else:
-                    size += len(value)
-            hb_features = <hb_feature_t*>malloc(size * sizeof(hb_feature_t))
-            i = 0
-            for name, value in features.items():
-                assert i < size, "index out of range for feature array capacity"
-                packed = name.encode()
-                if isinstance(value, int):
-                    hb_feature_from_string(packed, len(packed), &feat)
-                    feat.value = value
-                    hb_features[i] = feat
-                    i += 1
-                else:
-                    feat.tag = hb_tag_from_string(packed, -1)
-                    for start, end, value in value:
-                        feat.value = value
-                        feat.start = start
-                        feat.end = end
-                        hb_features[i] = feat
-                        i += 1
         if shapers:
             for i, shaper in enumerate(shapers[:9]):
                 packed = shaper.encode()
@@ -174,6 +206,211 @@ def shape(font: Font, buffer: Buffer,
             free(hb_features)
 
 
+cdef class _VariationSweep:
+    """Shapes the text of a buffer at different variation locations of a
+    font, without modifying either."""
+
+    cdef hb_font_t* _hb_font
+    cdef Font _instance
+    cdef hb_buffer_t* _source
+    cdef hb_buffer_t* _scratch
+    cdef hb_segment_properties_t _props
+    cdef hb_feature_t* _features
+    cdef unsigned int _num_features
+    cdef int* _coords
+    cdef unsigned int _axis_count
+    cdef Font _font
+    cdef Buffer _buffer
+
+    def __cinit__(self, Font font, Buffer buffer, object features):
+        if hb_buffer_get_content_type(buffer._hb_buffer) == HB_BUFFER_CONTENT_TYPE_GLYPHS:
+            raise ValueError("buffer must contain unshaped text")
+        self._font = font
+        self._buffer = buffer
+        self._instance = _font_create_instance(font)
+        self._hb_font = self._instance._hb_font
+        self._source = buffer._hb_buffer
+        self._scratch = hb_buffer_create_similar(buffer._hb_buffer)
+        hb_buffer_get_segment_properties(self._source, &self._props)
+        self._axis_count = hb_ot_var_get_axis_count(font._face._hb_face)
+        self._coords = <int*>calloc(self._axis_count + 1, sizeof(int))
+        if self._coords is NULL:
+            raise MemoryError()
+        self._features = _features_from_dict(features, &self._num_features)
+
+    def __dealloc__(self):
+        hb_buffer_destroy(self._scratch)
+        free(self._coords)
+        free(self._features)
+
+    cdef hb_position_t advance(self,
+                               const hb_variation_t* variations,
+                               unsigned int size) except? -1:
+        cdef unsigned int length
+        cdef unsigned int i
+        cdef hb_glyph_position_t* positions
+        cdef hb_position_t advance = 0
+        hb_ot_var_normalize_variations(
+            self._font._face._hb_face, variations, size,
+            self._coords, self._axis_count)
+        hb_font_set_var_coords_normalized(
+            self._hb_font, self._coords, self._axis_count)
+        hb_buffer_clear_contents(self._scratch)
+        hb_buffer_append(
+            self._scratch, self._source, 0, hb_buffer_get_length(self._source))
+        hb_buffer_set_segment_properties(self._scratch, &self._props)
+        hb_buffer_guess_segment_properties(self._scratch)
+        hb_shape(self._hb_font, self._scratch, self._features, self._num_features)
+        if not hb_buffer_allocation_successful(self._scratch):
+            raise MemoryError()
+        positions = hb_buffer_get_glyph_positions(self._scratch, &length)
+        if hb_buffer_get_direction(self._scratch) in (HB_DIRECTION_LTR, HB_DIRECTION_RTL):
+            for i in range(length):
+                advance += positions[i].x_advance
+        else:
+            for i in range(length):
+                advance += positions[i].y_advance
+        return advance
+
+
+cdef unsigned int _variations_from_dict(
+        object variations, hb_variation_t* hb_variations) except? 0:
+    cdef bytes packed
+    cdef unsigned int i = 0
+    for name, value in variations.items():
+        packed = name.encode()
+        hb_variations[i].tag = hb_tag_from_string(packed, -1)
+        hb_variations[i].value = value
+        i += 1
+    return i
+
+
+def measure_variations(font: Font, buffer: Buffer,
+                       locations: Union[Sequence[Dict[str, float]],
+                                        Dict[str, Sequence[float]]],
+                       features: Dict[str,Union[int,bool,Sequence[Tuple[int,int,Union[int,bool]]]]] | None = None
+                       ) -> List[int]:
+    """Shapes the text in ``buffer`` at each of the given variation
+    locations and returns the total advance of each shaped run, in font
+    units. Neither ``font`` nor ``buffer`` is modified.
+
+    ``locations`` is either a sequence of mappings of axis-tag string to
+    value, as accepted by :meth:`Font.set_variations`, or a mapping of
+    axis-tag string to a sequence of values, describing a grid of
+    locations. Grid locations are visited in :func:`itertools.product`
+    order, with the last axis varying fastest.
+
+    :param font: A :class:`Font` to use for shaping.
+    :param buffer: A :class:`Buffer` with the unshaped text.
+    :param locations: The variation locations to measure.
+    :param features: Features to apply, as accepted by :func:`shape`.
+
+    :returns: The advance width (or height, for vertical text) at each
+        location.
+
+    :raises ValueError: If ``buffer`` has already been shaped.
+    """
+    cdef _VariationSweep sweep = _VariationSweep(font, buffer, features)
+    cdef hb_variation_t* hb_variations
+    cdef unsigned int size
+    cdef list advances = []
+    if isinstance(locations, dict):
+        axes = list(locations)
+        locations = [dict(zip(axes, values))
+                     for values in itertools.product(*locations.values())]
+    else:
+        locations = list(locations)
+    size = max([len(location) for location in locations], default=0)
+    hb_variations = <hb_variation_t*>malloc((size + 1) * sizeof(hb_variation_t))
+    if hb_variations is NULL:
+        raise MemoryError()
+    try:
+        for location in locations:
+            size = _variations_from_dict(location, hb_variations)
+            advances.append(sweep.advance(hb_variations, size))
+    finally:
+        free(hb_variations)
+    return advances
+
+
+def fit_variation(font: Font, buffer: Buffer, axis: str, target: float,
+                  variations: Dict[str, float] | None = None,
+                  features: Dict[str,Union[int,bool,Sequence[Tuple[int,int,Union[int,bool]]]]] | None = None,
+                  min_value: float | None = None,
+                  max_value: float | None = None,
+                  tolerance: float = 0.01) -> float | None:
+    """Finds the value of ``axis`` at which the text in ``buffer`` is as
+    wide as possible without its advance exceeding ``target``, by bisection.
+    The advance is assumed to change monotonically along the axis. Neither
+    ``font`` nor ``buffer`` is modified.
+
+    :param font: A :class:`Font` to use for shaping.
+    :param buffer: A :class:`Buffer` with the unshaped text.
+    :param axis: The tag of the axis to solve for.
+    :param target: The maximum advance width (or height, for vertical
+        text), in font units.
+    :param variations: Values for the other axes, as accepted by
+        :meth:`Font.set_variations`.
+    :param features: Features to apply, as accepted by :func:`shape`.
+    :param min_value: The lower bound of the search. Defaults to the axis
+        minimum.
+    :param max_value: The upper bound of the search. Defaults to the axis
+        maximum.
+    :param tolerance: The search stops once the bounds are closer than
+        this, in axis units.
+
+    :returns: The axis value, or ``None`` if the text does not fit at any
+        value in the search range.
+
+    :raises ValueError: If ``axis`` is not an axis of the font, or
+        ``buffer`` has already been shaped.
+    """
+    cdef _VariationSweep sweep = _VariationSweep(font, buffer, features)
+    cdef bytes packed = axis.encode()
+    cdef hb_ot_var_axis_info_t axis_info
+    cdef unsigned int size = len(variations) if variations else 0
+    cdef hb_variation_t* hb_variations
+    cdef hb_variation_t* axis_variation
+    if not hb_ot_var_find_axis_info(
+            font._face._hb_face, hb_tag_from_string(packed, -1), &axis_info):
+        raise ValueError(f"font has no '{axis}' axis")
+    low = axis_info.min_value if min_value is None else min_value
+    high = axis_info.max_value if max_value is None else max_value
+    hb_variations = <hb_variation_t*>malloc((size + 1) * sizeof(hb_variation_t))
+    if hb_variations is NULL:
+        raise MemoryError()
+    try:
+        if size:
+            _variations_from_dict(variations, hb_variations)
+        # The solved axis comes last, so it overrides any value in variations
+        axis_variation = &hb_variations[size]
+        axis_variation.tag = axis_info.tag
+        axis_variation.value = low
+        low_advance = sweep.advance(hb_variations, size + 1)
+        axis_variation.value = high
+        high_advance = sweep.advance(hb_variations, size + 1)
+        # Bisect towards the end of the range with the larger advance
+        if high_advance < low_advance:
+            low, high = high, low
+            low_advance, high_advance = high_advance, low_advance
+        if low_advance > target:
+            return None
+        if high_advance <= target:
+            return high
+        for _ in range(64):
+            if abs(high - low) <= tolerance:
+                break
+            mid = (low + high) / 2
+            axis_variation.value = mid
+            if sweep.advance(hb_variations, size + 1) <= target:
+                low = mid
+            else:
+                high = mid
+        return low
+    finally:
+        free(hb_variations)
+
+
 def ot_tag_to_script(tag: str) -> str:
     """Converts a script tag to a script.
 
@@ -29,6 +29,22 @@ cdef class Map:
     def __dealloc__(self):
         hb_map_destroy(self._hb_map)
 
+    def __reduce__(self):
+        keys = array.array("I")
+        values = array.array("I")
+        for k, v in self.items():
+            keys.append(k)
+            values.append(v)
+        return Map, (), (keys, values)
+
+    def __setstate__(self, state):
+        keys, values = state
+        hb_map_clear(self._hb_map)
+        for k, v in zip(keys, values):
+            hb_map_set(self._hb_map, k, v)
+        if not hb_map_allocation_successful(self._hb_map):
+            raise MemoryError()
+
     @staticmethod
     cdef Map from_ptr(hb_map_t* hb_map):
         """Create Map from a pointer, taking ownership of it."""
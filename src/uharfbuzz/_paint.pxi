@@ -848,3 +848,665 @@ cdef class PaintFuncs:
         self._custom_palette_color_func = func
         hb_paint_funcs_set_custom_palette_color_func(
             self._hb_paintfuncs, _paint_custom_palette_color_func, <void*>self, NULL)
+
+
+cdef enum:
+    _PAINT_PUSH_TRANSFORM
+    _PAINT_POP_TRANSFORM
+    _PAINT_FILL_GLYPH
+    _PAINT_PUSH_CLIP_GLYPH
+    _PAINT_PUSH_CLIP_RECTANGLE
+    _PAINT_POP_CLIP
+    _PAINT_COLOR
+    _PAINT_IMAGE
+    _PAINT_LINEAR_GRADIENT
+    _PAINT_RADIAL_GRADIENT
+    _PAINT_SWEEP_GRADIENT
+    _PAINT_PUSH_GROUP
+    _PAINT_POP_GROUP
+
+
+class PaintOp(IntEnum):
+    """The operations of a :class:`GlyphPaint`. Each one corresponds to
+    the :class:`PaintFuncs` callback of the same name.
+
+    .. attribute:: PUSH_TRANSFORM
+
+       Takes ``(xx, yx, xy, yy, dx, dy)``.
+
+    .. attribute:: POP_TRANSFORM
+
+       Takes no arguments.
+
+    .. attribute:: FILL_GLYPH
+
+       Takes ``(gid, color, is_foreground)``.
+
+    .. attribute:: PUSH_CLIP_GLYPH
+
+       Takes ``(gid,)``.
+
+    .. attribute:: PUSH_CLIP_RECTANGLE
+
+       Takes ``(xmin, ymin, xmax, ymax)``.
+
+    .. attribute:: POP_CLIP
+
+       Takes no arguments.
+
+    .. attribute:: COLOR
+
+       Takes ``(color, is_foreground)``.
+
+    .. attribute:: IMAGE
+
+       Takes ``(image, width, height, format, slant, extents)``, where
+       ``extents`` may be ``None``.
+
+    .. attribute:: LINEAR_GRADIENT
+
+       Takes ``(color_stops, extend, x0, y0, x1, y1, x2, y2)``.
+
+    .. attribute:: RADIAL_GRADIENT
+
+       Takes ``(color_stops, extend, x0, y0, r0, x1, y1, r1)``.
+
+    .. attribute:: SWEEP_GRADIENT
+
+       Takes ``(color_stops, extend, x0, y0, start_angle, end_angle)``.
+
+    .. attribute:: PUSH_GROUP
+
+       Takes no arguments.
+
+    .. attribute:: POP_GROUP
+
+       Takes ``(mode,)``.
+    """
+    PUSH_TRANSFORM = _PAINT_PUSH_TRANSFORM
+    POP_TRANSFORM = _PAINT_POP_TRANSFORM
+    FILL_GLYPH = _PAINT_FILL_GLYPH
+    PUSH_CLIP_GLYPH = _PAINT_PUSH_CLIP_GLYPH
+    PUSH_CLIP_RECTANGLE = _PAINT_PUSH_CLIP_RECTANGLE
+    POP_CLIP = _PAINT_POP_CLIP
+    COLOR = _PAINT_COLOR
+    IMAGE = _PAINT_IMAGE
+    LINEAR_GRADIENT = _PAINT_LINEAR_GRADIENT
+    RADIAL_GRADIENT = _PAINT_RADIAL_GRADIENT
+    SWEEP_GRADIENT = _PAINT_SWEEP_GRADIENT
+    PUSH_GROUP = _PAINT_PUSH_GROUP
+    POP_GROUP = _PAINT_POP_GROUP
+
+
+class PaintOperation(NamedTuple):
+    """An operation of a :class:`GlyphPaint`."""
+    op: PaintOp
+    """The operation."""
+    args: tuple
+    """The arguments of the operation, as described in :class:`PaintOp`."""
+
+
+cdef struct _PaintRecording:
+    uint8_t* ops
+    size_t op_count
+    size_t op_capacity
+    float* params
+    size_t param_count
+    size_t param_capacity
+    uint32_t* int_params
+    size_t int_param_count
+    size_t int_param_capacity
+    hb_color_stop_t* stops
+    size_t stop_count
+    size_t stop_capacity
+    hb_blob_t** images
+    size_t image_count
+    size_t image_capacity
+    bint failed
+
+
+cdef void _paint_recording_free(_PaintRecording* rec) noexcept nogil:
+    cdef size_t i
+    for i in range(rec.image_count):
+        hb_blob_destroy_nogil(rec.images[i])
+    free(rec.ops)
+    free(rec.params)
+    free(rec.int_params)
+    free(rec.stops)
+    free(rec.images)
+
+
+cdef bint _paint_reserve(_PaintRecording* rec, void** array, size_t* capacity,
+                         size_t needed, size_t item_size) noexcept nogil:
+    cdef size_t new_capacity
+    cdef void* p
+    if rec.failed:
+        return False
+    if needed <= capacity[0]:
+        return True
+    new_capacity = max(2 * capacity[0], needed, 16)
+    p = realloc(array[0], new_capacity * item_size)
+    if p is NULL:
+        rec.failed = True
+        return False
+    array[0] = p
+    capacity[0] = new_capacity
+    return True
+
+
+cdef void _paint_add(_PaintRecording* rec, uint8_t op,
+                     const float* params, size_t param_count,
+                     const uint32_t* int_params,
+                     size_t int_param_count) noexcept nogil:
+    if not (_paint_reserve(rec, <void**>&rec.ops, &rec.op_capacity,
+                           rec.op_count + 1, sizeof(uint8_t))
+            and _paint_reserve(rec, <void**>&rec.params, &rec.param_capacity,
+                               rec.param_count + param_count, sizeof(float))
+            and _paint_reserve(rec, <void**>&rec.int_params,
+                               &rec.int_param_capacity,
+                               rec.int_param_count + int_param_count,
+                               sizeof(uint32_t))):
+        return
+    rec.ops[rec.op_count] = op
+    rec.op_count += 1
+    if param_count:
+        memcpy(&rec.params[rec.param_count], params,
+               param_count * sizeof(float))
+        rec.param_count += param_count
+    if int_param_count:
+        memcpy(&rec.int_params[rec.int_param_count], int_params,
+               int_param_count * sizeof(uint32_t))
+        rec.int_param_count += int_param_count
+
+
+cdef void _paint_add_gradient(_PaintRecording* rec, uint8_t op,
+                              hb_color_line_t* color_line,
+                              const float* params,
+                              size_t param_count) noexcept nogil:
+    cdef unsigned int count = hb_color_line_get_color_stops_nogil(
+        color_line, 0, NULL, NULL)
+    cdef uint32_t int_params[3]
+    if not _paint_reserve(rec, <void**>&rec.stops, &rec.stop_capacity,
+                          rec.stop_count + count, sizeof(hb_color_stop_t)):
+        return
+    hb_color_line_get_color_stops_nogil(
+        color_line, 0, &count, &rec.stops[rec.stop_count])
+    int_params[0] = hb_color_line_get_extend_nogil(color_line)
+    int_params[1] = rec.stop_count
+    int_params[2] = count
+    rec.stop_count += count
+    _paint_add(rec, op, params, param_count, int_params, 3)
+
+
+cdef void _record_push_transform_func(hb_paint_funcs_t *funcs,
+                                      void *paint_data,
+                                      float xx, float yx,
+                                      float xy, float yy,
+                                      float dx, float dy,
+                                      void *user_data) noexcept nogil:
+    cdef float params[6]
+    params[0] = xx
+    params[1] = yx
+    params[2] = xy
+    params[3] = yy
+    params[4] = dx
+    params[5] = dy
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_PUSH_TRANSFORM,
+               params, 6, NULL, 0)
+
+cdef void _record_pop_transform_func(hb_paint_funcs_t *funcs,
+                                     void *paint_data,
+                                     void *user_data) noexcept nogil:
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_POP_TRANSFORM,
+               NULL, 0, NULL, 0)
+
+cdef void _record_fill_glyph_func(hb_paint_funcs_t *funcs,
+                                  void *paint_data,
+                                  hb_codepoint_t glyph,
+                                  hb_font_t *font,
+                                  hb_bool_t is_foreground,
+                                  hb_color_t color,
+                                  void *user_data) noexcept nogil:
+    cdef uint32_t int_params[3]
+    int_params[0] = glyph
+    int_params[1] = color
+    int_params[2] = is_foreground != 0
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_FILL_GLYPH,
+               NULL, 0, int_params, 3)
+
+cdef void _record_push_clip_glyph_func(hb_paint_funcs_t *funcs,
+                                       void *paint_data,
+                                       hb_codepoint_t glyph,
+                                       hb_font_t *font,
+                                       void *user_data) noexcept nogil:
+    cdef uint32_t int_params[1]
+    int_params[0] = glyph
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_PUSH_CLIP_GLYPH,
+               NULL, 0, int_params, 1)
+
+cdef void _record_push_clip_rectangle_func(hb_paint_funcs_t *funcs,
+                                           void *paint_data,
+                                           float xmin, float ymin,
+                                           float xmax, float ymax,
+                                           void *user_data) noexcept nogil:
+    cdef float params[4]
+    params[0] = xmin
+    params[1] = ymin
+    params[2] = xmax
+    params[3] = ymax
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_PUSH_CLIP_RECTANGLE,
+               params, 4, NULL, 0)
+
+cdef void _record_pop_clip_func(hb_paint_funcs_t *funcs,
+                                void *paint_data,
+                                void *user_data) noexcept nogil:
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_POP_CLIP,
+               NULL, 0, NULL, 0)
+
+cdef void _record_color_func(hb_paint_funcs_t *funcs,
+                             void *paint_data,
+                             hb_bool_t is_foreground,
+                             hb_color_t color,
+                             void *user_data) noexcept nogil:
+    cdef uint32_t int_params[2]
+    int_params[0] = color
+    int_params[1] = is_foreground != 0
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_COLOR,
+               NULL, 0, int_params, 2)
+
+cdef hb_bool_t _record_image_func(hb_paint_funcs_t *funcs,
+                                  void *paint_data,
+                                  hb_blob_t *image,
+                                  unsigned int width,
+                                  unsigned int height,
+                                  hb_tag_t format,
+                                  float slant,
+                                  hb_glyph_extents_t *extents,
+                                  void *user_data) noexcept nogil:
+    cdef _PaintRecording* rec = <_PaintRecording*>paint_data
+    cdef uint32_t int_params[9]
+    if not _paint_reserve(rec, <void**>&rec.images, &rec.image_capacity,
+                          rec.image_count + 1, sizeof(hb_blob_t*)):
+        return 0
+    rec.images[rec.image_count] = hb_blob_reference_nogil(image)
+    int_params[0] = rec.image_count
+    rec.image_count += 1
+    int_params[1] = width
+    int_params[2] = height
+    int_params[3] = format
+    int_params[4] = extents is not NULL
+    if extents is not NULL:
+        int_params[5] = <uint32_t>extents.x_bearing
+        int_params[6] = <uint32_t>extents.y_bearing
+        int_params[7] = <uint32_t>extents.width
+        int_params[8] = <uint32_t>extents.height
+    else:
+        memset(&int_params[5], 0, 4 * sizeof(uint32_t))
+    _paint_add(rec, _PAINT_IMAGE, &slant, 1, int_params, 9)
+    return 1
+
+cdef void _record_linear_gradient_func(hb_paint_funcs_t *funcs,
+                                       void *paint_data,
+                                       hb_color_line_t *color_line,
+                                       float x0, float y0,
+                                       float x1, float y1,
+                                       float x2, float y2,
+                                       void *user_data) noexcept nogil:
+    cdef float params[6]
+    params[0] = x0
+    params[1] = y0
+    params[2] = x1
+    params[3] = y1
+    params[4] = x2
+    params[5] = y2
+    _paint_add_gradient(<_PaintRecording*>paint_data, _PAINT_LINEAR_GRADIENT,
+                        color_line, params, 6)
+
+cdef void _record_radial_gradient_func(hb_paint_funcs_t *funcs,
+                                       void *paint_data,
+                                       hb_color_line_t *color_line,
+                                       float x0, float y0, float r0,
+                                       float x1, float y1, float r1,
+                                       void *user_data) noexcept nogil:
+    cdef float params[6]
+    params[0] = x0
+    params[1] = y0
+    params[2] = r0
+    params[3] = x1
+    params[4] = y1
+    params[5] = r1
+    _paint_add_gradient(<_PaintRecording*>paint_data, _PAINT_RADIAL_GRADIENT,
+                        color_line, params, 6)
+
+cdef void _record_sweep_gradient_func(hb_paint_funcs_t *funcs,
+                                      void *paint_data,
+                                      hb_color_line_t *color_line,
+                                      float x0, float y0,
+                                      float start_angle, float end_angle,
+                                      void *user_data) noexcept nogil:
+    cdef float params[4]
+    params[0] = x0
+    params[1] = y0
+    params[2] = start_angle
+    params[3] = end_angle
+    _paint_add_gradient(<_PaintRecording*>paint_data, _PAINT_SWEEP_GRADIENT,
+                        color_line, params, 4)
+
+cdef void _record_push_group_func(hb_paint_funcs_t *funcs,
+                                  void *paint_data,
+                                  void *user_data) noexcept nogil:
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_PUSH_GROUP,
+               NULL, 0, NULL, 0)
+
+cdef void _record_pop_group_func(hb_paint_funcs_t *funcs,
+                                 void *paint_data,
+                                 hb_paint_composite_mode_t mode,
+                                 void *user_data) noexcept nogil:
+    cdef uint32_t int_params[1]
+    int_params[0] = mode
+    _paint_add(<_PaintRecording*>paint_data, _PAINT_POP_GROUP,
+               NULL, 0, int_params, 1)
+
+
+cdef hb_paint_funcs_t* _recording_paintfuncs = NULL
+
+cdef hb_paint_funcs_t* _get_recording_paintfuncs() noexcept:
+    # The color-glyph callback is left unset, so that nested color glyphs
+    # are painted inline, and so is the custom-palette-color callback, so
+    # that colors come from the font palette.
+    global _recording_paintfuncs
+    if _recording_paintfuncs is NULL:
+        _recording_paintfuncs = hb_paint_funcs_create()
+        hb_paint_funcs_set_push_transform_func(
+            _recording_paintfuncs, _record_push_transform_func, NULL, NULL)
+        hb_paint_funcs_set_pop_transform_func(
+            _recording_paintfuncs, _record_pop_transform_func, NULL, NULL)
+        hb_paint_funcs_set_fill_glyph_func(
+            _recording_paintfuncs, _record_fill_glyph_func, NULL, NULL)
+        hb_paint_funcs_set_push_clip_glyph_func(
+            _recording_paintfuncs, _record_push_clip_glyph_func, NULL, NULL)
+        hb_paint_funcs_set_push_clip_rectangle_func(
+            _recording_paintfuncs, _record_push_clip_rectangle_func, NULL, NULL)
+        hb_paint_funcs_set_pop_clip_func(
+            _recording_paintfuncs, _record_pop_clip_func, NULL, NULL)
+        hb_paint_funcs_set_color_func(
+            _recording_paintfuncs, _record_color_func, NULL, NULL)
+        hb_paint_funcs_set_image_func(
+            _recording_paintfuncs, _record_image_func, NULL, NULL)
+        hb_paint_funcs_set_linear_gradient_func(
+            _recording_paintfuncs, _record_linear_gradient_func, NULL, NULL)
+        hb_paint_funcs_set_radial_gradient_func(
+            _recording_paintfuncs, _record_radial_gradient_func, NULL, NULL)
+        hb_paint_funcs_set_sweep_gradient_func(
+            _recording_paintfuncs, _record_sweep_gradient_func, NULL, NULL)
+        hb_paint_funcs_set_push_group_func(
+            _recording_paintfuncs, _record_push_group_func, NULL, NULL)
+        hb_paint_funcs_set_pop_group_func(
+            _recording_paintfuncs, _record_pop_group_func, NULL, NULL)
+        hb_paint_funcs_make_immutable(_recording_paintfuncs)
+    return _recording_paintfuncs
+
+
+cdef struct _RecordedColorLine:
+    const hb_color_stop_t* stops
+    unsigned int count
+    hb_paint_extend_t extend
+
+
+cdef unsigned int _recorded_color_line_get_color_stops(
+        hb_color_line_t *color_line,
+        void *color_line_data,
+        unsigned int start,
+        unsigned int *count,
+        hb_color_stop_t *color_stops,
+        void *user_data) noexcept:
+    cdef _RecordedColorLine* line = <_RecordedColorLine*>color_line_data
+    if count is not NULL and color_stops is not NULL:
+        count[0] = min(count[0], line.count - start) if start < line.count else 0
+        memcpy(color_stops, &line.stops[start],
+               count[0] * sizeof(hb_color_stop_t))
+    return line.count
+
+
+cdef hb_paint_extend_t _recorded_color_line_get_extend(
+        hb_color_line_t *color_line,
+        void *color_line_data,
+        void *user_data) noexcept:
+    return (<_RecordedColorLine*>color_line_data).extend
+
+
+cdef class GlyphPaint:
+    """A recorded glyph paint, stored as a display list of :class:`PaintOp`
+    values with their arguments packed into arrays.
+
+    The arrays are exposed through the buffer protocol, as
+    :class:`memoryview` objects, without copying; iterating over the paint
+    decodes them into :class:`PaintOperation` tuples. The recording can be
+    replayed into any :class:`PaintFuncs`, with the same callback sequence
+    as :meth:`Font.paint_glyph`, except that nested color glyphs are
+    painted inline and colors are resolved against the font palette when
+    recording.
+
+    Paints are created by :meth:`Font.get_glyph_paint`, and are immutable.
+    """
+
+    cdef _PaintRecording _rec
+    cdef object _font
+
+    def __cinit__(self):
+        memset(&self._rec, 0, sizeof(_PaintRecording))
+
+    def __dealloc__(self):
+        _paint_recording_free(&self._rec)
+
+    @staticmethod
+    cdef GlyphPaint from_recording(object font, _PaintRecording* rec):
+        """Create GlyphPaint from a recording, taking ownership of its
+        arrays and images."""
+        cdef GlyphPaint paint = GlyphPaint.__new__(GlyphPaint)
+        paint._rec = rec[0]
+        paint._font = font
+        if rec.failed:
+            raise MemoryError()
+        return paint
+
+    cdef size_t _nbytes(self):
+        return (sizeof(GlyphPaint) + self._rec.op_capacity * sizeof(uint8_t)
+                + self._rec.param_capacity * sizeof(float)
+                + self._rec.int_param_capacity * sizeof(uint32_t)
+                + self._rec.stop_capacity * sizeof(hb_color_stop_t)
+                + self._rec.image_capacity * sizeof(hb_blob_t*))
+
+    def __len__(self) -> int:
+        return self._rec.op_count
+
+    @property
+    def font(self) -> Font:
+        """The font the paint was recorded from.
+
+        :type: Font
+        """
+        return self._font
+
+    @property
+    def ops(self) -> memoryview:
+        """The operations, as a read-only ``uint8`` :class:`memoryview` of
+        :class:`PaintOp` values.
+
+        :type: memoryview
+        """
+        return _memoryview_from_ptr(
+            self, self._rec.ops, self._rec.op_count * sizeof(uint8_t))
+
+    @property
+    def params(self) -> memoryview:
+        """The coordinates, sizes and angles of all operations, in order, as
+        a read-only ``float32`` :class:`memoryview`.
+
+        :type: memoryview
+        """
+        return _memoryview_from_ptr(
+            self, self._rec.params,
+            self._rec.param_count * sizeof(float)).cast("f")
+
+    @property
+    def int_params(self) -> memoryview:
+        """The glyph IDs, colors, flags and modes of all operations, in
+        order, as a read-only ``uint32`` :class:`memoryview`.
+
+        :type: memoryview
+        """
+        return _memoryview_from_ptr(
+            self, self._rec.int_params,
+            self._rec.int_param_count * sizeof(uint32_t)).cast("I")
+
+    cdef list _color_stops(self, const uint32_t* n):
+        cdef const hb_color_stop_t* stops = &self._rec.stops[n[1]]
+        cdef unsigned int i
+        return [ColorStop(stops[i].offset, <bint>stops[i].is_foreground,
+                          Color.from_int(stops[i].color))
+                for i in range(n[2])]
+
+    def __iter__(self):
+        cdef const float* p = self._rec.params
+        cdef const uint32_t* n = self._rec.int_params
+        cdef size_t i
+        cdef uint8_t op
+        for i in range(self._rec.op_count):
+            op = self._rec.ops[i]
+            if op == _PAINT_PUSH_TRANSFORM:
+                args = (p[0], p[1], p[2], p[3], p[4], p[5])
+                p += 6
+            elif op == _PAINT_FILL_GLYPH:
+                args = (n[0], Color.from_int(n[1]), <bint>n[2])
+                n += 3
+            elif op == _PAINT_PUSH_CLIP_GLYPH:
+                args = (n[0],)
+                n += 1
+            elif op == _PAINT_PUSH_CLIP_RECTANGLE:
+                args = (p[0], p[1], p[2], p[3])
+                p += 4
+            elif op == _PAINT_COLOR:
+                args = (Color.from_int(n[0]), <bint>n[1])
+                n += 2
+            elif op == _PAINT_IMAGE:
+                extents = None
+                if n[4]:
+                    extents = GlyphExtents(<int32_t>n[5], <int32_t>n[6],
+                                           <int32_t>n[7], <int32_t>n[8])
+                args = (Blob.from_ptr(hb_blob_reference(self._rec.images[n[0]])),
+                        n[1], n[2], hb_tag_to_string(n[3], NULL), p[0],
+                        extents)
+                p += 1
+                n += 9
+            elif op == _PAINT_LINEAR_GRADIENT or op == _PAINT_RADIAL_GRADIENT:
+                args = (self._color_stops(n), PaintExtend(n[0]),
+                        p[0], p[1], p[2], p[3], p[4], p[5])
+                p += 6
+                n += 3
+            elif op == _PAINT_SWEEP_GRADIENT:
+                args = (self._color_stops(n), PaintExtend(n[0]),
+                        p[0], p[1], p[2], p[3])
+                p += 4
+                n += 3
+            elif op == _PAINT_POP_GROUP:
+                args = (PaintCompositeMode(n[0]),)
+                n += 1
+            else:
+                args = ()
+            yield PaintOperation(PaintOp(op), args)
+
+    def replay(self, paint_funcs: PaintFuncs, paint_state: object = None):
+        """Replays the recorded operations into a :class:`PaintFuncs`, as
+        :meth:`Font.paint_glyph` would paint the glyph.
+
+        :param paint_funcs: The :class:`PaintFuncs` to paint with.
+        :param paint_state: User data to pass to the paint callbacks.
+        """
+        cdef hb_paint_funcs_t* funcs = paint_funcs._hb_paintfuncs
+        cdef void* data = <void*>paint_state
+        cdef hb_font_t* font = (<Font>self._font)._hb_font
+        cdef const float* p = self._rec.params
+        cdef const uint32_t* n = self._rec.int_params
+        cdef hb_glyph_extents_t extents
+        cdef hb_glyph_extents_t* extents_p
+        cdef _RecordedColorLine line
+        cdef hb_color_line_t color_line
+        cdef size_t i
+        cdef uint8_t op
+        memset(&color_line, 0, sizeof(color_line))
+        color_line.data = &line
+        color_line.get_color_stops = _recorded_color_line_get_color_stops
+        color_line.get_extend = _recorded_color_line_get_extend
+        for i in range(self._rec.op_count):
+            op = self._rec.ops[i]
+            if op == _PAINT_PUSH_TRANSFORM:
+                hb_paint_push_transform(funcs, data,
+                                        p[0], p[1], p[2], p[3], p[4], p[5])
+                p += 6
+            elif op == _PAINT_POP_TRANSFORM:
+                hb_paint_pop_transform(funcs, data)
+            elif op == _PAINT_FILL_GLYPH:
+                hb_paint_fill_glyph(funcs, data, n[0], font, n[2], n[1])
+                n += 3
+            elif op == _PAINT_PUSH_CLIP_GLYPH:
+                hb_paint_push_clip_glyph(funcs, data, n[0], font)
+                n += 1
+            elif op == _PAINT_PUSH_CLIP_RECTANGLE:
+                hb_paint_push_clip_rectangle(funcs, data, p[0], p[1], p[2], p[3])
+                p += 4
+            elif op == _PAINT_POP_CLIP:
+                hb_paint_pop_clip(funcs, data)
+            elif op == _PAINT_COLOR:
+                hb_paint_color(funcs, data, n[1], n[0])
+                n += 2
+            elif op == _PAINT_IMAGE:
+                extents.x_bearing = <int32_t>n[5]
+                extents.y_bearing = <int32_t>n[6]
+                extents.width = <int32_t>n[7]
+                extents.height = <int32_t>n[8]
+                extents_p = &extents if n[4] else NULL
+                hb_paint_image(funcs, data, self._rec.images[n[0]], n[1], n[2],
+                               n[3], p[0], extents_p)
+                p += 1
+                n += 9
+            elif op == _PAINT_PUSH_GROUP:
+                hb_paint_push_group(funcs, data)
+            elif op == _PAINT_POP_GROUP:
+                hb_paint_pop_group(funcs, data, <hb_paint_composite_mode_t>n[0])
+                n += 1
+            else:
+                line.stops = &self._rec.stops[n[1]]
+                line.count = n[2]
+                line.extend = <hb_paint_extend_t>n[0]
+                if op == _PAINT_LINEAR_GRADIENT:
+                    hb_paint_linear_gradient(funcs, data, &color_line,
+                                             p[0], p[1], p[2], p[3], p[4], p[5])
+                    p += 6
+                elif op == _PAINT_RADIAL_GRADIENT:
+                    hb_paint_radial_gradient(funcs, data, &color_line,
+                                             p[0], p[1], p[2], p[3], p[4], p[5])
+                    p += 6
+                else:
+                    hb_paint_sweep_gradient(funcs, data, &color_line,
+                                            p[0], p[1], p[2], p[3])
+                    p += 4
+                n += 3
+
+
+cdef GlyphPaint _record_glyph_paint(Font font, hb_codepoint_t gid,
+                                    unsigned int palette_index,
+                                    hb_color_t foreground):
+    cdef _PaintRecording rec
+    cdef hb_paint_funcs_t* funcs = _get_recording_paintfuncs()
+    cdef hb_font_t* private_font = _font_acquire_private(font)
+    memset(&rec, 0, sizeof(_PaintRecording))
+    if private_font is NULL:
+        hb_font_paint_glyph(font._hb_font, gid, funcs, &rec,
+                            palette_index, foreground)
+    else:
+        with nogil:
+            hb_font_paint_glyph_nogil(private_font, gid, funcs, &rec,
+                                      palette_index, foreground)
+        _font_release_private(font)
+    return GlyphPaint.from_recording(font, &rec)
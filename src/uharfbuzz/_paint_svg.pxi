@@ -0,0 +1,583 @@
+cdef struct _SvgPaint:
+    _SvgPath defs
+    _SvgPath body
+    hb_font_t* font
+    hb_draw_funcs_t* drawfuncs
+    hb_codepoint_t* clip_glyphs  # glyphs with a clip path in defs
+    size_t clip_glyph_count
+    size_t clip_glyph_capacity
+    unsigned int clip_count
+    unsigned int gradient_count
+    hb_color_stop_t* stops  # scratch space for normalized color lines
+    size_t stop_capacity
+
+
+cdef struct _SvgSweep:
+    _SvgPath* body
+    float cx
+    float cy
+
+
+# Solid colors and gradients paint everywhere within the current clip.
+cdef const char* _SVG_COVER = (
+    b'<rect x="-32767" y="-32767" width="65534" height="65534"')
+cdef const char* _SVG_BASE64 = (
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")
+
+
+cdef void _svg_append(_SvgPath* out, const char* s, size_t length) noexcept nogil:
+    if not _svg_reserve(out, length):
+        return
+    memcpy(&out.data[out.length], s, length)
+    out.length += length
+
+
+cdef inline void _svg_append_str(_SvgPath* out, const char* s) noexcept nogil:
+    _svg_append(out, s, strlen(s))
+
+
+cdef void _svg_append_uint(_SvgPath* out, unsigned int value) noexcept nogil:
+    cdef char number[16]
+    cdef int length = snprintf(number, sizeof(number), "%u", value)
+    _svg_append(out, number, length)
+
+
+cdef void _svg_append_value(_SvgPath* out, double value, int precision,
+                            bint separator) noexcept nogil:
+    cdef int saved = out.precision
+    out.precision = precision
+    _svg_append_number(out, value, separator)
+    out.precision = saved
+
+
+cdef void _svg_append_attribute(_SvgPath* out, const char* name,
+                                double value) noexcept nogil:
+    _svg_append_str(out, b" ")
+    _svg_append_str(out, name)
+    _svg_append_str(out, b'="')
+    _svg_append_number(out, value, False)
+    _svg_append_str(out, b'"')
+
+
+cdef void _svg_append_color(_SvgPath* out, const char* name,
+                            const char* opacity_name,
+                            hb_color_t color) noexcept nogil:
+    cdef char rgb[8]
+    snprintf(rgb, sizeof(rgb), "#%02x%02x%02x", (color >> 8) & 0xFF,
+             (color >> 16) & 0xFF, (color >> 24) & 0xFF)
+    _svg_append_str(out, b" ")
+    _svg_append_str(out, name)
+    _svg_append_str(out, b'="')
+    _svg_append(out, rgb, 7)
+    _svg_append_str(out, b'"')
+    if color & 0xFF != 0xFF:
+        _svg_append_str(out, b" ")
+        _svg_append_str(out, opacity_name)
+        _svg_append_str(out, b'="')
+        _svg_append_value(out, (color & 0xFF) / 255., 4, False)
+        _svg_append_str(out, b'"')
+
+
+cdef void _svg_append_base64(_SvgPath* out, const uint8_t* data,
+                             size_t length) noexcept nogil:
+    cdef size_t i
+    cdef uint32_t triple
+    cdef char* p
+    if not _svg_reserve(out, (length + 2) // 3 * 4):
+        return
+    p = &out.data[out.length]
+    for i in range(0, length, 3):
+        triple = <uint32_t>data[i] << 16
+        if i + 1 < length:
+            triple |= <uint32_t>data[i + 1] << 8
+        if i + 2 < length:
+            triple |= data[i + 2]
+        p[0] = _SVG_BASE64[(triple >> 18) & 0x3F]
+        p[1] = _SVG_BASE64[(triple >> 12) & 0x3F]
+        p[2] = _SVG_BASE64[(triple >> 6) & 0x3F] if i + 1 < length else b'='
+        p[3] = _SVG_BASE64[triple & 0x3F] if i + 2 < length else b'='
+        p += 4
+    out.length += (length + 2) // 3 * 4
+
+
+cdef const char* _svg_spread_method(uint32_t extend) noexcept nogil:
+    if extend == HB_PAINT_EXTEND_REPEAT:
+        return b"repeat"
+    if extend == HB_PAINT_EXTEND_REFLECT:
+        return b"reflect"
+    return b"pad"
+
+
+cdef const char* _svg_blend_mode(uint32_t mode) noexcept nogil:
+    # Porter-Duff operators have no SVG equivalent, and are drawn as
+    # SRC_OVER, except for the two with a close blend mode.
+    if mode == HB_PAINT_COMPOSITE_MODE_PLUS:
+        return b"screen"
+    if mode == HB_PAINT_COMPOSITE_MODE_XOR:
+        return b"difference"
+    if mode == HB_PAINT_COMPOSITE_MODE_SCREEN:
+        return b"screen"
+    if mode == HB_PAINT_COMPOSITE_MODE_OVERLAY:
+        return b"overlay"
+    if mode == HB_PAINT_COMPOSITE_MODE_DARKEN:
+        return b"darken"
+    if mode == HB_PAINT_COMPOSITE_MODE_LIGHTEN:
+        return b"lighten"
+    if mode == HB_PAINT_COMPOSITE_MODE_COLOR_DODGE:
+        return b"color-dodge"
+    if mode == HB_PAINT_COMPOSITE_MODE_COLOR_BURN:
+        return b"color-burn"
+    if mode == HB_PAINT_COMPOSITE_MODE_HARD_LIGHT:
+        return b"hard-light"
+    if mode == HB_PAINT_COMPOSITE_MODE_SOFT_LIGHT:
+        return b"soft-light"
+    if mode == HB_PAINT_COMPOSITE_MODE_DIFFERENCE:
+        return b"difference"
+    if mode == HB_PAINT_COMPOSITE_MODE_EXCLUSION:
+        return b"exclusion"
+    if mode == HB_PAINT_COMPOSITE_MODE_MULTIPLY:
+        return b"multiply"
+    if mode == HB_PAINT_COMPOSITE_MODE_HSL_HUE:
+        return b"hue"
+    if mode == HB_PAINT_COMPOSITE_MODE_HSL_SATURATION:
+        return b"saturation"
+    if mode == HB_PAINT_COMPOSITE_MODE_HSL_COLOR:
+        return b"color"
+    if mode == HB_PAINT_COMPOSITE_MODE_HSL_LUMINOSITY:
+        return b"luminosity"
+    return NULL
+
+
+cdef size_t _paint_op_int_param_count(uint8_t op) noexcept nogil:
+    if op == _PAINT_FILL_GLYPH:
+        return 3
+    if op == _PAINT_PUSH_CLIP_GLYPH or op == _PAINT_POP_GROUP:
+        return 1
+    if op == _PAINT_COLOR:
+        return 2
+    if op == _PAINT_IMAGE:
+        return 9
+    if (op == _PAINT_LINEAR_GRADIENT or op == _PAINT_RADIAL_GRADIENT
+            or op == _PAINT_SWEEP_GRADIENT):
+        return 3
+    return 0
+
+
+cdef void _svg_paint_clip_glyph(_SvgPaint* svg, hb_codepoint_t gid) noexcept nogil:
+    # Clip paths apply in the coordinate system of the element referencing
+    # them, so one clip path per glyph serves all transforms.
+    cdef size_t i
+    cdef void* p
+    for i in range(svg.clip_glyph_count):
+        if svg.clip_glyphs[i] == gid:
+            break
+    else:
+        if svg.clip_glyph_count == svg.clip_glyph_capacity:
+            svg.clip_glyph_capacity = max(2 * svg.clip_glyph_capacity, 16)
+            p = realloc(svg.clip_glyphs,
+                        svg.clip_glyph_capacity * sizeof(hb_codepoint_t))
+            if p is NULL:
+                svg.defs.failed = True
+                return
+            svg.clip_glyphs = <hb_codepoint_t*>p
+        svg.clip_glyphs[svg.clip_glyph_count] = gid
+        svg.clip_glyph_count += 1
+        _svg_append_str(&svg.defs, b'<clipPath id="g')
+        _svg_append_uint(&svg.defs, gid)
+        _svg_append_str(&svg.defs, b'"><path d="')
+        hb_font_draw_glyph_nogil(svg.font, gid, svg.drawfuncs, &svg.defs)
+        _svg_append_str(&svg.defs, b'"/></clipPath>\n')
+    _svg_append_str(&svg.body, b'<g clip-path="url(#g')
+    _svg_append_uint(&svg.body, gid)
+    _svg_append_str(&svg.body, b')">\n')
+
+
+cdef void _svg_paint_clip_rectangle(_SvgPaint* svg, const float* p) noexcept nogil:
+    _svg_append_str(&svg.defs, b'<clipPath id="c')
+    _svg_append_uint(&svg.defs, svg.clip_count)
+    _svg_append_str(&svg.defs, b'"><rect')
+    _svg_append_attribute(&svg.defs, b"x", p[0])
+    _svg_append_attribute(&svg.defs, b"y", p[1])
+    _svg_append_attribute(&svg.defs, b"width", p[2] - p[0])
+    _svg_append_attribute(&svg.defs, b"height", p[3] - p[1])
+    _svg_append_str(&svg.defs, b"/></clipPath>\n")
+    _svg_append_str(&svg.body, b'<g clip-path="url(#c')
+    _svg_append_uint(&svg.body, svg.clip_count)
+    _svg_append_str(&svg.body, b')">\n')
+    svg.clip_count += 1
+
+
+cdef void _svg_paint_image(_SvgPaint* svg, const _PaintRecording* rec,
+                           const uint32_t* n, float slant) noexcept nogil:
+    # Only PNG images can be embedded; images without extents cannot be
+    # placed.
+    cdef unsigned int length
+    cdef const char* data
+    if n[3] != 0x706E6720 or not n[4] or not n[1] or not n[2]:  # 'png '
+        return
+    data = hb_blob_get_data_nogil(rec.images[n[0]], &length)
+    if data is NULL or not length:
+        return
+    _svg_append_str(&svg.body, b'<g transform="translate(')
+    _svg_append_number(&svg.body, <int32_t>n[5], False)
+    _svg_append_number(&svg.body, <int32_t>n[6], True)
+    _svg_append_str(&svg.body, b") scale(")
+    _svg_append_value(&svg.body, <double><int32_t>n[7] / n[1], 6, False)
+    _svg_append_value(&svg.body, <double><int32_t>n[8] / n[2], 6, True)
+    _svg_append_str(&svg.body, b')">\n<image href="data:image/png;base64,')
+    _svg_append_base64(&svg.body, <const uint8_t*>data, length)
+    _svg_append_str(&svg.body, b'"')
+    _svg_append_attribute(&svg.body, b"width", n[1])
+    _svg_append_attribute(&svg.body, b"height", n[2])
+    _svg_append_str(&svg.body, b"/>\n</g>\n")
+
+
+cdef unsigned int _svg_color_stops(_SvgPaint* svg, const _PaintRecording* rec,
+                                   const uint32_t* n, float* mn,
+                                   float* mx) noexcept nogil:
+    """Copies the color stops of a gradient to the scratch space, sorted
+    and rescaled to [0, 1], as SVG requires."""
+    cdef unsigned int count = n[2]
+    cdef void* p
+    if count > svg.stop_capacity:
+        p = realloc(svg.stops, count * sizeof(hb_color_stop_t))
+        if p is NULL:
+            svg.defs.failed = True
+            return 0
+        svg.stops = <hb_color_stop_t*>p
+        svg.stop_capacity = count
+    memcpy(svg.stops, &rec.stops[n[1]], count * sizeof(hb_color_stop_t))
+    hb_paint_normalize_color_line(svg.stops, count, mn, mx)
+    return count
+
+
+cdef void _svg_paint_gradient_stops(_SvgPaint* svg, unsigned int count,
+                                    uint32_t extend) noexcept nogil:
+    cdef unsigned int i
+    _svg_append_str(&svg.defs, b' spreadMethod="')
+    _svg_append_str(&svg.defs, _svg_spread_method(extend))
+    _svg_append_str(&svg.defs, b'">\n')
+    for i in range(count):
+        _svg_append_str(&svg.defs, b'<stop offset="')
+        _svg_append_value(&svg.defs, svg.stops[i].offset, 4, False)
+        _svg_append_str(&svg.defs, b'"')
+        _svg_append_color(&svg.defs, b"stop-color", b"stop-opacity",
+                          svg.stops[i].color)
+        _svg_append_str(&svg.defs, b"/>\n")
+
+
+cdef void _svg_paint_gradient_fill(_SvgPaint* svg) noexcept nogil:
+    _svg_append_str(&svg.body, _SVG_COVER)
+    _svg_append_str(&svg.body, b' fill="url(#gr')
+    _svg_append_uint(&svg.body, svg.gradient_count)
+    _svg_append_str(&svg.body, b')"/>\n')
+    svg.gradient_count += 1
+
+
+cdef void _svg_paint_linear_gradient(_SvgPaint* svg, const _PaintRecording* rec,
+                                     const uint32_t* n,
+                                     const float* p) noexcept nogil:
+    cdef float mn, mx, x0, y0, x1, y1
+    cdef unsigned int count = _svg_color_stops(svg, rec, n, &mn, &mx)
+    if not count:
+        return
+    # SVG gradients are defined by their axis, which is perpendicular to
+    # the rotation line of COLR gradients.
+    hb_paint_reduce_linear_anchors(p[0], p[1], p[2], p[3], p[4], p[5],
+                                   &x0, &y0, &x1, &y1)
+    _svg_append_str(&svg.defs, b'<linearGradient id="gr')
+    _svg_append_uint(&svg.defs, svg.gradient_count)
+    _svg_append_str(&svg.defs, b'" gradientUnits="userSpaceOnUse"')
+    _svg_append_attribute(&svg.defs, b"x1", x0 + mn * (x1 - x0))
+    _svg_append_attribute(&svg.defs, b"y1", y0 + mn * (y1 - y0))
+    _svg_append_attribute(&svg.defs, b"x2", x0 + mx * (x1 - x0))
+    _svg_append_attribute(&svg.defs, b"y2", y0 + mx * (y1 - y0))
+    _svg_paint_gradient_stops(svg, count, n[0])
+    _svg_append_str(&svg.defs, b"</linearGradient>\n")
+    _svg_paint_gradient_fill(svg)
+
+
+cdef void _svg_paint_radial_gradient(_SvgPaint* svg, const _PaintRecording* rec,
+                                     const uint32_t* n,
+                                     const float* p) noexcept nogil:
+    cdef float mn, mx, r0
+    cdef unsigned int count = _svg_color_stops(svg, rec, n, &mn, &mx)
+    if not count:
+        return
+    _svg_append_str(&svg.defs, b'<radialGradient id="gr')
+    _svg_append_uint(&svg.defs, svg.gradient_count)
+    _svg_append_str(&svg.defs, b'" gradientUnits="userSpaceOnUse"')
+    _svg_append_attribute(&svg.defs, b"cx", p[0] + mx * (p[3] - p[0]))
+    _svg_append_attribute(&svg.defs, b"cy", p[1] + mx * (p[4] - p[1]))
+    _svg_append_attribute(&svg.defs, b"r", p[2] + mx * (p[5] - p[2]))
+    _svg_append_attribute(&svg.defs, b"fx", p[0] + mn * (p[3] - p[0]))
+    _svg_append_attribute(&svg.defs, b"fy", p[1] + mn * (p[4] - p[1]))
+    r0 = p[2] + mn * (p[5] - p[2])
+    if r0 > 0:
+        _svg_append_attribute(&svg.defs, b"fr", r0)
+    _svg_paint_gradient_stops(svg, count, n[0])
+    _svg_append_str(&svg.defs, b"</radialGradient>\n")
+    _svg_paint_gradient_fill(svg)
+
+
+cdef hb_color_t _svg_lerp_color(hb_color_t c0, hb_color_t c1, double t) noexcept nogil:
+    cdef hb_color_t color = 0
+    cdef unsigned int shift
+    cdef double a, b
+    for shift in range(0, 32, 8):
+        a = (c0 >> shift) & 0xFF
+        b = (c1 >> shift) & 0xFF
+        color |= <hb_color_t>floor(a + (b - a) * t + 0.5) << shift
+    return color
+
+
+cdef void _svg_sweep_tile(float a0, hb_color_t c0, float a1, hb_color_t c1,
+                          void* user_data) noexcept nogil:
+    # Sweep gradients have no SVG equivalent, so each tile is drawn as
+    # wedges of solid color, around the center and far enough to cover
+    # the current clip.
+    cdef _SvgSweep* sweep = <_SvgSweep*>user_data
+    cdef _SvgPath* body = sweep.body
+    cdef int count = max(<int>ceil(fabs(a1 - a0) / (M_PI / 32)), 1)
+    cdef int i
+    cdef double start, end
+    for i in range(count):
+        start = a0 + (a1 - a0) * i / count
+        end = a0 + (a1 - a0) * (i + 1) / count
+        _svg_append_str(body, b'<path d="M')
+        _svg_append_number(body, sweep.cx, False)
+        _svg_append_number(body, sweep.cy, True)
+        _svg_append_str(body, b"L")
+        _svg_append_number(body, sweep.cx + 32767 * cos(start), False)
+        _svg_append_number(body, sweep.cy + 32767 * sin(start), True)
+        _svg_append_str(body, b"A32767 32767 0 0 1" if end > start
+                        else b"A32767 32767 0 0 0")
+        _svg_append_number(body, sweep.cx + 32767 * cos(end), True)
+        _svg_append_number(body, sweep.cy + 32767 * sin(end), True)
+        _svg_append_str(body, b'Z"')
+        _svg_append_color(body, b"fill", b"fill-opacity",
+                          _svg_lerp_color(c0, c1, (i + 0.5) / count))
+        _svg_append_str(body, b"/>\n")
+
+
+cdef void _svg_paint_sweep_gradient(_SvgPaint* svg, const _PaintRecording* rec,
+                                    const uint32_t* n,
+                                    const float* p) noexcept nogil:
+    cdef float mn, mx
+    cdef _SvgSweep sweep
+    cdef unsigned int count = _svg_color_stops(svg, rec, n, &mn, &mx)
+    if not count:
+        return
+    sweep.body = &svg.body
+    sweep.cx = p[0]
+    sweep.cy = p[1]
+    hb_paint_sweep_gradient_tiles(svg.stops, count, <hb_paint_extend_t>n[0],
+                                  p[2] + mn * (p[3] - p[2]),
+                                  p[2] + mx * (p[3] - p[2]),
+                                  _svg_sweep_tile, &sweep)
+
+
+cdef void _svg_paint_body(_SvgPaint* svg, const _PaintRecording* rec,
+                          const uint32_t* group_modes) noexcept nogil:
+    cdef const float* p = rec.params
+    cdef const uint32_t* n = rec.int_params
+    cdef const char* blend_mode
+    cdef size_t i
+    cdef uint8_t op
+    for i in range(rec.op_count):
+        op = rec.ops[i]
+        if op == _PAINT_PUSH_TRANSFORM:
+            if (p[0] == 1 and p[1] == 0 and p[2] == 0 and p[3] == 1
+                    and p[4] == 0 and p[5] == 0):
+                _svg_append_str(&svg.body, b"<g>\n")
+                p += 6
+                continue
+            _svg_append_str(&svg.body, b'<g transform="matrix(')
+            _svg_append_value(&svg.body, p[0], 6, False)
+            _svg_append_value(&svg.body, p[1], 6, True)
+            _svg_append_value(&svg.body, p[2], 6, True)
+            _svg_append_value(&svg.body, p[3], 6, True)
+            _svg_append_number(&svg.body, p[4], True)
+            _svg_append_number(&svg.body, p[5], True)
+            _svg_append_str(&svg.body, b')">\n')
+            p += 6
+        elif (op == _PAINT_POP_TRANSFORM or op == _PAINT_POP_CLIP
+              or op == _PAINT_POP_GROUP):
+            _svg_append_str(&svg.body, b"</g>\n")
+        elif op == _PAINT_FILL_GLYPH:
+            _svg_append_str(&svg.body, b'<path d="')
+            hb_font_draw_glyph_nogil(svg.font, n[0], svg.drawfuncs, &svg.body)
+            _svg_append_str(&svg.body, b'"')
+            _svg_append_color(&svg.body, b"fill", b"fill-opacity", n[1])
+            _svg_append_str(&svg.body, b"/>\n")
+        elif op == _PAINT_PUSH_CLIP_GLYPH:
+            _svg_paint_clip_glyph(svg, n[0])
+        elif op == _PAINT_PUSH_CLIP_RECTANGLE:
+            _svg_paint_clip_rectangle(svg, p)
+            p += 4
+        elif op == _PAINT_COLOR:
+            _svg_append_str(&svg.body, _SVG_COVER)
+            _svg_append_color(&svg.body, b"fill", b"fill-opacity", n[0])
+            _svg_append_str(&svg.body, b"/>\n")
+        elif op == _PAINT_IMAGE:
+            _svg_paint_image(svg, rec, n, p[0])
+            p += 1
+        elif op == _PAINT_LINEAR_GRADIENT:
+            _svg_paint_linear_gradient(svg, rec, n, p)
+            p += 6
+        elif op == _PAINT_RADIAL_GRADIENT:
+            _svg_paint_radial_gradient(svg, rec, n, p)
+            p += 6
+        elif op == _PAINT_SWEEP_GRADIENT:
+            _svg_paint_sweep_gradient(svg, rec, n, p)
+            p += 4
+        elif op == _PAINT_PUSH_GROUP:
+            blend_mode = _svg_blend_mode(group_modes[i])
+            if blend_mode is NULL:
+                _svg_append_str(&svg.body, b'<g style="isolation:isolate">\n')
+            else:
+                _svg_append_str(&svg.body, b'<g style="mix-blend-mode:')
+                _svg_append_str(&svg.body, blend_mode)
+                _svg_append_str(&svg.body, b'">\n')
+        n += _paint_op_int_param_count(op)
+
+
+cdef uint32_t* _paint_group_modes(const _PaintRecording* rec) noexcept nogil:
+    """Returns the composite mode of each push-group operation, from the
+    matching pop-group operation, indexed by operation."""
+    cdef uint32_t* modes = <uint32_t*>calloc(max(rec.op_count, 1), sizeof(uint32_t))
+    cdef size_t* stack = <size_t*>malloc(max(rec.op_count, 1) * sizeof(size_t))
+    cdef size_t depth = 0
+    cdef const uint32_t* n = rec.int_params
+    cdef size_t i
+    cdef uint8_t op
+    if modes is NULL or stack is NULL:
+        free(modes)
+        free(stack)
+        return NULL
+    for i in range(rec.op_count):
+        op = rec.ops[i]
+        if op == _PAINT_PUSH_GROUP:
+            stack[depth] = i
+            depth += 1
+        elif op == _PAINT_POP_GROUP and depth:
+            depth -= 1
+            modes[stack[depth]] = n[0]
+        n += _paint_op_int_param_count(op)
+    free(stack)
+    return modes
+
+
+cdef void _paint_svg_write(_SvgPath* out, hb_font_t* font,
+                           hb_draw_funcs_t* drawfuncs,
+                           const _PaintRecording* rec,
+                           hb_codepoint_t gid) noexcept nogil:
+    """Writes a recorded glyph paint to ``out`` as an SVG document, sized
+    to the extents of the glyph."""
+    cdef _SvgPaint svg
+    cdef hb_glyph_extents_t extents
+    cdef uint32_t* group_modes = _paint_group_modes(rec)
+    if group_modes is NULL:
+        out.failed = True
+        return
+    memset(&svg, 0, sizeof(_SvgPaint))
+    svg.font = font
+    svg.drawfuncs = drawfuncs
+    svg.defs.precision = svg.body.precision = out.precision
+    svg.defs.scale = svg.body.scale = out.scale
+    _svg_paint_body(&svg, rec, group_modes)
+
+    _svg_append_str(out, b'<svg xmlns="http://www.w3.org/2000/svg"')
+    if (hb_font_get_glyph_extents_nogil(font, gid, &extents)
+            and extents.width and extents.height):
+        _svg_append_str(out, b' viewBox="')
+        _svg_append_number(out, extents.x_bearing, False)
+        _svg_append_number(out, -extents.y_bearing, True)
+        _svg_append_number(out, extents.width, True)
+        _svg_append_number(out, -extents.height, True)
+        _svg_append_str(out, b'"')
+        _svg_append_attribute(out, b"width", extents.width)
+        _svg_append_attribute(out, b"height", -extents.height)
+    _svg_append_str(out, b">\n")
+    if svg.defs.length:
+        _svg_append_str(out, b"<defs>\n")
+        _svg_append(out, svg.defs.data, svg.defs.length)
+        _svg_append_str(out, b"</defs>\n")
+    _svg_append_str(out, b'<g transform="scale(1,-1)">\n')
+    _svg_append(out, svg.body.data, svg.body.length)
+    _svg_append_str(out, b"</g>\n</svg>\n")
+    if svg.defs.failed or svg.body.failed:
+        out.failed = True
+
+    free(group_modes)
+    free(svg.defs.data)
+    free(svg.body.data)
+    free(svg.clip_glyphs)
+    free(svg.stops)
+
+
+cdef void _paint_svg_glyphs(hb_font_t* font, const hb_codepoint_t* gids,
+                            Py_ssize_t count, unsigned int palette_index,
+                            hb_color_t foreground,
+                            hb_paint_funcs_t* paintfuncs,
+                            hb_draw_funcs_t* drawfuncs,
+                            _SvgPath* outs) noexcept nogil:
+    """Writes the SVG document of each glyph of ``gids`` to ``outs``,
+    recording the paint with ``paintfuncs`` and drawing clip glyphs with
+    the SVG draw funcs ``drawfuncs``."""
+    cdef _PaintRecording rec
+    cdef Py_ssize_t j
+    for j in range(count):
+        memset(&rec, 0, sizeof(_PaintRecording))
+        hb_font_paint_glyph_nogil(font, gids[j], paintfuncs, &rec,
+                                  palette_index, foreground)
+        if rec.failed:
+            outs[j].failed = True
+        else:
+            _paint_svg_write(&outs[j], font, drawfuncs, &rec, gids[j])
+        _paint_recording_free(&rec)
+
+
+cdef list _paint_glyphs_to_svg(Font font, glyphs,
+                               unsigned int palette_index,
+                               hb_color_t foreground, int precision):
+    cdef hb_paint_funcs_t* paintfuncs = _get_recording_paintfuncs()
+    cdef hb_draw_funcs_t* drawfuncs = _get_svg_drawfuncs()
+    cdef hb_codepoint_t* gids
+    cdef _SvgPath* outs
+    cdef hb_font_t* private_font
+    cdef Py_ssize_t count, i = 0, j
+    glyphs = list(glyphs)
+    count = len(glyphs)
+    gids = <hb_codepoint_t*>malloc(max(count, 1) * sizeof(hb_codepoint_t))
+    outs = <_SvgPath*>malloc(max(count, 1) * sizeof(_SvgPath))
+    if gids is NULL or outs is NULL:
+        free(gids)
+        free(outs)
+        raise MemoryError()
+    for j in range(count):
+        _svg_path_init(&outs[j], precision, False)
+    try:
+        for j in range(count):
+            gids[j] = glyphs[j]
+        private_font = _font_acquire_private(font)
+        if private_font is NULL:
+            _paint_svg_glyphs(font._hb_font, gids, count, palette_index,
+                              foreground, paintfuncs, drawfuncs, outs)
+        else:
+            with nogil:
+                _paint_svg_glyphs(private_font, gids, count, palette_index,
+                                  foreground, paintfuncs, drawfuncs, outs)
+            _font_release_private(font)
+        documents = []
+        while i < count:
+            documents.append(_svg_path_finish(&outs[i]))
+            i += 1
+        return documents
+    finally:
+        # Frees the documents left if converting one of them failed
+        while i < count:
+            free(outs[i].data)
+            i += 1
+        free(gids)
+        free(outs)
@@ -34,6 +34,40 @@ class RasterExtents(NamedTuple):
     """Bytes per row; 0 means auto-calculate on input, filled on output."""
 
 
+cdef int _png_support = -1
+
+
+cdef bint _has_png_support() noexcept:
+    """Returns whether HarfBuzz was built with PNG support, by encoding a
+    single pixel once."""
+    global _png_support
+    cdef hb_raster_image_t* img
+    cdef hb_raster_extents_t c_extents
+    cdef hb_blob_t* blob = NULL
+    if _png_support < 0:
+        img = hb_raster_image_create_or_fail()
+        if img is NULL:
+            return False
+        c_extents.x_origin = c_extents.y_origin = 0
+        c_extents.width = c_extents.height = 1
+        c_extents.stride = 0
+        if hb_raster_image_configure(img, HB_RASTER_FORMAT_BGRA32, &c_extents):
+            blob = hb_raster_image_serialize_to_png_or_fail(img)
+        hb_raster_image_destroy(img)
+        _png_support = blob is not NULL
+        hb_blob_destroy(blob)
+    return _png_support
+
+
+class _RasterImageExport:
+    # Anchors zero-copy exports of a RasterImage's pixels; the image only
+    # holds a weak reference, so it can tell whether any export is alive.
+    __slots__ = ("image", "__weakref__")
+
+    def __init__(self, image):
+        self.image = image
+
+
 cdef class RasterImage:
     """An opaque raster image object holding a pixel buffer produced by
     :meth:`RasterDraw.render`. Use :attr:`buffer` and :attr:`extents` to
@@ -44,9 +78,11 @@ cdef class RasterImage:
     """
 
     cdef hb_raster_image_t* _hb_raster_image
+    cdef object _export_ref
 
     def __cinit__(self):
         self._hb_raster_image = NULL
+        self._export_ref = None
 
     def __init__(self):
         self._hb_raster_image = hb_raster_image_create_or_fail()
@@ -63,6 +99,32 @@ cdef class RasterImage:
         wrapper._hb_raster_image = hb_img
         return wrapper
 
+    cdef object _export(self):
+        keeper = None
+        if self._export_ref is not None:
+            keeper = self._export_ref()
+        if keeper is None:
+            keeper = _RasterImageExport(self)
+            self._export_ref = weakref.ref(keeper)
+        return keeper
+
+    cdef bint _is_exported(self):
+        return self._export_ref is not None and self._export_ref() is not None
+
+    cdef hb_raster_image_t* _detach(self) except NULL:
+        """Releases ownership of the pixel storage to the caller, leaving
+        this image empty."""
+        cdef hb_raster_image_t* hb_img
+        cdef hb_raster_image_t* empty
+        if self._is_exported():
+            raise ValueError("image pixels are still exported by a view")
+        empty = hb_raster_image_create_or_fail()
+        if empty is NULL:
+            raise MemoryError()
+        hb_img = self._hb_raster_image
+        self._hb_raster_image = empty
+        return hb_img
+
     def configure(self, format: RasterFormat,
                   extents: RasterExtents | None = None) -> bool:
         """Configures this image's format and extents together, resizing
@@ -75,11 +137,16 @@ cdef class RasterImage:
         :returns: ``True`` if configuration succeeds, ``False`` on
             allocation failure.
 
+        :raises ValueError: If the pixels are exported by :attr:`data` or
+            :meth:`view`, which the new storage would invalidate.
+
         Wraps `hb_raster_image_configure()
         <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-image-configure>`_.
         """
         cdef hb_raster_extents_t c_extents
         cdef hb_raster_extents_t* c_extents_ptr = NULL
+        if self._is_exported():
+            raise ValueError("image pixels are still exported by a view")
         if extents is not None:
             c_extents.x_origin = extents.x_origin
             c_extents.y_origin = extents.y_origin
@@ -147,6 +214,321 @@ cdef class RasterImage:
         cdef Py_ssize_t size = c_extents.height * c_extents.stride
         return buf[:size]
 
+    @property
+    def data(self) -> memoryview:
+        """The pixel buffer of this image, as a read-only :class:`memoryview`
+        of shape ``(height, stride)``, without copying, or an empty view
+        for empty images. Rows are stored bottom-to-top, as in
+        :attr:`buffer`.
+
+        The view keeps the image alive, but is invalidated by
+        :meth:`configure`, which may reallocate the pixels. While the view
+        exists, the image cannot be recycled. With Pillow, an
+        upright image can be created without copying, for example for
+        :attr:`RasterFormat.A8` images::
+
+            Image.frombuffer("L", (width, height), image.data,
+                             "raw", "L", stride, -1)
+
+        :type: memoryview
+        """
+        cdef hb_raster_extents_t c_extents
+        hb_raster_image_get_extents(self._hb_raster_image, &c_extents)
+        cdef const uint8_t* buf = hb_raster_image_get_buffer(self._hb_raster_image)
+        cdef size_t size = <size_t>c_extents.height * c_extents.stride
+        if buf is NULL or size == 0:
+            return memoryview(b"")
+        view = _memoryview_from_ptr(self._export(), buf, size)
+        return view.cast("B", (c_extents.height, c_extents.stride))
+
+    def to_png(self) -> bytes:
+        """Encodes this :attr:`RasterFormat.BGRA32` image as PNG, with the
+        top row first, as 8-bit RGBA with straight (non-premultiplied)
+        alpha.
+
+        :returns: The PNG data.
+
+        :raises ValueError: If the image is empty or not
+            :attr:`RasterFormat.BGRA32`.
+        :raises HarfBuzzError: If HarfBuzz was built without PNG support.
+
+        Wraps `hb_raster_image_serialize_to_png_or_fail()
+        <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-image-serialize-to-png-or-fail>`_.
+        """
+        cdef hb_raster_extents_t c_extents
+        cdef hb_blob_t* blob
+        hb_raster_image_get_extents(self._hb_raster_image, &c_extents)
+        if (hb_raster_image_get_buffer(self._hb_raster_image) is NULL
+                or not c_extents.width or not c_extents.height):
+            raise ValueError("cannot encode an empty image")
+        if hb_raster_image_get_format(self._hb_raster_image) != HB_RASTER_FORMAT_BGRA32:
+            raise ValueError("only BGRA32 images can be encoded as PNG")
+        with nogil:
+            blob = hb_raster_image_serialize_to_png_or_fail(self._hb_raster_image)
+        if blob is NULL:
+            if not _has_png_support():
+                raise HarfBuzzError("HarfBuzz was built without PNG support")
+            raise MemoryError()
+        return Blob.from_ptr(blob).data
+
+    @staticmethod
+    def from_png(data: Union[bytes, Blob]) -> RasterImage:
+        """Decodes PNG data into a new :attr:`RasterFormat.BGRA32` image with
+        premultiplied alpha.
+
+        :param data: The PNG data, as :class:`bytes` or :class:`Blob`.
+
+        :returns: The decoded :class:`RasterImage`.
+
+        :raises HarfBuzzError: If the data cannot be decoded, or if HarfBuzz
+            was built without PNG support.
+
+        Wraps `hb_raster_image_deserialize_from_png_or_fail()
+        <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-image-deserialize-from-png-or-fail>`_.
+        """
+        cdef Blob blob = data if isinstance(data, Blob) else Blob(data)
+        cdef RasterImage image = RasterImage()
+        cdef hb_bool_t success
+        with nogil:
+            success = hb_raster_image_deserialize_from_png_or_fail(
+                image._hb_raster_image, blob._hb_blob)
+        if not success:
+            if not _has_png_support():
+                raise HarfBuzzError("HarfBuzz was built without PNG support")
+            raise HarfBuzzError("Failed to decode PNG data")
+        return image
+
+    def view(self, top_down: bool = False) -> RasterImageView:
+        """Returns a zero-copy view of the pixels of this image, with shape
+        and strides describing the pixel layout, for use with NumPy's array
+        interface.
+
+        :param top_down: Whether rows are ordered top-to-bottom, using a
+            negative row stride, instead of the bottom-to-top storage
+            order.
+
+        :returns: A :class:`RasterImageView`.
+        """
+        return RasterImageView(self, top_down)
+
+    def __array__(self, dtype=None, copy=None):
+        """Returns the pixels as a NumPy array of :meth:`view`, with rows in
+        storage order, so that ``numpy.asarray(image)`` does not copy the
+        pixels.
+        """
+        import numpy
+
+        if copy:
+            return numpy.array(self.view(), dtype=dtype)
+        return numpy.asarray(self.view(), dtype=dtype)
+
+
+cdef class RasterImageView:
+    """A zero-copy view of the pixels of a :class:`RasterImage`, created by
+    :meth:`RasterImage.view`.
+
+    The view implements NumPy's array interface: ``numpy.asarray(view)``
+    returns a read-only ``uint8`` array of shape ``(height, width)`` for
+    :attr:`RasterFormat.A8` images, and ``(height, width, 4)`` for
+    :attr:`RasterFormat.BGRA32` images, sharing memory with the image. Row
+    padding is skipped through the strides, and top-down views use a
+    negative row stride.
+
+    Arrays keep the image alive, but are invalidated by
+    :meth:`RasterImage.configure`, which may reallocate the pixels. While
+    the view or an array of it exists, the image cannot be recycled.
+
+    :param image: The :class:`RasterImage` to view.
+    :param top_down: Whether rows are ordered top-to-bottom.
+    """
+
+    cdef RasterImage _image
+    cdef object _keeper
+    cdef bint _top_down
+
+    def __init__(self, image: RasterImage, top_down: bool = False):
+        self._image = image
+        self._keeper = image._export()
+        self._top_down = top_down
+
+    @property
+    def image(self) -> RasterImage:
+        """The viewed image.
+
+        :type: RasterImage
+        """
+        return self._image
+
+    @property
+    def top_down(self) -> bool:
+        """Whether rows are ordered top-to-bottom.
+
+        :type: bool
+        """
+        return self._top_down
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """The shape of the view: ``(height, width)`` for
+        :attr:`RasterFormat.A8` images, ``(height, width, 4)`` for
+        :attr:`RasterFormat.BGRA32` images.
+
+        :type: tuple[int, ...]
+        """
+        cdef hb_raster_extents_t c_extents
+        hb_raster_image_get_extents(self._image._hb_raster_image, &c_extents)
+        if hb_raster_image_get_format(self._image._hb_raster_image) == HB_RASTER_FORMAT_BGRA32:
+            return (c_extents.height, c_extents.width, 4)
+        return (c_extents.height, c_extents.width)
+
+    @property
+    def strides(self) -> Tuple[int, ...]:
+        """The number of bytes between consecutive items along each
+        dimension. The row stride is negative for top-down views.
+
+        :type: tuple[int, ...]
+        """
+        cdef hb_raster_extents_t c_extents
+        hb_raster_image_get_extents(self._image._hb_raster_image, &c_extents)
+        cdef Py_ssize_t stride = c_extents.stride
+        if self._top_down:
+            stride = -stride
+        if hb_raster_image_get_format(self._image._hb_raster_image) == HB_RASTER_FORMAT_BGRA32:
+            return (stride, 4, 1)
+        return (stride, 1)
+
+    @property
+    def __array_interface__(self) -> dict:
+        """The NumPy array interface of the view.
+
+        :type: dict
+        """
+        cdef hb_raster_extents_t c_extents
+        hb_raster_image_get_extents(self._image._hb_raster_image, &c_extents)
+        cdef const uint8_t* buf = hb_raster_image_get_buffer(self._image._hb_raster_image)
+        cdef size_t address = <size_t>buf
+        if buf is not NULL and self._top_down and c_extents.height:
+            address += <size_t>(c_extents.height - 1) * c_extents.stride
+        return {
+            "version": 3,
+            "shape": self.shape,
+            "strides": self.strides,
+            "typestr": "|u1",
+            "data": (address, True),
+        }
+
+
+cdef hb_raster_image_t* _raster_draw_glyphs(hb_raster_draw_t* draw,
+                                            hb_font_t* font,
+                                            hb_glyph_info_t* infos,
+                                            hb_glyph_position_t* positions,
+                                            unsigned int length) noexcept nogil:
+    cdef float xx, yx, xy, yy, dx, dy
+    cdef double x = 0
+    cdef double y = 0
+    cdef double ox, oy
+    cdef unsigned int i
+    hb_raster_draw_get_transform(draw, &xx, &yx, &xy, &yy, &dx, &dy)
+    for i in range(length):
+        ox = x + positions[i].x_offset
+        oy = y + positions[i].y_offset
+        hb_raster_draw_set_transform(draw, xx, yx, xy, yy,
+                                     dx + xx * ox + xy * oy,
+                                     dy + yx * ox + yy * oy)
+        hb_raster_draw_glyph(draw, font, infos[i].codepoint)
+        x += positions[i].x_advance
+        y += positions[i].y_advance
+    hb_raster_draw_set_transform(draw, xx, yx, xy, yy, dx, dy)
+    return hb_raster_draw_render(draw)
+
+
+cdef hb_raster_image_t* _raster_paint_glyphs(hb_raster_paint_t* paint,
+                                             hb_font_t* font,
+                                             hb_glyph_info_t* infos,
+                                             hb_glyph_position_t* positions,
+                                             unsigned int length) noexcept nogil:
+    cdef float xx, yx, xy, yy, dx, dy
+    cdef double x = 0
+    cdef double y = 0
+    cdef double ox, oy
+    cdef unsigned int i
+    hb_raster_paint_get_transform(paint, &xx, &yx, &xy, &yy, &dx, &dy)
+    for i in range(length):
+        ox = x + positions[i].x_offset
+        oy = y + positions[i].y_offset
+        hb_raster_paint_set_transform(paint, xx, yx, xy, yy,
+                                      dx + xx * ox + xy * oy,
+                                      dy + yx * ox + yy * oy)
+        hb_raster_paint_glyph(paint, font, infos[i].codepoint)
+        x += positions[i].x_advance
+        y += positions[i].y_advance
+    hb_raster_paint_set_transform(paint, xx, yx, xy, yy, dx, dy)
+    return hb_raster_paint_render(paint)
+
+
+cdef hb_raster_image_t* _raster_paint_glyph(hb_raster_paint_t* paint,
+                                            hb_font_t* font,
+                                            hb_codepoint_t gid) noexcept nogil:
+    hb_raster_paint_glyph(paint, font, gid)
+    return hb_raster_paint_render(paint)
+
+
+cdef void _glyphs_ink_box(hb_font_t* font,
+                          const hb_codepoint_t* gids,
+                          unsigned int count,
+                          double* box) noexcept nogil:
+    """Sets ``box`` to the combined ink extents of the glyphs in font units,
+    as ``x_min, y_min, x_max, y_max``. The box is empty if no glyph has
+    ink."""
+    cdef hb_glyph_extents_t glyph_extents
+    cdef bint has_ink = False
+    cdef unsigned int i
+    box[0] = box[1] = box[2] = box[3] = 0
+    for i in range(count):
+        if not hb_font_get_glyph_extents_nogil(font, gids[i], &glyph_extents):
+            continue
+        if not glyph_extents.width or not glyph_extents.height:
+            continue
+        if not has_ink:
+            box[0] = box[2] = glyph_extents.x_bearing
+            box[1] = box[3] = glyph_extents.y_bearing
+            has_ink = True
+        box[0] = min(box[0], glyph_extents.x_bearing,
+                     glyph_extents.x_bearing + glyph_extents.width)
+        box[2] = max(box[2], glyph_extents.x_bearing,
+                     glyph_extents.x_bearing + glyph_extents.width)
+        box[1] = min(box[1], glyph_extents.y_bearing,
+                     glyph_extents.y_bearing + glyph_extents.height)
+        box[3] = max(box[3], glyph_extents.y_bearing,
+                     glyph_extents.y_bearing + glyph_extents.height)
+
+
+cdef hb_raster_image_t* _raster_paint_sheet(hb_raster_paint_t* paint,
+                                            hb_font_t* font,
+                                            const hb_codepoint_t* gids,
+                                            unsigned int count,
+                                            unsigned int cols,
+                                            int cell_width,
+                                            int cell_height,
+                                            int x_origin,
+                                            int y_origin) noexcept nogil:
+    """Paints the glyphs into the cells of a sheet, with the glyph origins
+    at ``(x_origin, y_origin)`` pixels within each cell, and renders the
+    sheet."""
+    cdef float xx, yx, xy, yy, dx, dy, sx, sy
+    cdef unsigned int rows = (count + cols - 1) // cols
+    cdef unsigned int i
+    cdef double px, py
+    hb_raster_paint_get_transform(paint, &xx, &yx, &xy, &yy, &dx, &dy)
+    hb_raster_paint_get_scale_factor(paint, &sx, &sy)
+    for i in range(count):
+        px = <int>(i % cols) * cell_width + x_origin
+        py = <int>(rows - 1 - i // cols) * cell_height + y_origin
+        hb_raster_paint_set_transform(paint, xx, yx, xy, yy, px * sx, py * sy)
+        hb_raster_paint_glyph(paint, font, gids[i])
+    hb_raster_paint_set_transform(paint, xx, yx, xy, yy, dx, dy)
+    return hb_raster_paint_render(paint)
+
 
 cdef class RasterDraw:
     """An opaque outline rasterizer object. Accumulates glyph outlines via
@@ -302,6 +684,60 @@ cdef class RasterDraw:
             return None
         return RasterImage.from_ptr(img)
 
+    def render_buffer(self, font: Font, buffer: Buffer) -> RasterImage | None:
+        """Draws all glyphs of a shaped buffer and rasterizes them into a
+        single :class:`RasterImage`, as :meth:`render` does.
+
+        Each glyph is placed according to the glyph positions of the
+        buffer, starting at the origin of the current :attr:`transform`,
+        which is left unchanged afterwards. Unless :attr:`extents` are set,
+        the image is sized to fit the whole run. The GIL is released while
+        drawing and rasterizing, unless the font calls back into Python
+        through custom font functions or face table callbacks.
+
+        :param font: The :class:`Font` the buffer was shaped with.
+        :param buffer: A shaped :class:`Buffer`.
+
+        :returns: A rendered :class:`RasterImage`, or ``None`` on
+            allocation/configuration failure.
+
+        :raises ValueError: If ``buffer`` has not been shaped.
+        """
+        cdef unsigned int length
+        cdef hb_glyph_info_t* infos
+        cdef hb_glyph_position_t* positions
+        cdef hb_raster_image_t* img
+        cdef hb_font_t* private_font
+        _get_shaped_glyphs(buffer, &length, &infos, &positions)
+        private_font = _font_acquire_private(font)
+        if private_font is NULL:
+            img = _raster_draw_glyphs(self._hb_raster_draw, font._hb_font,
+                                      infos, positions, length)
+        else:
+            with nogil:
+                img = _raster_draw_glyphs(self._hb_raster_draw, private_font,
+                                          infos, positions, length)
+            _font_release_private(font)
+        if img is NULL:
+            return None
+        return RasterImage.from_ptr(img)
+
+    def recycle_image(self, image: RasterImage):
+        """Hands the pixel storage of ``image`` over to this rasterizer, to
+        be reused by the next :meth:`render` instead of allocating a new
+        image. ``image`` is left empty. If the rasterizer already holds a
+        recycled image, that image is destroyed.
+
+        :param image: The :class:`RasterImage` to recycle.
+
+        :raises ValueError: If the pixels of ``image`` are still exported
+            by :attr:`RasterImage.data` or :meth:`RasterImage.view`.
+
+        Wraps `hb_raster_draw_recycle_image()
+        <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-draw-recycle-image>`_.
+        """
+        hb_raster_draw_recycle_image(self._hb_raster_draw, image._detach())
+
     def clear(self):
         """Discards accumulated geometry and extents so this rasterizer can
         be reused for another render. User configuration (transform, scale
@@ -334,11 +770,14 @@ cdef class RasterPaint:
     """
 
     cdef hb_raster_paint_t* _hb_raster_paint
+    # Mirrors the custom palette colors, which HarfBuzz does not expose
+    cdef dict _custom_palette_colors
 
     def __cinit__(self):
         self._hb_raster_paint = hb_raster_paint_create_or_fail()
         if self._hb_raster_paint is NULL:
             raise MemoryError()
+        self._custom_palette_colors = {}
 
     def __dealloc__(self):
         hb_raster_paint_destroy(self._hb_raster_paint)
@@ -509,8 +948,12 @@ cdef class RasterPaint:
         Wraps `hb_raster_paint_set_custom_palette_color()
         <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-paint-set-custom-palette-color>`_.
         """
-        return hb_raster_paint_set_custom_palette_color(
-            self._hb_raster_paint, color_index, color.to_int())
+        cdef hb_color_t c_color = color.to_int()
+        if not hb_raster_paint_set_custom_palette_color(
+                self._hb_raster_paint, color_index, c_color):
+            return False
+        self._custom_palette_colors[color_index] = c_color
+        return True
 
     def clear_custom_palette_colors(self):
         """Clears all custom palette color overrides previously set on this
@@ -523,6 +966,7 @@ cdef class RasterPaint:
         <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-paint-clear-custom-palette-colors>`_.
         """
         hb_raster_paint_clear_custom_palette_colors(self._hb_raster_paint)
+        self._custom_palette_colors.clear()
 
     def paint_glyph(self, font: Font, glyph: int):
         """Paints one glyph into this paint context. Unlike
@@ -569,6 +1013,184 @@ cdef class RasterPaint:
             return None
         return RasterImage.from_ptr(img)
 
+    def render_buffer(self, font: Font, buffer: Buffer) -> RasterImage | None:
+        """Paints all glyphs of a shaped buffer into a single
+        :class:`RasterImage`, as :meth:`paint_glyph` followed by
+        :meth:`render` does.
+
+        Each glyph is placed according to the glyph positions of the
+        buffer, starting at the origin of the current :attr:`transform`,
+        which is left unchanged afterwards. Unless :attr:`extents` are set,
+        the image is sized to the combined glyph extents of the run. The GIL
+        is released while painting, unless the font calls back into Python.
+
+        :param font: The :class:`Font` the buffer was shaped with.
+        :param buffer: A shaped :class:`Buffer`.
+
+        :returns: A rendered :class:`RasterImage`, or ``None`` if the run
+            has no ink and no extents were set, or on
+            allocation/configuration failure.
+
+        :raises ValueError: If ``buffer`` has not been shaped.
+        """
+        cdef unsigned int length
+        cdef hb_glyph_info_t* infos
+        cdef hb_glyph_position_t* positions
+        cdef hb_raster_image_t* img
+        cdef hb_raster_extents_t c_extents
+        cdef hb_glyph_extents_t glyph_extents
+        cdef _Bounds bounds
+        cdef hb_font_t* private_font
+        _get_shaped_glyphs(buffer, &length, &infos, &positions)
+        if not hb_raster_paint_get_extents(self._hb_raster_paint, &c_extents):
+            _buffer_ink_bounds(font, buffer, False, &bounds)
+            _bounds_to_glyph_extents(&bounds, &glyph_extents)
+            if not hb_raster_paint_set_glyph_extents(self._hb_raster_paint,
+                                                     &glyph_extents):
+                hb_raster_paint_clear(self._hb_raster_paint)
+                return None
+        private_font = _font_acquire_private(font)
+        if private_font is NULL:
+            img = _raster_paint_glyphs(self._hb_raster_paint, font._hb_font,
+                                       infos, positions, length)
+        else:
+            with nogil:
+                img = _raster_paint_glyphs(self._hb_raster_paint, private_font,
+                                           infos, positions, length)
+            _font_release_private(font)
+        if img is NULL:
+            return None
+        return RasterImage.from_ptr(img)
+
+    def recycle_image(self, image: RasterImage):
+        """Hands the pixel storage of ``image`` over to this paint context,
+        to be reused for its surfaces by subsequent renders instead of
+        allocating new images. ``image`` is left empty.
+
+        :param image: The :class:`RasterImage` to recycle.
+
+        :raises ValueError: If the pixels of ``image`` are still exported
+            by :attr:`RasterImage.data` or :meth:`RasterImage.view`.
+
+        Wraps `hb_raster_paint_recycle_image()
+        <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-paint-recycle-image>`_.
+        """
+        hb_raster_paint_recycle_image(self._hb_raster_paint, image._detach())
+
+    def render_glyph_sheet(self, font: Font,
+                           glyphs: Sequence[int] | None = None,
+                           columns: int = 16,
+                           padding: int = 1) -> RasterImage | None:
+        """Paints glyphs into a single :class:`RasterImage` laid out as a
+        grid, for font proofing and visual regression snapshots. Encode the
+        sheet with :meth:`RasterImage.to_png`.
+
+        Glyphs are placed left to right and top to bottom in cells of equal
+        size that fit the combined extents of all glyphs, with the glyph
+        origins at the same position in every cell. The glyph size is set
+        by the linear part of the current :attr:`transform` and by
+        :attr:`scale_factor`; :attr:`foreground`, :attr:`background` and
+        :attr:`palette` apply as in :meth:`paint_glyph`. Any configured
+        :attr:`extents` are replaced. The GIL is released while painting,
+        unless the font calls back into Python.
+
+        :param font: The :class:`Font` to paint glyphs from.
+        :param glyphs: The glyph IDs to paint. Defaults to all glyphs of
+            the font.
+        :param columns: The number of cells per row.
+        :param padding: The number of blank pixels around the glyph box in
+            each cell.
+
+        :returns: The sheet as a :class:`RasterImage`, or ``None`` if there
+            are no glyphs to paint, or on allocation/configuration failure.
+
+        :raises ValueError: If ``columns`` is less than 1 or ``padding`` is
+            negative.
+        """
+        cdef hb_codepoint_t* gids
+        cdef unsigned int count, i
+        cdef hb_raster_extents_t c_extents
+        cdef hb_raster_image_t* img = NULL
+        cdef float xx, yx, xy, yy, dx, dy, sx, sy
+        cdef double x_min, y_min, x_max, y_max
+        cdef double px, py
+        cdef double box[4]
+        cdef double corners[8]
+        cdef int j, left, bottom, cell_width, cell_height, rows, cols, pad
+        cdef hb_font_t* c_font = font._hb_font
+        cdef hb_font_t* private_font = NULL
+        if columns < 1:
+            raise ValueError("columns must be at least 1")
+        if padding < 0:
+            raise ValueError("padding must not be negative")
+        pad = padding
+        if glyphs is None:
+            glyphs = range(hb_face_get_glyph_count(hb_font_get_face(font._hb_font)))
+        count = len(glyphs)
+        if count == 0:
+            return None
+        gids = <hb_codepoint_t*>malloc(count * sizeof(hb_codepoint_t))
+        if gids is NULL:
+            raise MemoryError()
+        try:
+            for i, gid in enumerate(glyphs):
+                gids[i] = gid
+            private_font = _font_acquire_private(font)
+            hb_raster_paint_get_transform(self._hb_raster_paint,
+                                          &xx, &yx, &xy, &yy, &dx, &dy)
+            hb_raster_paint_get_scale_factor(self._hb_raster_paint, &sx, &sy)
+            if private_font is NULL:
+                _glyphs_ink_box(c_font, gids, count, box)
+            else:
+                with nogil:
+                    _glyphs_ink_box(private_font, gids, count, box)
+            # Bounding box of the combined extents in pixel space
+            corners[0] = corners[4] = box[0]
+            corners[2] = corners[6] = box[2]
+            corners[1] = corners[3] = box[1]
+            corners[5] = corners[7] = box[3]
+            for j in range(4):
+                px = (xx * corners[2 * j] + xy * corners[2 * j + 1]) / sx
+                py = (yx * corners[2 * j] + yy * corners[2 * j + 1]) / sy
+                if j == 0:
+                    x_min = x_max = px
+                    y_min = y_max = py
+                x_min = min(x_min, px)
+                x_max = max(x_max, px)
+                y_min = min(y_min, py)
+                y_max = max(y_max, py)
+            left = <int>floor(x_min)
+            bottom = <int>floor(y_min)
+            cell_width = <int>ceil(x_max) - left + 2 * pad
+            cell_height = <int>ceil(y_max) - bottom + 2 * pad
+            if cell_width <= 0 or cell_height <= 0:
+                return None
+            cols = min(count, columns)
+            rows = (count + cols - 1) // cols
+            c_extents.x_origin = 0
+            c_extents.y_origin = 0
+            c_extents.width = cols * cell_width
+            c_extents.height = rows * cell_height
+            c_extents.stride = 0
+            hb_raster_paint_set_extents(self._hb_raster_paint, &c_extents)
+            if private_font is NULL:
+                img = _raster_paint_sheet(self._hb_raster_paint, c_font,
+                                          gids, count, cols, cell_width,
+                                          cell_height, pad - left, pad - bottom)
+            else:
+                with nogil:
+                    img = _raster_paint_sheet(self._hb_raster_paint,
+                                              private_font, gids, count, cols,
+                                              cell_width, cell_height,
+                                              pad - left, pad - bottom)
+        finally:
+            free(gids)
+            if private_font is not NULL:
+                _font_release_private(font)
+        if img is NULL:
+            return None
+        return RasterImage.from_ptr(img)
+
     def clear(self):
         """Discards accumulated paint output so this paint context can be
         reused for another render. User configuration (base transform,
@@ -588,3 +1210,409 @@ cdef class RasterPaint:
         <https://harfbuzz.github.io/harfbuzz-hb-raster.html#hb-raster-paint-reset>`_.
         """
         hb_raster_paint_reset(self._hb_raster_paint)
+        self._custom_palette_colors.clear()
+
+
+class RasterImagePoolStats(NamedTuple):
+    """Statistics of a :class:`RasterImagePool`."""
+    hits: int
+    """Number of renders that reused a pooled image."""
+    misses: int
+    """Number of renders that had no pooled image to reuse."""
+    released: int
+    """Number of images returned to the pool with
+    :meth:`RasterImagePool.release`."""
+    discarded: int
+    """Number of released images dropped because the pool was full or the
+    image pixels were still exported."""
+    pooled: int
+    """Number of images currently in the pool."""
+    pooled_bytes: int
+    """Total pixel size of the images currently in the pool."""
+
+
+cdef size_t _raster_image_nbytes(hb_raster_image_t* hb_img):
+    cdef hb_raster_extents_t c_extents
+    hb_raster_image_get_extents(hb_img, &c_extents)
+    return <size_t>c_extents.height * c_extents.stride
+
+
+cdef size_t _raster_extents_nbytes(const hb_raster_extents_t* c_extents,
+                                   unsigned int bpp):
+    cdef size_t stride = c_extents.stride
+    if stride < <size_t>c_extents.width * bpp:
+        stride = <size_t>c_extents.width * bpp
+    return stride * c_extents.height
+
+
+cdef class RasterImagePool:
+    """A pool of :class:`RasterImage` objects whose pixel storage is reused
+    by :class:`RasterDraw` and :class:`RasterPaint` renders, to avoid
+    allocating a new pixel buffer for every glyph.
+
+    Images rendered with :meth:`render` are returned to the pool with
+    :meth:`release` once they are no longer needed. Each render reuses the
+    smallest pooled image of the output format that is large enough for
+    the configured extents, or the largest one when the extents are
+    computed at render time; pixel storage only ever grows.
+
+    A pool is not thread-safe.
+
+    :param max_images: The maximum number of images kept in the pool;
+        further released images are dropped.
+    """
+
+    cdef int _max_images
+    cdef list _images
+    cdef size_t _pooled_bytes
+    cdef Py_ssize_t _hits
+    cdef Py_ssize_t _misses
+    cdef Py_ssize_t _released
+    cdef Py_ssize_t _discarded
+
+    def __init__(self, max_images: int = 64):
+        if max_images < 0:
+            raise ValueError("max_images must not be negative")
+        self._max_images = max_images
+        # One list of [nbytes, image] per RasterFormat value.
+        self._images = [[], []]
+
+    def __len__(self) -> int:
+        return len(self._images[0]) + len(self._images[1])
+
+    @property
+    def max_images(self) -> int:
+        """The maximum number of images kept in the pool.
+
+        :type: int
+        """
+        return self._max_images
+
+    @property
+    def stats(self) -> RasterImagePoolStats:
+        """The statistics of the pool.
+
+        :type: RasterImagePoolStats
+        """
+        return RasterImagePoolStats(
+            hits=self._hits,
+            misses=self._misses,
+            released=self._released,
+            discarded=self._discarded,
+            pooled=len(self),
+            pooled_bytes=self._pooled_bytes,
+        )
+
+    cdef RasterImage _take(self, int format, size_t nbytes):
+        cdef list images = self._images[format]
+        cdef Py_ssize_t best = -1
+        cdef Py_ssize_t i
+        cdef RasterImage image
+        # Drop images whose pixels were exported after they were released.
+        for i in reversed(range(len(images))):
+            image = images[i][1]
+            if image._is_exported():
+                self._pooled_bytes -= images[i][0]
+                self._discarded += 1
+                del images[i]
+        if not images:
+            return None
+        for i in range(len(images)):
+            if nbytes == 0:
+                if best < 0 or images[i][0] > images[best][0]:
+                    best = i
+            elif images[i][0] >= nbytes:
+                if best < 0 or images[i][0] < images[best][0]:
+                    best = i
+        if best < 0:
+            # Nothing large enough; grow the largest image.
+            for i in range(len(images)):
+                if best < 0 or images[i][0] > images[best][0]:
+                    best = i
+        entry = images.pop(best)
+        self._pooled_bytes -= entry[0]
+        return entry[1]
+
+    def render(self, rasterizer: RasterDraw | RasterPaint) -> RasterImage | None:
+        """Renders the accumulated output of ``rasterizer``, as its
+        ``render()`` method does, reusing a pooled image when one is
+        available.
+
+        :param rasterizer: A :class:`RasterDraw` or :class:`RasterPaint`.
+
+        :returns: A rendered :class:`RasterImage`, or ``None`` on failure,
+            as returned by the ``render()`` method of ``rasterizer``.
+        """
+        cdef hb_raster_extents_t c_extents
+        cdef size_t nbytes = 0
+        cdef RasterImage image
+        cdef RasterDraw draw
+        cdef RasterPaint paint
+        if isinstance(rasterizer, RasterDraw):
+            draw = rasterizer
+            if hb_raster_draw_get_extents(draw._hb_raster_draw, &c_extents):
+                nbytes = _raster_extents_nbytes(&c_extents, 1)
+            image = self._take(HB_RASTER_FORMAT_A8, nbytes)
+            if image is not None:
+                hb_raster_draw_recycle_image(draw._hb_raster_draw,
+                                             image._detach())
+        elif isinstance(rasterizer, RasterPaint):
+            paint = rasterizer
+            if hb_raster_paint_get_extents(paint._hb_raster_paint, &c_extents):
+                nbytes = _raster_extents_nbytes(&c_extents, 4)
+            image = self._take(HB_RASTER_FORMAT_BGRA32, nbytes)
+            if image is not None:
+                hb_raster_paint_recycle_image(paint._hb_raster_paint,
+                                              image._detach())
+        else:
+            raise TypeError(
+                f"expected RasterDraw or RasterPaint, not "
+                f"{type(rasterizer).__name__}")
+        if image is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return rasterizer.render()
+
+    def release(self, image: RasterImage) -> bool:
+        """Returns ``image`` to the pool, for its pixel storage to be reused
+        by a later :meth:`render`. The image must not be used afterwards.
+
+        :param image: A :class:`RasterImage`, typically returned by
+            :meth:`render`.
+
+        :returns: ``True`` if the image was pooled, ``False`` if it was
+            dropped because the pool is full or its pixels are still
+            exported by :attr:`RasterImage.data` or
+            :meth:`RasterImage.view`.
+
+        :raises ValueError: If ``image`` has no pixel storage, for example
+            because it was handed over to a rasterizer, or if it is already
+            in the pool.
+        """
+        cdef int format = hb_raster_image_get_format(image._hb_raster_image)
+        cdef size_t nbytes = _raster_image_nbytes(image._hb_raster_image)
+        if not nbytes or hb_raster_image_get_buffer(image._hb_raster_image) is NULL:
+            raise ValueError("cannot pool an image without pixels")
+        for entry in self._images[format]:
+            if entry[1] is image:
+                raise ValueError("image is already in the pool")
+        if len(self) >= self._max_images or image._is_exported():
+            self._discarded += 1
+            return False
+        self._released += 1
+        self._images[format].append([nbytes, image])
+        self._pooled_bytes += nbytes
+        return True
+
+    def clear(self):
+        """Drops all pooled images. Statistics are kept."""
+        self._images = [[], []]
+        self._pooled_bytes = 0
+
+
+cdef struct _RasterJob:
+    hb_codepoint_t gid
+    float x_scale
+    float y_scale
+    float dx
+    float dy
+    hb_raster_image_t* image
+
+
+cdef hb_raster_image_t* _raster_glyph(hb_raster_draw_t* draw,
+                                      hb_raster_paint_t* paint,
+                                      hb_font_t* font,
+                                      const _RasterJob* job) noexcept nogil:
+    """Renders one glyph with ``paint`` if it is not NULL, with ``draw``
+    otherwise. Glyphs without extents render to an empty BGRA32 image when
+    painted. Returns NULL on allocation failure."""
+    cdef hb_glyph_extents_t extents
+    cdef hb_raster_extents_t empty
+    cdef hb_raster_image_t* img
+    if paint is not NULL:
+        hb_raster_paint_set_transform(paint, job.x_scale, 0, 0, job.y_scale,
+                                      job.dx, job.dy)
+        if not (hb_font_get_glyph_extents_nogil(font, job.gid, &extents)
+                and hb_raster_paint_set_glyph_extents(paint, &extents)):
+            img = hb_raster_image_create_or_fail()
+            if img is not NULL:
+                memset(&empty, 0, sizeof(empty))
+                hb_raster_image_configure(img, HB_RASTER_FORMAT_BGRA32, &empty)
+            return img
+        return _raster_paint_glyph(paint, font, job.gid)
+    hb_raster_draw_set_transform(draw, job.x_scale, 0, 0, job.y_scale,
+                                 job.dx, job.dy)
+    hb_raster_draw_glyph(draw, font, job.gid)
+    return hb_raster_draw_render(draw)
+
+
+cdef class _RasterWorker:
+    """Renders every ``step``-th job of a batch, starting at ``start``, with
+    its own font and rasterizer."""
+
+    cdef hb_font_t* _font
+    cdef hb_raster_draw_t* _draw
+    cdef hb_raster_paint_t* _paint
+    cdef _RasterJob* _jobs
+    cdef size_t _count
+    cdef size_t _start
+    cdef size_t _step
+
+    def __dealloc__(self):
+        hb_raster_draw_destroy(self._draw)
+        hb_raster_paint_destroy(self._paint)
+        hb_font_destroy(self._font)
+
+    @staticmethod
+    cdef _RasterWorker create(hb_font_t* font, bint paint, _RasterJob* jobs,
+                              size_t count, size_t start, size_t step):
+        cdef _RasterWorker worker = _RasterWorker.__new__(_RasterWorker)
+        worker._font = _font_create_private(font)
+        if paint:
+            worker._paint = hb_raster_paint_create_or_fail()
+            if worker._paint is NULL:
+                raise MemoryError()
+            # Make sure the shared function tables exist before threads
+            # start: their lazy creation is not thread-safe.
+            hb_raster_paint_get_funcs(worker._paint)
+        else:
+            worker._draw = hb_raster_draw_create_or_fail()
+            if worker._draw is NULL:
+                raise MemoryError()
+        worker._jobs = jobs
+        worker._count = count
+        worker._start = start
+        worker._step = step
+        return worker
+
+    def run(self):
+        cdef size_t i
+        with nogil:
+            i = self._start
+            while i < self._count:
+                self._jobs[i].image = _raster_glyph(self._draw, self._paint,
+                                                    self._font, &self._jobs[i])
+                i += self._step
+
+
+cdef size_t _thread_count(object threads, size_t count) except? 0:
+    """Returns the number of threads to run ``count`` jobs on, defaulting
+    to the number of CPUs."""
+    if threads is None:
+        threads = os.cpu_count() or 1
+    if threads < 1:
+        raise ValueError("threads must be at least 1")
+    return min(<size_t>threads, count)
+
+
+cdef int _run_workers(list workers) except -1:
+    """Calls the ``run`` method of every worker on its own thread, and
+    waits for all of them to finish."""
+    # The calling thread runs the last worker itself.
+    spawned = [threading.Thread(target=worker.run) for worker in workers[:-1]]
+    for thread in spawned:
+        thread.start()
+    try:
+        workers[-1].run()
+    finally:
+        for thread in spawned:
+            thread.join()
+    return 0
+
+
+cdef int _raster_jobs(Font font, bint paint, _RasterJob* jobs, size_t count,
+                      object threads) except -1:
+    """Renders a batch of jobs in parallel, storing the images in the jobs.
+    The GIL is released while rendering."""
+    cdef size_t thread_count = _thread_count(threads, count)
+    cdef size_t i
+    cdef hb_raster_draw_t* draw
+    if not thread_count:
+        return 0
+    draw = hb_raster_draw_create_or_fail()
+    if draw is NULL:
+        raise MemoryError()
+    # Paint contexts fall back to drawing outlines, so this is always needed.
+    hb_raster_draw_get_funcs(draw)
+    hb_raster_draw_destroy(draw)
+    workers = [
+        _RasterWorker.create(font._hb_font, paint, jobs, count, i, thread_count)
+        for i in range(thread_count)
+    ]
+    return _run_workers(workers)
+
+
+cdef int _raster_job_scale(Font font, object size, _RasterJob* job) except -1:
+    cdef int x_scale, y_scale
+    job.x_scale = job.y_scale = 1
+    if size is not None:
+        hb_font_get_scale(font._hb_font, &x_scale, &y_scale)
+        job.x_scale = size / x_scale if x_scale else 0
+        job.y_scale = size / y_scale if y_scale else 0
+    return 0
+
+
+def rasterize_glyphs(font: Font,
+                     glyphs: Sequence[int],
+                     sizes: float | Sequence[float | None] | None = None,
+                     format: RasterFormat = RasterFormat.A8,
+                     threads: int | None = None) -> List[RasterImage]:
+    """Renders many glyphs in parallel, each into its own
+    :class:`RasterImage`.
+
+    The glyphs are split between ``threads`` threads, each with its own
+    rasterizer and its own copy of the font, so that no HarfBuzz object is
+    shared between threads, and the GIL is released while rendering. The
+    copies share the font data and have the scale, variations and
+    synthetic bold and slant of ``font``; glyphs are drawn with HarfBuzz's
+    built-in OpenType functions.
+
+    :attr:`RasterFormat.A8` images are rendered as with
+    :meth:`RasterDraw.render`, and :attr:`RasterFormat.BGRA32` images, in
+    color, as with :meth:`RasterPaint.render`, using the default palette
+    and foreground.
+
+    :param font: The :class:`Font` to render glyphs from.
+    :param glyphs: The glyph IDs to render.
+    :param sizes: The size to render glyphs at, in pixels per em, or
+        ``None`` to render one pixel per unit of the font scale. Either one
+        size for all glyphs, or a sequence with one size per glyph.
+    :param format: The pixel format of the images.
+    :param threads: The number of threads to use. Defaults to the number of
+        CPUs.
+
+    :returns: A list with one :class:`RasterImage` per glyph, in order.
+        Glyphs without ink render to empty images.
+
+    :raises ValueError: If ``sizes`` does not match ``glyphs``, if
+        ``threads`` is less than 1, or if the face of ``font`` has no font
+        data.
+    """
+    cdef size_t count = len(glyphs)
+    cdef size_t i
+    cdef _RasterJob* jobs
+    cdef list images = []
+    if sizes is None or isinstance(sizes, (int, float)):
+        sizes = itertools.repeat(sizes, count)
+    elif len(sizes) != count:
+        raise ValueError(
+            f"expected {count} sizes, got {len(sizes)}")
+    jobs = <_RasterJob*>calloc(count, sizeof(_RasterJob))
+    if jobs is NULL and count:
+        raise MemoryError()
+    try:
+        for i, (gid, size) in enumerate(zip(glyphs, sizes)):
+            jobs[i].gid = gid
+            _raster_job_scale(font, size, &jobs[i])
+        _raster_jobs(font, format == RasterFormat.BGRA32, jobs, count, threads)
+        for i in range(count):
+            if jobs[i].image is NULL:
+                raise MemoryError()
+            images.append(RasterImage.from_ptr(jobs[i].image))
+            jobs[i].image = NULL
+    finally:
+        for i in range(count):
+            hb_raster_image_destroy(jobs[i].image)
+        free(jobs)
+    return images
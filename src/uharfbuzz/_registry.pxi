@@ -0,0 +1,196 @@
+class FontRegistryStats(NamedTuple):
+    """Cache statistics of a :class:`FontRegistry`."""
+    face_hits: int
+    """Number of face lookups served from the registry."""
+    face_misses: int
+    """Number of face lookups that had to load the face."""
+    font_hits: int
+    """Number of font lookups served from the registry."""
+    font_misses: int
+    """Number of font lookups that had to create the font."""
+    evictions: int
+    """Number of faces evicted to stay within the memory budget."""
+    resident_bytes: int
+    """Total size of the font data currently held by the registry."""
+
+
+class _RegistryEntry:
+    __slots__ = ("face", "size", "fonts")
+
+    def __init__(self, face, size):
+        self.face = face
+        self.size = size
+        self.fonts = {}
+
+
+def _font_settings_key(scale, ppem, ptem, variations,
+                       synthetic_bold, synthetic_slant):
+    if variations is not None:
+        variations = tuple(sorted(variations.items()))
+    if synthetic_bold is not None and not isinstance(synthetic_bold, tuple):
+        synthetic_bold = (synthetic_bold,)
+    return (
+        None if scale is None else tuple(scale),
+        None if ppem is None else tuple(ppem),
+        ptem,
+        variations,
+        synthetic_bold,
+        synthetic_slant,
+    )
+
+
+class FontRegistry:
+    """A memoizing loader that shares :class:`Face` objects and caches
+    :class:`Font` objects per size and variation settings.
+
+    Font files are loaded with :meth:`Blob.from_file_path`, which maps the
+    file into memory when possible, and faces are keyed by
+    ``(path, index)``. Font data passed as :class:`bytes` or :class:`Blob`
+    is keyed by the SHA-256 hash of its content instead.
+
+    Faces are evicted in least-recently-used order, together with their
+    fonts, when the total size of the font data held by the registry
+    exceeds ``max_bytes``. The most recently loaded face is never evicted,
+    even if it alone exceeds the budget.
+
+    :param max_bytes: The memory budget for font data, in bytes.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._face_hits = 0
+        self._face_misses = 0
+        self._font_hits = 0
+        self._font_misses = 0
+        self._evictions = 0
+        self._resident_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> FontRegistryStats:
+        """The cache statistics of the registry.
+
+        :type: FontRegistryStats
+        """
+        with self._lock:
+            return FontRegistryStats(
+                face_hits=self._face_hits,
+                face_misses=self._face_misses,
+                font_hits=self._font_hits,
+                font_misses=self._font_misses,
+                evictions=self._evictions,
+                resident_bytes=self._resident_bytes,
+            )
+
+    @staticmethod
+    def _key(source, index):
+        if isinstance(source, (str, Path)):
+            return (os.path.abspath(os.fspath(source)), index)
+        if isinstance(source, Blob):
+            source = source.data_view
+        return (hashlib.sha256(source).hexdigest(), index)
+
+    def _entry(self, source, index):
+        key = self._key(source, index)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._face_hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self._face_misses += 1
+        if isinstance(source, (str, Path)):
+            blob = Blob.from_file_path(source)
+        elif isinstance(source, Blob):
+            blob = source
+        else:
+            blob = Blob(source)
+        entry = _RegistryEntry(Face(blob, index), len(blob))
+        self._entries[key] = entry
+        self._resident_bytes += entry.size
+        self._evict()
+        return entry
+
+    def _evict(self):
+        while self._resident_bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._resident_bytes -= entry.size
+            self._evictions += 1
+
+    def get_face(self, source: Union[str, Path, bytes, Blob],
+                 index: int = 0) -> Face:
+        """Returns the shared :class:`Face` for ``source``, loading it on
+        first use.
+
+        :param source: A font file path, or the font data as
+            :class:`bytes` or :class:`Blob`.
+        :param index: The index of the face within the font data.
+
+        :raises HarfBuzzError: If the font file cannot be opened or read.
+        """
+        with self._lock:
+            return self._entry(source, index).face
+
+    def get_font(self, source: Union[str, Path, bytes, Blob],
+                 index: int = 0,
+                 *,
+                 scale: Tuple[int, int] | None = None,
+                 ppem: Tuple[int, int] | None = None,
+                 ptem: float | None = None,
+                 variations: Dict[str, float] | None = None,
+                 synthetic_bold: float | tuple | None = None,
+                 synthetic_slant: float | None = None) -> Font:
+        """Returns a cached :class:`Font` for ``source`` with the given
+        settings, creating it on first use. Settings left as ``None`` keep
+        the font defaults.
+
+        The returned font is shared between callers asking for the same
+        settings, so it must not be modified.
+
+        :param source: A font file path, or the font data as
+            :class:`bytes` or :class:`Blob`.
+        :param index: The index of the face within the font data.
+        :param scale: See :attr:`Font.scale`.
+        :param ppem: See :attr:`Font.ppem`.
+        :param ptem: See :attr:`Font.ptem`.
+        :param variations: See :meth:`Font.set_variations`.
+        :param synthetic_bold: See :attr:`Font.synthetic_bold`.
+        :param synthetic_slant: See :attr:`Font.synthetic_slant`.
+
+        :raises HarfBuzzError: If the font file cannot be opened or read.
+        """
+        settings = _font_settings_key(scale, ppem, ptem, variations,
+                                      synthetic_bold, synthetic_slant)
+        with self._lock:
+            entry = self._entry(source, index)
+            font = entry.fonts.get(settings)
+            if font is not None:
+                self._font_hits += 1
+                return font
+            self._font_misses += 1
+            font = Font(entry.face)
+            if scale is not None:
+                font.scale = scale
+            if ppem is not None:
+                font.ppem = ppem
+            if ptem is not None:
+                font.ptem = ptem
+            if variations is not None:
+                font.set_variations(variations)
+            if synthetic_bold is not None:
+                font.synthetic_bold = synthetic_bold
+            if synthetic_slant is not None:
+                font.synthetic_slant = synthetic_slant
+            entry.fonts[settings] = font
+            return font
+
+    def clear(self):
+        """Drops all faces and fonts held by the registry. Statistics are
+        kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._resident_bytes = 0
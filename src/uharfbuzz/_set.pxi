@@ -31,6 +31,23 @@ cdef class Set:
     def __dealloc__(self):
         hb_set_destroy(self._hb_set)
 
+    def __reduce__(self):
+        cdef hb_codepoint_t first = HB_SET_VALUE_INVALID
+        cdef hb_codepoint_t last = HB_SET_VALUE_INVALID
+        ranges = array.array("I")
+        while hb_set_next_range(self._hb_set, &first, &last):
+            ranges.append(first)
+            ranges.append(last)
+        return Set, (), ranges
+
+    def __setstate__(self, ranges):
+        cdef Py_ssize_t i
+        hb_set_clear(self._hb_set)
+        for i in range(0, len(ranges), 2):
+            hb_set_add_range(self._hb_set, ranges[i], ranges[i + 1])
+        if not hb_set_allocation_successful(self._hb_set):
+            raise MemoryError()
+
     @staticmethod
     cdef Set from_ptr(hb_set_t* hb_set):
         """Create Set from a pointer, taking ownership of it."""
@@ -34,6 +34,322 @@ def subset(face: Face, input: SubsetInput) -> Face:
         raise RuntimeError("Subsetting failed")
     return Face.from_ptr(new_face)
 
+
+cdef object _subset_face_output(hb_face_t* new_face, object out):
+    """Serializes a subset face, consuming the reference to it, and returns
+    its data as a view or writes it to ``out``."""
+    cdef Blob blob = Blob.from_ptr(hb_face_reference_blob(new_face))
+    hb_face_destroy(new_face)
+    view = blob.data_view
+    if out is None:
+        return view
+    if hasattr(out, "write"):
+        out.write(view)
+        return len(view)
+    target = memoryview(out).cast("B")
+    if len(target) < len(view):
+        raise ValueError(
+            f"buffer is too small: {len(view)} bytes needed, got {len(target)}")
+    target[:len(view)] = view
+    return len(view)
+
+
+def subset_to_bytes(face: Face, input: SubsetInput,
+                    out: BinaryIO | bytearray | memoryview | None = None
+                    ) -> memoryview | int:
+    """Subsets a font according to provided input, and returns the font
+    data of the subset without copying it, or writes it to ``out``.
+
+    Unlike ``subset(face, input).blob.data``, no intermediate :class:`Face`
+    is created and the font data is not copied into :class:`bytes`.
+
+    :param out: A binary file object, or a writable buffer at least as
+        large as the subset, to write the font data to.
+
+    :returns: A read-only :class:`memoryview` of the font data if ``out``
+        is ``None``, otherwise the number of bytes written.
+
+    :raises RuntimeError: If the subset operation fails or the face has no
+        glyphs.
+    :raises ValueError: If ``out`` is a buffer that is too small.
+
+    Wraps `hb_subset_or_fail()
+    <https://harfbuzz.github.io/harfbuzz-hb-subset.html#hb-subset-or-fail>`_.
+    """
+    new_face = hb_subset_or_fail(face._hb_face, input._hb_input)
+    if new_face == NULL:
+        raise RuntimeError("Subsetting failed")
+    return _subset_face_output(new_face, out)
+
+
+cdef struct _SubsetJob:
+    hb_subset_input_t* input
+    hb_blob_t* blob
+
+
+cdef hb_subset_input_t* _subset_input_copy(hb_subset_input_t* input,
+                                           hb_face_t* face) except NULL:
+    """Creates a subset input with the flags, sets and axis ranges of
+    ``input``. Axis ranges are copied for the axes of ``face``."""
+    cdef hb_subset_input_t* copy = hb_subset_input_create_or_fail()
+    cdef hb_ot_var_axis_info_t* axes
+    cdef unsigned int axis_count, i
+    cdef int set_type
+    cdef float min_value, max_value, def_value
+    if copy is NULL:
+        raise MemoryError()
+    hb_subset_input_set_flags(copy, hb_subset_input_get_flags(input))
+    for set_type in range(HB_SUBSET_SETS_LAYOUT_SCRIPT_TAG + 1):
+        hb_set_set(hb_subset_input_set(copy, <hb_subset_sets_t>set_type),
+                   hb_subset_input_set(input, <hb_subset_sets_t>set_type))
+    axis_count = hb_ot_var_get_axis_infos(face, 0, NULL, NULL)
+    if axis_count:
+        axes = <hb_ot_var_axis_info_t*>malloc(
+            axis_count * sizeof(hb_ot_var_axis_info_t))
+        if axes is NULL:
+            hb_subset_input_destroy(copy)
+            raise MemoryError()
+        hb_ot_var_get_axis_infos(face, 0, &axis_count, axes)
+        for i in range(axis_count):
+            if hb_subset_input_get_axis_range(input, axes[i].tag, &min_value,
+                                              &max_value, &def_value):
+                hb_subset_input_set_axis_range(copy, face, axes[i].tag,
+                                               min_value, max_value, def_value)
+        free(axes)
+    return copy
+
+
+cdef int _subset_input_add(hb_set_t* hb_set, object values) except -1:
+    cdef Set other
+    if isinstance(values, Set):
+        other = values
+        hb_set_union(hb_set, other._hb_set)
+    else:
+        for value in values:
+            hb_set_add(hb_set, value)
+    return 0
+
+
+cdef class _SubsetWorker:
+    """Runs every ``step``-th job of a batch, starting at ``start``, on its
+    own preprocessed face, which is kept for the next batch."""
+
+    cdef hb_face_t* _face
+    cdef bint _preprocessed
+    cdef _SubsetJob* _jobs
+    cdef size_t _count
+    cdef size_t _start
+    cdef size_t _step
+
+    def __dealloc__(self):
+        hb_face_destroy(self._face)
+
+    @staticmethod
+    cdef _SubsetWorker create(hb_face_t* face, hb_blob_t* blob):
+        cdef _SubsetWorker worker = _SubsetWorker.__new__(_SubsetWorker)
+        worker._face = _face_create_private(face, blob)
+        return worker
+
+    cdef void _assign(self, _SubsetJob* jobs, size_t count, size_t start,
+                      size_t step) noexcept:
+        self._jobs = jobs
+        self._count = count
+        self._start = start
+        self._step = step
+
+    cdef void _preprocess(self) noexcept nogil:
+        cdef hb_face_t* preprocessed
+        if self._preprocessed:
+            return
+        preprocessed = hb_subset_preprocess_nogil(self._face)
+        hb_face_destroy_nogil(self._face)
+        self._face = preprocessed
+        self._preprocessed = True
+
+    def run(self):
+        cdef size_t i
+        cdef hb_face_t* new_face
+        with nogil:
+            self._preprocess()
+            i = self._start
+            while i < self._count:
+                new_face = hb_subset_or_fail_nogil(self._face,
+                                                   self._jobs[i].input)
+                if new_face is not NULL:
+                    self._jobs[i].blob = hb_face_reference_blob_nogil(new_face)
+                    hb_face_destroy_nogil(new_face)
+                i += self._step
+
+
+cdef class SubsetBatch:
+    """Subsets a font many times in parallel, with a shared base input and
+    one set of Unicode code points and/or glyph IDs per subset.
+
+    The subsets are split between ``threads`` threads, and the GIL is
+    released while subsetting. Each thread works on its own face over the
+    font data of ``face``, preprocessed as with :func:`subset_preprocess`,
+    so no HarfBuzz object is shared between threads. Each face is
+    preprocessed once, the first time it is needed, and reused by every
+    call to :meth:`subset`, so a batch should be kept for as long as the
+    same font is subset.
+
+    Calls to :meth:`subset` from several threads run one after the other.
+
+    :param face: The :class:`Face` to subset.
+    :param threads: The number of threads to use. Defaults to the number of
+        CPUs.
+
+    :raises ValueError: If ``threads`` is less than 1, or if ``face`` has
+        no font data.
+    """
+
+    cdef Face _face
+    cdef list _workers
+    cdef object _lock
+
+    def __init__(self, face: Face, threads: int | None = None):
+        cdef size_t thread_count = _thread_count(threads, <size_t>-1)
+        cdef hb_blob_t* blob = hb_face_reference_blob(face._hb_face)
+        cdef _SubsetWorker worker
+        try:
+            workers = [
+                _SubsetWorker.create(face._hb_face, blob)
+                for _ in range(thread_count)
+            ]
+        finally:
+            hb_blob_destroy(blob)
+        # Preprocessing the first face before threads start creates the
+        # shared HarfBuzz function tables, whose lazy creation is not
+        # thread-safe.
+        worker = workers[0]
+        worker._preprocess()
+        self._face = face
+        self._workers = workers
+        self._lock = threading.Lock()
+
+    @property
+    def face(self) -> Face:
+        """The face being subset.
+
+        :type: Face
+        """
+        return self._face
+
+    @property
+    def threads(self) -> int:
+        """The number of threads used.
+
+        :type: int
+        """
+        return len(self._workers)
+
+    def subset(self,
+               input: SubsetInput,
+               unicodes: Sequence[Iterable[int]] | None = None,
+               glyphs: Sequence[Iterable[int]] | None = None) -> List[bytes]:
+        """Subsets the font once per set of ``unicodes`` and/or ``glyphs``.
+
+        Each subset retains the code points of ``unicodes`` and the glyphs
+        of ``glyphs`` at its index, in addition to those of the sets of
+        ``input``, and otherwise uses the flags, sets and axis ranges of
+        ``input``.
+
+        :param input: The base :class:`SubsetInput`.
+        :param unicodes: The code points to retain, one iterable or
+            :class:`Set` per subset.
+        :param glyphs: The glyph IDs to retain, one iterable or
+            :class:`Set` per subset.
+
+        :returns: A list with the font data of each subset, in order.
+
+        :raises ValueError: If neither ``unicodes`` nor ``glyphs`` are
+            given, or if they have different lengths.
+        :raises RuntimeError: If a subset operation fails.
+        """
+        cdef size_t count, i
+        cdef size_t thread_count
+        cdef _SubsetJob* jobs
+        cdef _SubsetWorker worker
+        cdef unsigned int length
+        cdef const char* data
+        cdef list results = []
+        if unicodes is None and glyphs is None:
+            raise ValueError("unicodes or glyphs must be given")
+        if unicodes is not None and glyphs is not None and len(unicodes) != len(glyphs):
+            raise ValueError(
+                f"expected {len(unicodes)} glyph sets, got {len(glyphs)}")
+        count = len(unicodes if unicodes is not None else glyphs)
+        thread_count = min(<size_t>len(self._workers), count)
+        jobs = <_SubsetJob*>calloc(count, sizeof(_SubsetJob))
+        if jobs is NULL and count:
+            raise MemoryError()
+        try:
+            for i in range(count):
+                jobs[i].input = _subset_input_copy(input._hb_input,
+                                                   self._face._hb_face)
+                if unicodes is not None:
+                    _subset_input_add(
+                        hb_subset_input_unicode_set(jobs[i].input), unicodes[i])
+                if glyphs is not None:
+                    _subset_input_add(
+                        hb_subset_input_glyph_set(jobs[i].input), glyphs[i])
+            if thread_count:
+                workers = self._workers[:thread_count]
+                with self._lock:
+                    for i in range(thread_count):
+                        worker = workers[i]
+                        worker._assign(jobs, count, i, thread_count)
+                    try:
+                        _run_workers(workers)
+                    finally:
+                        for i in range(thread_count):
+                            worker = workers[i]
+                            worker._assign(NULL, 0, 0, 1)
+            for i in range(count):
+                if jobs[i].blob is NULL:
+                    raise RuntimeError("Subsetting failed")
+                data = hb_blob_get_data(jobs[i].blob, &length)
+                results.append(data[:length])
+        finally:
+            for i in range(count):
+                hb_subset_input_destroy(jobs[i].input)
+                hb_blob_destroy(jobs[i].blob)
+            free(jobs)
+        return results
+
+
+def subset_batch(face: Face,
+                 input: SubsetInput,
+                 unicodes: Sequence[Iterable[int]] | None = None,
+                 glyphs: Sequence[Iterable[int]] | None = None,
+                 threads: int | None = None) -> List[bytes]:
+    """Subsets a font many times in parallel, with a shared base input and
+    one set of Unicode code points and/or glyph IDs per subset.
+
+    This is a shortcut for creating a :class:`SubsetBatch` and calling its
+    :meth:`~SubsetBatch.subset` method once. Each call preprocesses the
+    font again for every thread, so keep a :class:`SubsetBatch` instead
+    when subsetting the same font more than once.
+
+    :param face: The :class:`Face` to subset.
+    :param input: The base :class:`SubsetInput`.
+    :param unicodes: The code points to retain, one iterable or
+        :class:`Set` per subset.
+    :param glyphs: The glyph IDs to retain, one iterable or :class:`Set`
+        per subset.
+    :param threads: The number of threads to use. Defaults to the number of
+        CPUs.
+
+    :returns: A list with the font data of each subset, in order.
+
+    :raises ValueError: If neither ``unicodes`` nor ``glyphs`` are given,
+        if they have different lengths, if ``threads`` is less than 1, or
+        if ``face`` has no font data.
+    :raises RuntimeError: If a subset operation fails.
+    """
+    return SubsetBatch(face, threads).subset(input, unicodes, glyphs)
+
+
 class SubsetInputSets(IntEnum):
     """List of sets that can be configured on the subset input.
 
@@ -468,6 +784,30 @@ cdef class SubsetPlan:
             raise RuntimeError("Subsetting failed")
         return Face.from_ptr(new_face)
 
+    def execute_to_bytes(self,
+                         out: BinaryIO | bytearray | memoryview | None = None
+                         ) -> memoryview | int:
+        """Executes this subsetting plan, and returns the font data of the
+        subset without copying it, or writes it to ``out``. See
+        :func:`subset_to_bytes`.
+
+        :param out: A binary file object, or a writable buffer at least as
+            large as the subset, to write the font data to.
+
+        :returns: A read-only :class:`memoryview` of the font data if
+            ``out`` is ``None``, otherwise the number of bytes written.
+
+        :raises RuntimeError: If the subsetting operation fails.
+        :raises ValueError: If ``out`` is a buffer that is too small.
+
+        Wraps `hb_subset_plan_execute_or_fail()
+        <https://harfbuzz.github.io/harfbuzz-hb-subset.html#hb-subset-plan-execute-or-fail>`_.
+        """
+        new_face = hb_subset_plan_execute_or_fail(self._hb_plan)
+        if new_face == NULL:
+            raise RuntimeError("Subsetting failed")
+        return _subset_face_output(new_face, out)
+
     @property
     def old_to_new_glyph_mapping(self) -> Map:
         """The mapping between glyphs in the original font to glyphs in the
@@ -503,3 +843,279 @@ cdef class SubsetPlan:
         <https://harfbuzz.github.io/harfbuzz-hb-subset.html#hb-subset-plan-unicode-to-old-glyph-mapping>`_.
         """
         return Map.from_ptr(hb_map_reference (<hb_map_t*>hb_subset_plan_unicode_to_old_glyph_mapping(self._hb_plan)))
+
+
+class SubsetCacheStats(NamedTuple):
+    """Statistics of a :class:`SubsetCache`."""
+    hits: int
+    """Number of subsets served from memory."""
+    disk_hits: int
+    """Number of subsets served from the cache directory."""
+    misses: int
+    """Number of subsets that had to be computed."""
+    evictions: int
+    """Number of subsets evicted from memory to stay within the memory
+    budget."""
+    resident_bytes: int
+    """Total size of the subsets currently held in memory."""
+
+
+cdef hb_user_data_key_t _face_fingerprint_key
+
+
+cdef bytes _face_fingerprint(hb_face_t* face):
+    """Returns the SHA-256 digest of the tables of a face. The digest is
+    stored on the face, so it is only computed once per face. Raises
+    ValueError if the face does not list its tables, as faces created from
+    table callbacks without a table tags function do."""
+    cdef char* digest = <char*>hb_face_get_user_data(face, &_face_fingerprint_key)
+    cdef unsigned int tag_count = STATIC_ARRAY_SIZE
+    cdef unsigned int start_offset = 0
+    cdef hb_tag_t tags[STATIC_ARRAY_SIZE]
+    cdef uint32_t header[4]
+    cdef unsigned int i, length
+    cdef hb_blob_t* blob
+    cdef const char* data
+    cdef bytes result
+    if digest is not NULL:
+        return digest[:32]
+    h = hashlib.sha256()
+    header[0] = hb_face_get_upem(face)
+    header[1] = hb_face_get_glyph_count(face)
+    h.update((<char*>header)[:2 * sizeof(uint32_t)])
+    while tag_count == STATIC_ARRAY_SIZE:
+        hb_face_get_table_tags(face, start_offset, &tag_count, tags)
+        for i in range(tag_count):
+            blob = hb_face_reference_table(face, tags[i])
+            data = hb_blob_get_data(blob, &length)
+            header[2] = tags[i]
+            header[3] = length
+            h.update((<char*>&header[2])[:2 * sizeof(uint32_t)])
+            try:
+                h.update(_memoryview_from_ptr(None, data, length))
+            finally:
+                hb_blob_destroy(blob)
+        start_offset += tag_count
+    if not start_offset:
+        raise ValueError("face tables cannot be enumerated")
+    result = h.digest()
+    digest = <char*>malloc(32)
+    if digest is NULL:
+        raise MemoryError()
+    memcpy(digest, <char*>result, 32)
+    if not hb_face_set_user_data(face, &_face_fingerprint_key, digest,
+                                 free, False):
+        free(digest)
+    return result
+
+
+cdef struct _Digest:
+    uint32_t* values
+    size_t count
+    size_t capacity
+
+
+cdef int _digest_add(_Digest* d, uint32_t value) except -1:
+    cdef uint32_t* values
+    if d.count == d.capacity:
+        d.capacity = max(64, 2 * d.capacity)
+        values = <uint32_t*>realloc(d.values, d.capacity * sizeof(uint32_t))
+        if values is NULL:
+            raise MemoryError()
+        d.values = values
+    d.values[d.count] = value
+    d.count += 1
+    return 0
+
+
+cdef bytes _subset_input_canonical(hb_subset_input_t* input, hb_face_t* face):
+    """Serializes the flags, sets and axis ranges of a subset input into a
+    canonical byte string. Sets are written as ranges, without going
+    through Python objects."""
+    cdef _Digest d
+    cdef hb_set_t* hb_set
+    cdef hb_codepoint_t first, last
+    cdef hb_ot_var_axis_info_t* axes = NULL
+    cdef unsigned int axis_count, i
+    cdef float values[3]
+    d.values = NULL
+    d.count = d.capacity = 0
+    try:
+        _digest_add(&d, hb_subset_input_get_flags(input))
+        for set_type in SubsetInputSets:
+            hb_set = hb_subset_input_set(input, set_type)
+            _digest_add(&d, set_type)
+            _digest_add(&d, hb_set_get_population(hb_set))
+            first = last = HB_SET_VALUE_INVALID
+            while hb_set_next_range(hb_set, &first, &last):
+                _digest_add(&d, first)
+                _digest_add(&d, last)
+        axis_count = hb_ot_var_get_axis_infos(face, 0, NULL, NULL)
+        if axis_count:
+            axes = <hb_ot_var_axis_info_t*>malloc(
+                axis_count * sizeof(hb_ot_var_axis_info_t))
+            if axes is NULL:
+                raise MemoryError()
+            hb_ot_var_get_axis_infos(face, 0, &axis_count, axes)
+            for i in range(axis_count):
+                if hb_subset_input_get_axis_range(input, axes[i].tag, &values[0],
+                                                  &values[1], &values[2]):
+                    _digest_add(&d, axes[i].tag)
+                    _digest_add(&d, (<uint32_t*>values)[0])
+                    _digest_add(&d, (<uint32_t*>values)[1])
+                    _digest_add(&d, (<uint32_t*>values)[2])
+        return (<char*>d.values)[:d.count * sizeof(uint32_t)]
+    finally:
+        free(axes)
+        free(d.values)
+
+
+class SubsetCache:
+    """A content-addressed cache of font subsets.
+
+    Subsets are keyed by a fingerprint of the tables of the source face, by
+    the flags, sets and axis ranges of the :class:`SubsetInput` and by the
+    HarfBuzz version, so identical requests share one subset whatever
+    objects they are made with. The fingerprint is computed once per face
+    and stored on it, so a face should be reused across requests. The face
+    must list its tables in :attr:`Face.table_tags`.
+
+    Subsets are evicted from memory in least-recently-used order when their
+    total size exceeds ``max_bytes``. If ``directory`` is given, subsets
+    are also written there, one file per key, and read back when they are
+    not in memory; files are never removed by the cache.
+
+    :param max_bytes: The memory budget for subsets, in bytes.
+    :param directory: A directory to store subsets in, created if needed,
+        or ``None`` to only keep subsets in memory.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024,
+                 directory: str | Path | None = None):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self._max_bytes = max_bytes
+        self._directory = None
+        if directory is not None:
+            self._directory = Path(directory)
+            self._directory.mkdir(parents=True, exist_ok=True)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._resident_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_bytes(self) -> int:
+        """The memory budget for subsets, in bytes. Lowering it evicts
+        subsets immediately.
+
+        :type: int
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        if value < 0:
+            raise ValueError("max_bytes must not be negative")
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    @property
+    def directory(self) -> Path | None:
+        """The directory subsets are stored in, or ``None``.
+
+        :type: Path | None
+        """
+        return self._directory
+
+    @property
+    def stats(self) -> SubsetCacheStats:
+        """The statistics of the cache.
+
+        :type: SubsetCacheStats
+        """
+        with self._lock:
+            return SubsetCacheStats(
+                hits=self._hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                resident_bytes=self._resident_bytes,
+            )
+
+    @staticmethod
+    def key(face: Face, input: SubsetInput) -> str:
+        """Returns the cache key of subsetting ``face`` with ``input``.
+
+        :returns: A SHA-256 hex digest.
+
+        :raises ValueError: If the tables of ``face`` cannot be enumerated.
+        """
+        h = hashlib.sha256(_face_fingerprint(face._hb_face))
+        h.update(_subset_input_canonical(input._hb_input, face._hb_face))
+        h.update(hb_version_string())
+        return h.hexdigest()
+
+    def _evict(self):
+        while self._resident_bytes > self._max_bytes and self._entries:
+            _, data = self._entries.popitem(last=False)
+            self._resident_bytes -= len(data)
+            self._evictions += 1
+
+    def _store(self, key, data):
+        self._entries[key] = data
+        self._resident_bytes += len(data)
+        self._evict()
+
+    def subset(self, face: Face, input: SubsetInput) -> bytes:
+        """Returns the font data of ``face`` subset with ``input``,
+        computing it with :func:`subset` if it is not cached.
+
+        :raises ValueError: If the tables of ``face`` cannot be enumerated.
+        :raises RuntimeError: If the subset operation fails.
+        """
+        key = self.key(face, input)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return data
+        path = None
+        if self._directory is not None:
+            path = self._directory / key
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                pass
+            else:
+                with self._lock:
+                    self._disk_hits += 1
+                    self._store(key, data)
+                return data
+        data = subset(face, input).blob.data
+        if path is not None:
+            # Written under a temporary name so that readers never see a
+            # partial file.
+            tmp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        with self._lock:
+            self._misses += 1
+            self._store(key, data)
+        return data
+
+    def clear(self):
+        """Drops all subsets held in memory. Files in the cache directory
+        and statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._resident_bytes = 0
@@ -1,4 +1,4 @@
-from libc.stdint cimport uint8_t, uint16_t, uint32_t
+from libc.stdint cimport uint8_t, uint16_t, uint32_t, int32_t
 
 
 cdef extern from "hb.h":
@@ -198,6 +198,7 @@ cdef extern from "hb.h":
     hb_direction_t hb_buffer_get_direction(hb_buffer_t* buffer)
     void hb_buffer_set_direction(hb_buffer_t* buffer, hb_direction_t direction)
     unsigned int hb_buffer_get_length(const hb_buffer_t *buffer)
+    hb_bool_t hb_buffer_set_length(hb_buffer_t *buffer, unsigned int length)
     hb_glyph_info_t* hb_buffer_get_glyph_infos(
         hb_buffer_t* buffer, unsigned int* length)
     hb_glyph_position_t* hb_buffer_get_glyph_positions(
@@ -224,6 +225,18 @@ cdef extern from "hb.h":
     hb_buffer_flags_t hb_buffer_get_flags(const hb_buffer_t *buffer)
     void hb_buffer_set_content_type(hb_buffer_t *buffer, hb_buffer_content_type_t  content_type)
     hb_buffer_content_type_t hb_buffer_get_content_type(const hb_buffer_t *buffer)
+    ctypedef struct hb_segment_properties_t:
+        hb_direction_t direction
+        hb_script_t script
+        hb_language_t language
+    void hb_buffer_get_segment_properties(
+        const hb_buffer_t *buffer, hb_segment_properties_t *props)
+    void hb_buffer_set_segment_properties(
+        hb_buffer_t *buffer, const hb_segment_properties_t *props)
+    hb_buffer_t* hb_buffer_create_similar(const hb_buffer_t *src)
+    void hb_buffer_append(
+        hb_buffer_t *buffer, const hb_buffer_t *source,
+        unsigned int start, unsigned int end)
     void hb_buffer_set_replacement_codepoint(hb_buffer_t *buffer, hb_codepoint_t  replacement)
     hb_codepoint_t hb_buffer_get_replacement_codepoint(const hb_buffer_t *buffer)
     void hb_buffer_set_invisible_glyph(hb_buffer_t *buffer, hb_codepoint_t  invisible)
@@ -349,6 +362,8 @@ cdef extern from "hb.h":
     hb_font_t* hb_font_create(hb_face_t* face)
     hb_font_t* hb_font_create_sub_font(hb_font_t* parent)
     hb_font_t* hb_font_get_empty()
+    hb_font_t* hb_font_get_parent(hb_font_t* font)
+    unsigned int hb_font_get_serial(hb_font_t* font)
     hb_font_t* hb_font_reference(hb_font_t *font)
     void hb_font_destroy(hb_font_t* font)
 
@@ -609,9 +624,6 @@ cdef extern from "hb.h":
         HB_PAINT_EXTEND_REPEAT
         HB_PAINT_EXTEND_REFLECT
 
-    ctypedef struct hb_color_line_t:
-        pass
-
     ctypedef enum hb_paint_composite_mode_t:
         HB_PAINT_COMPOSITE_MODE_CLEAR
         HB_PAINT_COMPOSITE_MODE_SRC
@@ -863,6 +875,44 @@ cdef extern from "hb.h":
         hb_paint_custom_palette_color_func_t  func,
         void                                 *user_data,
         hb_destroy_func_t                     destroy)
+    void hb_paint_push_transform(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        float xx, float yx, float xy, float yy, float dx, float dy)
+    void hb_paint_pop_transform(hb_paint_funcs_t *funcs, void *paint_data)
+    void hb_paint_fill_glyph(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_codepoint_t glyph, hb_font_t *font,
+        hb_bool_t is_foreground, hb_color_t color)
+    void hb_paint_push_clip_glyph(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_codepoint_t glyph, hb_font_t *font)
+    void hb_paint_push_clip_rectangle(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        float xmin, float ymin, float xmax, float ymax)
+    void hb_paint_pop_clip(hb_paint_funcs_t *funcs, void *paint_data)
+    void hb_paint_color(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_bool_t is_foreground, hb_color_t color)
+    void hb_paint_image(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_blob_t *image, unsigned int width, unsigned int height,
+        hb_tag_t format, float slant, hb_glyph_extents_t *extents)
+    void hb_paint_linear_gradient(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_color_line_t *color_line,
+        float x0, float y0, float x1, float y1, float x2, float y2)
+    void hb_paint_radial_gradient(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_color_line_t *color_line,
+        float x0, float y0, float r0, float x1, float y1, float r1)
+    void hb_paint_sweep_gradient(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_color_line_t *color_line,
+        float x0, float y0, float start_angle, float end_angle)
+    void hb_paint_push_group(hb_paint_funcs_t *funcs, void *paint_data)
+    void hb_paint_pop_group(
+        hb_paint_funcs_t *funcs, void *paint_data,
+        hb_paint_composite_mode_t mode)
 
     # hb-shape.h
     void hb_shape(
@@ -951,6 +1001,66 @@ cdef extern from "hb.h":
         HB_STYLE_TAG_WEIGHT
     float hb_style_get_value(hb_font_t *font, hb_style_tag_t style_tag)
 
+# Functions called with the GIL released, declared under separate names so
+# that the callback types above keep requiring the GIL.
+cdef extern from "hb.h" nogil:
+    void hb_font_draw_glyph_nogil "hb_font_draw_glyph" (
+        hb_font_t *font,
+        hb_codepoint_t glyph,
+        const hb_draw_funcs_t *dfuncs, void *draw_data)
+    hb_bool_t hb_font_get_glyph_extents_nogil "hb_font_get_glyph_extents" (
+        hb_font_t *font,
+        hb_codepoint_t glyph,
+        hb_glyph_extents_t *extents)
+    void hb_draw_move_to_nogil "hb_draw_move_to" (
+        hb_draw_funcs_t *dfuncs, void *draw_data, hb_draw_state_t *st,
+        float to_x, float to_y)
+    void hb_draw_line_to_nogil "hb_draw_line_to" (
+        hb_draw_funcs_t *dfuncs, void *draw_data, hb_draw_state_t *st,
+        float to_x, float to_y)
+    void hb_draw_quadratic_to_nogil "hb_draw_quadratic_to" (
+        hb_draw_funcs_t *dfuncs, void *draw_data, hb_draw_state_t *st,
+        float control_x, float control_y, float to_x, float to_y)
+    void hb_draw_cubic_to_nogil "hb_draw_cubic_to" (
+        hb_draw_funcs_t *dfuncs, void *draw_data, hb_draw_state_t *st,
+        float control1_x, float control1_y,
+        float control2_x, float control2_y,
+        float to_x, float to_y)
+    void hb_draw_close_path_nogil "hb_draw_close_path" (
+        hb_draw_funcs_t *dfuncs, void *draw_data, hb_draw_state_t *st)
+    void hb_font_paint_glyph_nogil "hb_font_paint_glyph" (
+        hb_font_t *font,
+        hb_codepoint_t glyph,
+        hb_paint_funcs_t *pfuncs,
+        void *paint_data,
+        unsigned int palette_index,
+        hb_color_t foreground)
+    unsigned int hb_color_line_get_color_stops_nogil "hb_color_line_get_color_stops" (
+        hb_color_line_t *color_line,
+        unsigned int start,
+        unsigned int *count,
+        hb_color_stop_t *color_stops)
+    hb_paint_extend_t hb_color_line_get_extend_nogil "hb_color_line_get_extend" (
+        hb_color_line_t *color_line)
+    hb_blob_t* hb_blob_reference_nogil "hb_blob_reference" (hb_blob_t* blob)
+    void hb_blob_destroy_nogil "hb_blob_destroy" (hb_blob_t* blob)
+    const char* hb_blob_get_data_nogil "hb_blob_get_data" (
+        hb_blob_t *blob, unsigned int *length)
+    hb_blob_t* hb_face_reference_blob_nogil "hb_face_reference_blob" (
+        hb_face_t *face)
+    void hb_face_destroy_nogil "hb_face_destroy" (hb_face_t* face)
+    void hb_paint_reduce_linear_anchors(
+        float x0, float y0, float x1, float y1, float x2, float y2,
+        float *xx0, float *yy0, float *xx1, float *yy1)
+    void hb_paint_normalize_color_line(
+        hb_color_stop_t *stops, unsigned int len, float *min, float *max)
+    ctypedef void (*hb_paint_sweep_gradient_tile_func_t) (
+        float a0, hb_color_t c0, float a1, hb_color_t c1, void *user_data)
+    void hb_paint_sweep_gradient_tiles(
+        hb_color_stop_t *stops, unsigned int n_stops,
+        hb_paint_extend_t extend, float start_angle, float end_angle,
+        hb_paint_sweep_gradient_tile_func_t emit_patch, void *user_data)
+
 cdef extern from "hb-ot.h":
     # hb-ot-layout.h
     unsigned int hb_ot_layout_lookup_get_glyph_alternates(
@@ -1438,7 +1548,16 @@ cdef extern from "hb-subset.h":
     hb_bool_t hb_subset_plan_set_user_data(hb_subset_plan_t* plan, hb_user_data_key_t* key, void* data, hb_destroy_func_t destroy, hb_bool_t replace)
     void* hb_subset_plan_get_user_data(const hb_subset_plan_t* plan, hb_user_data_key_t* key)
 
+cdef extern from "hb-subset.h" nogil:
+    hb_face_t* hb_subset_or_fail_nogil "hb_subset_or_fail" (
+        hb_face_t* source, const hb_subset_input_t* input)
+    hb_face_t* hb_subset_preprocess_nogil "hb_subset_preprocess" (
+        hb_face_t* source)
 
+
+# Only the functions called with the GIL released are declared nogil. Those
+# taking a font may call back into Python through font functions or table
+# loaders, which take the GIL themselves.
 cdef extern from "hb-raster.h":
 
     ctypedef enum hb_raster_format_t:
@@ -1460,23 +1579,23 @@ cdef extern from "hb-raster.h":
         pass
 
     # Image
-    hb_raster_image_t* hb_raster_image_create_or_fail()
+    hb_raster_image_t* hb_raster_image_create_or_fail() nogil
     hb_raster_image_t* hb_raster_image_reference(hb_raster_image_t* image)
     void hb_raster_image_destroy(hb_raster_image_t* image)
     hb_bool_t hb_raster_image_configure(
         hb_raster_image_t* image,
         hb_raster_format_t format,
-        const hb_raster_extents_t* extents)
+        const hb_raster_extents_t* extents) nogil
     void hb_raster_image_clear(hb_raster_image_t* image)
-    const uint8_t* hb_raster_image_get_buffer(const hb_raster_image_t* image)
+    const uint8_t* hb_raster_image_get_buffer(const hb_raster_image_t* image) nogil
     void hb_raster_image_get_extents(
         const hb_raster_image_t* image,
         hb_raster_extents_t* extents)
     hb_raster_format_t hb_raster_image_get_format(const hb_raster_image_t* image)
     hb_bool_t hb_raster_image_deserialize_from_png_or_fail(
         hb_raster_image_t* image,
-        hb_blob_t* png)
-    hb_blob_t* hb_raster_image_serialize_to_png_or_fail(const hb_raster_image_t* image)
+        hb_blob_t* png) nogil
+    hb_blob_t* hb_raster_image_serialize_to_png_or_fail(const hb_raster_image_t* image) nogil
 
     # Draw
     hb_raster_draw_t* hb_raster_draw_create_or_fail()
@@ -1484,10 +1603,10 @@ cdef extern from "hb-raster.h":
     void hb_raster_draw_destroy(hb_raster_draw_t* draw)
     void hb_raster_draw_set_transform(
         hb_raster_draw_t* draw,
-        float xx, float yx, float xy, float yy, float dx, float dy)
+        float xx, float yx, float xy, float yy, float dx, float dy) nogil
     void hb_raster_draw_get_transform(
         const hb_raster_draw_t* draw,
-        float* xx, float* yx, float* xy, float* yy, float* dx, float* dy)
+        float* xx, float* yx, float* xy, float* yy, float* dx, float* dy) nogil
     void hb_raster_draw_set_scale_factor(
         hb_raster_draw_t* draw, float x_scale_factor, float y_scale_factor)
     void hb_raster_draw_get_scale_factor(
@@ -1500,10 +1619,10 @@ cdef extern from "hb-raster.h":
         hb_raster_draw_t* draw, const hb_glyph_extents_t* glyph_extents)
     hb_draw_funcs_t* hb_raster_draw_get_funcs(const hb_raster_draw_t* draw)
     void hb_raster_draw_glyph(
-        hb_raster_draw_t* draw, hb_font_t* font, hb_codepoint_t glyph)
+        hb_raster_draw_t* draw, hb_font_t* font, hb_codepoint_t glyph) nogil
     hb_bool_t hb_raster_draw_glyph_or_fail(
         hb_raster_draw_t* draw, hb_font_t* font, hb_codepoint_t glyph)
-    hb_raster_image_t* hb_raster_draw_render(hb_raster_draw_t* draw)
+    hb_raster_image_t* hb_raster_draw_render(hb_raster_draw_t* draw) nogil
     void hb_raster_draw_clear(hb_raster_draw_t* draw)
     void hb_raster_draw_reset(hb_raster_draw_t* draw)
     void hb_raster_draw_recycle_image(
@@ -1515,20 +1634,20 @@ cdef extern from "hb-raster.h":
     void hb_raster_paint_destroy(hb_raster_paint_t* paint)
     void hb_raster_paint_set_transform(
         hb_raster_paint_t* paint,
-        float xx, float yx, float xy, float yy, float dx, float dy)
+        float xx, float yx, float xy, float yy, float dx, float dy) nogil
     void hb_raster_paint_get_transform(
         const hb_raster_paint_t* paint,
-        float* xx, float* yx, float* xy, float* yy, float* dx, float* dy)
+        float* xx, float* yx, float* xy, float* yy, float* dx, float* dy) nogil
     void hb_raster_paint_set_scale_factor(
         hb_raster_paint_t* paint, float x_scale_factor, float y_scale_factor)
     void hb_raster_paint_get_scale_factor(
-        const hb_raster_paint_t* paint, float* x_scale_factor, float* y_scale_factor)
+        const hb_raster_paint_t* paint, float* x_scale_factor, float* y_scale_factor) nogil
     void hb_raster_paint_set_extents(
         hb_raster_paint_t* paint, const hb_raster_extents_t* extents)
     hb_bool_t hb_raster_paint_get_extents(
         const hb_raster_paint_t* paint, hb_raster_extents_t* extents)
     hb_bool_t hb_raster_paint_set_glyph_extents(
-        hb_raster_paint_t* paint, const hb_glyph_extents_t* glyph_extents)
+        hb_raster_paint_t* paint, const hb_glyph_extents_t* glyph_extents) nogil
     void hb_raster_paint_set_foreground(
         hb_raster_paint_t* paint, hb_color_t foreground)
     hb_color_t hb_raster_paint_get_foreground(const hb_raster_paint_t* paint)
@@ -1543,10 +1662,10 @@ cdef extern from "hb-raster.h":
         hb_raster_paint_t* paint, unsigned int color_index, hb_color_t color)
     hb_paint_funcs_t* hb_raster_paint_get_funcs(const hb_raster_paint_t* paint)
     void hb_raster_paint_glyph(
-        hb_raster_paint_t* paint, hb_font_t* font, hb_codepoint_t glyph)
+        hb_raster_paint_t* paint, hb_font_t* font, hb_codepoint_t glyph) nogil
     hb_bool_t hb_raster_paint_glyph_or_fail(
         hb_raster_paint_t* paint, hb_font_t* font, hb_codepoint_t glyph)
-    hb_raster_image_t* hb_raster_paint_render(hb_raster_paint_t* paint)
+    hb_raster_image_t* hb_raster_paint_render(hb_raster_paint_t* paint) nogil
     void hb_raster_paint_clear(hb_raster_paint_t* paint)
     void hb_raster_paint_reset(hb_raster_paint_t* paint)
     void hb_raster_paint_recycle_image(
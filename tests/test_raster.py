@@ -1,3 +1,4 @@
+import zlib
 from pathlib import Path
 
 import pytest
@@ -10,6 +11,61 @@ OPENSANS_TTF = TESTDATA / "OpenSans.subset.ttf"
 COLORV1_TTF = TESTDATA / "test_glyphs-glyf_colr_1.ttf"
 
 
+def shaped_buffer(font, text):
+    buf = hb.Buffer()
+    buf.add_str(text)
+    buf.guess_segment_properties()
+    hb.shape(font, buf)
+    return buf
+
+
+def rows(image):
+    extents = image.extents
+    bpp = 4 if image.format is hb.RasterFormat.BGRA32 else 1
+    data = image.buffer
+    return [
+        data[y * extents.stride : y * extents.stride + extents.width * bpp]
+        for y in range(extents.height)
+    ]
+
+
+def png_chunks(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks = {}
+    pos = 8
+    while pos < len(data):
+        length = int.from_bytes(data[pos : pos + 4], "big")
+        tag = data[pos + 4 : pos + 8]
+        chunk = data[pos + 8 : pos + 8 + length]
+        crc = int.from_bytes(data[pos + 8 + length : pos + 12 + length], "big")
+        assert zlib.crc32(tag + chunk) == crc
+        chunks[tag] = chunks.get(tag, b"") + chunk
+        pos += 12 + length
+    return chunks
+
+
+def to_png(image):
+    """Encodes ``image`` as PNG, skipping the test if HarfBuzz was built
+    without PNG support."""
+    try:
+        return image.to_png()
+    except hb.HarfBuzzError as e:
+        if "PNG support" not in str(e):
+            raise
+        pytest.skip(str(e))
+
+
+def callback_font(font):
+    """Returns a font whose face loads the tables of ``font`` through a
+    Python callback."""
+    source = font.face
+
+    def reference_table(face, tag, user_data):
+        return source.reference_table(tag).data
+
+    return hb.Font(hb.Face.create_for_tables(reference_table, None))
+
+
 @pytest.fixture
 def font():
     blob = hb.Blob(OPENSANS_TTF.read_bytes())
@@ -36,6 +92,149 @@ class TestRasterImage:
         assert img.extents.stride >= 16
         assert len(img.buffer) == img.extents.height * img.extents.stride
 
+        # Exported pixels must not be reallocated under the view
+        data = img.data
+        with pytest.raises(ValueError):
+            img.configure(hb.RasterFormat.A8, None)
+        view = img.view()
+        del data
+        with pytest.raises(ValueError):
+            img.configure(hb.RasterFormat.BGRA32, hb.RasterExtents(width=32, height=32))
+        del view
+        assert img.configure(hb.RasterFormat.A8, None)
+
+    def test_data(self, font):
+        draw = hb.RasterDraw()
+        draw.draw_glyph(font, 1)
+        image = draw.render()
+        extents = image.extents
+        data = image.data
+        assert data.readonly
+        assert data.shape == (extents.height, extents.stride)
+        assert data.tobytes() == image.buffer
+        del image
+        assert data.tobytes()
+        assert len(hb.RasterImage().data) == 0
+
+    def test_view(self, font, colorv1font):
+        draw = hb.RasterDraw()
+        draw.transform = (1 / 16, 0.0, 0.0, 1 / 16, 0.0, 0.0)
+        draw.draw_glyph(font, 1)
+        image = draw.render()
+        extents = image.extents
+        view = image.view()
+        assert view.image is image
+        assert not view.top_down
+        assert view.shape == (extents.height, extents.width)
+        assert view.strides == (extents.stride, 1)
+        top_down = image.view(top_down=True)
+        assert top_down.strides == (-extents.stride, 1)
+        interface = top_down.__array_interface__
+        assert interface["typestr"] == "|u1"
+        assert interface["data"] == (
+            view.__array_interface__["data"][0]
+            + (extents.height - 1) * extents.stride,
+            True,
+        )
+
+        paint = hb.RasterPaint()
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        image = paint.render()
+        extents = image.extents
+        assert image.view().shape == (extents.height, extents.width, 4)
+        assert image.view(top_down=True).strides == (-extents.stride, 4, 1)
+
+    def test_numpy(self, font):
+        np = pytest.importorskip("numpy")
+        draw = hb.RasterDraw()
+        draw.draw_glyph(font, 1)
+        image = draw.render()
+        array = np.asarray(image)
+        assert not array.flags.writeable
+        assert array.shape == (image.extents.height, image.extents.width)
+        assert np.shares_memory(array, np.asarray(image.data))
+        assert rows(image) == [row.tobytes() for row in array]
+        top_down = np.asarray(image.view(top_down=True))
+        assert (top_down == array[::-1]).all()
+        del image, draw
+        assert top_down.sum() == array.sum() > 0
+
+        draw = hb.RasterDraw()
+        image = draw.render()
+        array = np.asarray(image)
+        with pytest.raises(ValueError):
+            draw.recycle_image(image)
+        del array
+        draw.recycle_image(image)
+
+    def test_to_png_errors(self, font):
+        with pytest.raises(ValueError):
+            hb.RasterImage().to_png()
+        draw = hb.RasterDraw()
+        draw.draw_glyph(font, 1)
+        with pytest.raises(ValueError, match="BGRA32"):
+            draw.render().to_png()
+
+    def test_to_png(self, colorv1font):
+        paint = hb.RasterPaint()
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        image = paint.render()
+        extents = image.extents
+        chunks = png_chunks(to_png(image))
+        assert chunks[b"IHDR"][:8] == (
+            extents.width.to_bytes(4, "big") + extents.height.to_bytes(4, "big")
+        )
+        assert chunks[b"IHDR"][8:10] == bytes([8, 6])
+
+    def test_from_png(self, colorv1font):
+        with pytest.raises(hb.HarfBuzzError):
+            hb.RasterImage.from_png(b"not a png")
+
+        paint = hb.RasterPaint()
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        image = paint.render()
+        decoded = hb.RasterImage.from_png(to_png(image))
+        assert decoded.format is hb.RasterFormat.BGRA32
+        assert decoded.extents.width == image.extents.width
+        assert decoded.extents.height == image.extents.height
+        # Un-premultiplying and premultiplying again is off by at most one
+        for row, decoded_row in zip(rows(image), rows(decoded)):
+            assert max(abs(a - b) for a, b in zip(row, decoded_row)) <= 1
+
+        # Rows filtered with Average, Sub, Paeth and Up, top row first
+        raw = bytes(
+            [3, 10, 20, 30, 35, 40, 45]
+            + [1, 11, 22, 33, 33, 33, 33]
+            + [4, 1, 2, 3, 4, 5, 6]
+            + [2, 1, 2, 3, 4, 5, 6]
+        )
+        header = (2).to_bytes(4, "big") + (4).to_bytes(4, "big") + bytes([8, 2, 0, 0, 0])
+        data = b"\x89PNG\r\n\x1a\n" + b"".join(
+            len(chunk).to_bytes(4, "big")
+            + tag
+            + chunk
+            + zlib.crc32(tag + chunk).to_bytes(4, "big")
+            for tag, chunk in [
+                (b"IHDR", header),
+                (b"IDAT", zlib.compress(raw)),
+                (b"IEND", b""),
+            ]
+        )
+        decoded = hb.RasterImage.from_png(data)
+        assert decoded.extents.width == 2
+        assert decoded.extents.height == 4
+        assert rows(decoded) == [
+            bytes([39, 26, 13, 255, 78, 65, 52, 255]),
+            bytes([36, 24, 12, 255, 72, 60, 48, 255]),
+            bytes([33, 22, 11, 255, 66, 55, 44, 255]),
+            bytes([30, 20, 10, 255, 60, 50, 40, 255]),
+        ]
+        with pytest.raises(hb.HarfBuzzError):
+            hb.RasterImage.from_png(data[:-13])
+
 
 class TestRasterDraw:
     def test_render_a8(self, font):
@@ -80,6 +279,49 @@ class TestRasterDraw:
         image = draw.render()
         assert isinstance(image, hb.RasterImage)
 
+    def test_recycle_image(self, font):
+        draw = hb.RasterDraw()
+        draw.draw_glyph(font, 1)
+        image = draw.render()
+        expected = image.buffer
+        data = image.data
+        with pytest.raises(ValueError):
+            draw.recycle_image(image)
+        del data
+        draw.recycle_image(image)
+        assert image.extents.width == image.extents.height == 0
+        assert image.buffer == b""
+
+        draw.draw_glyph(font, 1)
+        assert draw.render().buffer == expected
+
+    def test_render_buffer(self, font):
+        # 1/16 scale puts the second glyph at a whole pixel (1296 / 16 = 81)
+        transform = (1 / 16, 0.0, 0.0, 1 / 16, 0.0, 0.0)
+        draw = hb.RasterDraw()
+        draw.transform = transform
+        draw.draw_glyph(font, 1)
+        glyph = draw.render()
+        width = glyph.extents.width
+
+        buf = shaped_buffer(font, "AA")
+        image = draw.render_buffer(font, buf)
+        assert draw.transform == transform
+        assert image.format is hb.RasterFormat.A8
+        assert image.extents.width == 2 * width
+        assert image.extents.height == glyph.extents.height
+        for row, glyph_row in zip(rows(image), rows(glyph)):
+            assert row[:width] == glyph_row
+            assert row[width:] == glyph_row
+
+        image = draw.render_buffer(font, hb.Buffer())
+        assert image.extents.width == image.extents.height == 0
+
+        buf = hb.Buffer()
+        buf.add_str("A")
+        with pytest.raises(ValueError):
+            draw.render_buffer(font, buf)
+
 
 class TestRasterPaint:
     def test_render_bgra32(self, colorv1font):
@@ -129,3 +371,544 @@ class TestRasterPaint:
         image = paint.render()
         assert image is not None
         assert image.format is hb.RasterFormat.BGRA32
+
+    def test_recycle_image(self, colorv1font):
+        gid = 10
+        paint = hb.RasterPaint()
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(gid))
+        paint.paint_glyph(colorv1font, gid)
+        image = paint.render()
+        expected = image.buffer
+        view = image.view()
+        with pytest.raises(ValueError):
+            paint.recycle_image(image)
+        del view
+        paint.recycle_image(image)
+        assert image.buffer == b""
+
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(gid))
+        paint.paint_glyph(colorv1font, gid)
+        assert paint.render().buffer == expected
+
+    def test_render_buffer(self, font, colorv1font):
+        transform = (1 / 16, 0.0, 0.0, 1 / 16, 0.0, 0.0)
+        paint = hb.RasterPaint()
+        paint.transform = transform
+        paint.set_glyph_extents(font.get_glyph_extents(1))
+        paint.paint_glyph(font, 1)
+        glyph = paint.render()
+        width = glyph.extents.width
+
+        image = paint.render_buffer(font, shaped_buffer(font, "AA"))
+        assert paint.transform == transform
+        assert image.format is hb.RasterFormat.BGRA32
+        assert image.extents.width == 2 * width
+        for row, glyph_row in zip(rows(image), rows(glyph)):
+            assert row[: width * 4] == glyph_row
+            assert row[width * 4 :] == glyph_row
+
+        buf = hb.Buffer()
+        buf.add_codepoints([10, 11])
+        buf.content_type = hb.BufferContentType.GLYPHS
+        image = paint.render_buffer(colorv1font, buf)
+        assert image.format is hb.RasterFormat.BGRA32
+        assert image.extents.width > 0
+        assert any(image.buffer)
+
+        assert paint.render_buffer(font, hb.Buffer()) is None
+
+    def test_render_glyph_sheet(self, font, colorv1font):
+        paint = hb.RasterPaint()
+        paint.scale_factor = (16, 16)
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        glyph = paint.render()
+        width, height = glyph.extents.width, glyph.extents.height
+
+        padding = 3
+        sheet = paint.render_glyph_sheet(
+            colorv1font, [10, 10, 10], columns=2, padding=padding
+        )
+        cell_width = width + 2 * padding
+        cell_height = height + 2 * padding
+        assert sheet.format is hb.RasterFormat.BGRA32
+        assert sheet.extents.width == 2 * cell_width
+        assert sheet.extents.height == 2 * cell_height
+        sheet_rows = rows(sheet)
+        # Rows are stored bottom-to-top: the last cell is in the bottom row
+        for column, row in ((0, 1), (1, 1), (0, 0)):
+            x = (column * cell_width + padding) * 4
+            y = row * cell_height + padding
+            for i, glyph_row in enumerate(rows(glyph)):
+                assert sheet_rows[y + i][x : x + width * 4] == glyph_row
+        empty_cell = b"".join(row[cell_width * 4 :] for row in sheet_rows[:cell_height])
+        assert not any(empty_cell)
+
+        # All glyphs by default; only glyph 1 of the subset font has ink
+        paint.set_glyph_extents(font.get_glyph_extents(1))
+        paint.paint_glyph(font, 1)
+        glyph = paint.render()
+        width = glyph.extents.width
+        sheet = paint.render_glyph_sheet(font, padding=0)
+        assert sheet.extents.width == 2 * width
+        assert sheet.extents.height == glyph.extents.height
+        assert [row[width * 4 :] for row in rows(sheet)] == rows(glyph)
+
+        assert paint.render_glyph_sheet(font, []) is None
+
+        with pytest.raises(ValueError):
+            paint.render_glyph_sheet(font, columns=0)
+        with pytest.raises(ValueError):
+            paint.render_glyph_sheet(font, padding=-1)
+
+
+def scaled_paint():
+    paint = hb.RasterPaint()
+    paint.transform = (0.1, 0.0, 0.0, 0.1, 0.0, 0.0)
+    return paint
+
+
+def draw_render_buffer(font):
+    draw = hb.RasterDraw()
+    draw.transform = (1 / 16, 0.0, 0.0, 1 / 16, 0.0, 0.0)
+    return draw.render_buffer(font, shaped_buffer(font, "AA"))
+
+
+def paint_render_buffer(font):
+    buf = hb.Buffer()
+    buf.add_codepoints([10, 11])
+    buf.content_type = hb.BufferContentType.GLYPHS
+    return scaled_paint().render_buffer(font, buf)
+
+
+@pytest.mark.parametrize(
+    "font_name, render",
+    [
+        pytest.param("font", draw_render_buffer, id="RasterDraw.render_buffer"),
+        pytest.param(
+            "colorv1font", paint_render_buffer, id="RasterPaint.render_buffer"
+        ),
+        pytest.param(
+            "colorv1font",
+            lambda font: scaled_paint().render_glyph_sheet(font, [10, 11]),
+            id="render_glyph_sheet",
+        ),
+        pytest.param(
+            "colorv1font",
+            lambda font: hb.ColorGlyphBitmapCache().get(scaled_paint(), font, 10),
+            id="ColorGlyphBitmapCache.get",
+        ),
+    ],
+)
+def test_nogil_callback_face(request, font_name, render):
+    # Fonts whose tables are loaded through Python keep the GIL
+    font = request.getfixturevalue(font_name)
+    image = render(callback_font(font))
+    expected = render(font)
+    assert image.extents[:4] == expected.extents[:4]
+    assert rows(image) == rows(expected)
+
+
+class TestRasterImagePool:
+    def test_render_draw(self, font):
+        draw = hb.RasterDraw()
+        draw.draw_glyph(font, 1)
+        expected = draw.render()
+
+        pool = hb.RasterImagePool()
+        for i in range(3):
+            draw.draw_glyph(font, 1)
+            image = pool.render(draw)
+            assert image.extents == expected.extents
+            assert image.buffer == expected.buffer
+            assert pool.release(image)
+        assert pool.stats == hb.RasterImagePoolStats(
+            hits=2,
+            misses=1,
+            released=3,
+            discarded=0,
+            pooled=1,
+            pooled_bytes=len(expected.buffer),
+        )
+
+    def test_render_paint(self, font, colorv1font):
+        paint = hb.RasterPaint()
+        pool = hb.RasterImagePool()
+        draw = hb.RasterDraw()
+        draw.draw_glyph(font, 1)
+        pool.release(draw.render())
+        for f, gid in ((colorv1font, 10), (font, 1), (colorv1font, 10)):
+            paint.set_glyph_extents(f.get_glyph_extents(gid))
+            paint.paint_glyph(f, gid)
+            image = pool.render(paint)
+            paint.set_glyph_extents(f.get_glyph_extents(gid))
+            paint.paint_glyph(f, gid)
+            expected = paint.render()
+            assert image.format is hb.RasterFormat.BGRA32
+            assert image.extents == expected.extents
+            assert image.buffer == expected.buffer
+            pool.release(image)
+        stats = pool.stats
+        # The A8 image is never reused for BGRA32 output
+        assert (stats.hits, stats.misses, stats.pooled) == (2, 1, 2)
+
+        with pytest.raises(TypeError):
+            pool.render(font)
+
+    def test_release(self, font):
+        draw = hb.RasterDraw()
+        pool = hb.RasterImagePool(max_images=1)
+        images = []
+        for i in range(2):
+            draw.draw_glyph(font, 1)
+            images.append(draw.render())
+        data = images[0].data
+        assert not pool.release(images[0])
+        assert pool.release(images[1])
+        draw.draw_glyph(font, 1)
+        assert not pool.release(draw.render())
+        assert len(pool) == 1
+        assert pool.stats.discarded == 2
+
+        # Pooled, empty and recycled images are rejected
+        with pytest.raises(ValueError):
+            pool.release(images[1])
+        with pytest.raises(ValueError):
+            pool.release(hb.RasterDraw().render())
+        draw.draw_glyph(font, 1)
+        image = draw.render()
+        draw.recycle_image(image)
+        with pytest.raises(ValueError):
+            pool.release(image)
+        assert pool.stats.released == 1
+
+        # Exported after release: dropped instead of reused
+        data = images[1].data
+        draw.draw_glyph(font, 1)
+        assert pool.render(draw) is not None
+        assert len(data) == images[1].extents.height
+        stats = pool.stats
+        assert (stats.hits, stats.misses, stats.discarded) == (0, 1, 3)
+
+        pool.clear()
+        assert len(pool) == 0
+        assert pool.stats.pooled_bytes == 0
+
+        with pytest.raises(ValueError):
+            hb.RasterImagePool(max_images=-1)
+
+
+class TestRasterizeGlyphs:
+    def test_a8(self, font):
+        glyphs = [0, 1, 1, 0, 1]
+        draw = hb.RasterDraw()
+        draw.transform = (32 / 2048, 0.0, 0.0, 32 / 2048, 0.0, 0.0)
+        expected = []
+        for gid in glyphs:
+            draw.draw_glyph(font, gid)
+            expected.append(draw.render())
+        for threads in (1, 2, 8):
+            images = hb.rasterize_glyphs(font, glyphs, 32, threads=threads)
+            assert [image.extents for image in images] == [
+                image.extents for image in expected
+            ]
+            assert [image.buffer for image in images] == [
+                image.buffer for image in expected
+            ]
+
+        images = hb.rasterize_glyphs(font, [1, 1], [32, None], threads=2)
+        assert images[0].buffer == expected[1].buffer
+        assert images[1].extents.width > 1000
+
+    def test_bgra32(self, colorv1font):
+        paint = hb.RasterPaint()
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        expected = paint.render()
+        images = hb.rasterize_glyphs(
+            colorv1font, [10, 0, 10], format=hb.RasterFormat.BGRA32, threads=2
+        )
+        assert all(image.format is hb.RasterFormat.BGRA32 for image in images)
+        assert images[0].buffer == images[2].buffer == expected.buffer
+        assert images[1].buffer == b""
+
+    def test_font_settings(self):
+        blob = hb.Blob.from_file_path(TESTDATA / "MutatorSans-VF.subset.ttf")
+        font = hb.Font(hb.Face(blob))
+        light = hb.rasterize_glyphs(font, [1], threads=1)[0]
+        font.set_variations({"wght": 1000})
+        draw = hb.RasterDraw()
+        draw.draw_glyph(font, 1)
+        expected = draw.render()
+        bold = hb.rasterize_glyphs(font, [1], threads=1)[0]
+        assert bold.extents != light.extents
+        assert bold.buffer == expected.buffer
+
+    def test_errors(self, font):
+        assert hb.rasterize_glyphs(font, []) == []
+        with pytest.raises(ValueError):
+            hb.rasterize_glyphs(font, [1, 1], [32])
+        with pytest.raises(ValueError):
+            hb.rasterize_glyphs(font, [1], threads=0)
+
+
+class TestGlyphAtlas:
+    def test_add(self, font):
+        atlas = hb.GlyphAtlas(128, 128)
+        entry = atlas.add(font, 1, size=32)
+        assert (entry.page, entry.x, entry.y) == (0, 1, 1)
+        assert entry.u0 == 1 / 128 and entry.v0 == 1 / 128
+        assert entry.u1 == (1 + entry.width) / 128
+        assert entry.v1 == (1 + entry.height) / 128
+        assert atlas.add(font, 1, size=32) is entry
+        assert len(atlas) == 1
+
+        # Same pixels as a single-glyph render, flipped to top-down rows
+        draw = hb.RasterDraw()
+        draw.transform = (32 / 2048, 0.0, 0.0, 32 / 2048, 0.0, 0.0)
+        draw.draw_glyph(font, 1)
+        glyph = draw.render()
+        assert (entry.x_bearing, entry.y_bearing) == (
+            glyph.extents.x_origin,
+            glyph.extents.y_origin + glyph.extents.height,
+        )
+        page = atlas.pages[0]
+        data = page.data
+        assert data.readonly
+        assert len(data) == page.height * page.stride == 128 * 128
+        page_rows = [
+            bytes(data[y * page.stride + entry.x : y * page.stride + entry.x + entry.width])
+            for y in range(entry.y, entry.y + entry.height)
+        ]
+        assert page_rows == rows(glyph)[::-1]
+
+        offset = atlas.add(font, 1, size=32, subpixel_offset=(0.5, 0.0))
+        assert offset is not entry
+        assert offset.x == entry.x + entry.width + 1
+        assert len(atlas) == 2
+
+        empty = atlas.add(font, 0, size=32)
+        assert empty.page == -1 and empty.width == empty.height == 0
+
+    def test_font_settings(self, font):
+        atlas = hb.GlyphAtlas(128, 128)
+        entry = atlas.add(font, 1, size=32)
+        font.synthetic_bold = 0.1
+        bold = atlas.add(font, 1, size=32)
+        assert bold != entry
+        assert bold.width > entry.width
+
+    def test_pages_and_eviction(self, font):
+        atlas = hb.GlyphAtlas(64, 64, max_pages=2)
+        first = atlas.add(font, 1, size=48)
+        second = atlas.add(font, 1, size=49)
+        assert (first.page, second.page) == (0, 1)
+        atlas.add(font, 1, size=48)  # page 0 is now the most recently used
+        third = atlas.add(font, 1, size=50)
+        assert third.page == 1
+        assert [page.generation for page in atlas.pages] == [0, 1]
+        assert len(atlas) == 2
+        assert atlas.add(font, 1, size=48) is first
+
+        with pytest.raises(ValueError):
+            atlas.add(font, 1, size=100)
+
+        atlas.clear()
+        assert len(atlas) == 0 and atlas.pages == []
+
+    def test_bgra32(self, colorv1font):
+        atlas = hb.GlyphAtlas(256, 256, format=hb.RasterFormat.BGRA32)
+        entry = atlas.add(colorv1font, 10, size=64)
+        page = atlas.pages[0]
+        assert page.format is hb.RasterFormat.BGRA32
+        assert page.stride == 4 * 256
+        assert any(page.data[entry.y * page.stride : (entry.y + entry.height) * page.stride])
+
+    def test_add_glyphs(self, font, colorv1font):
+        atlas = hb.GlyphAtlas(256, 256)
+        entry = atlas.add(font, 1, size=32)
+        entries = atlas.add_glyphs(font, [1, 0, 1], size=32, threads=2)
+        assert entries[0] == entries[2] == entry
+        assert entries[1].page == -1
+        assert len(atlas) == 2
+
+        expected = hb.GlyphAtlas(256, 256, format=hb.RasterFormat.BGRA32)
+        atlas = hb.GlyphAtlas(256, 256, format=hb.RasterFormat.BGRA32)
+        glyphs = [10, 11, 12, 10]
+        entries = atlas.add_glyphs(colorv1font, glyphs, size=32, threads=3)
+        assert entries == [expected.add(colorv1font, gid, size=32) for gid in glyphs]
+        assert atlas.pages[0].data == expected.pages[0].data
+
+    def test_add_glyphs_eviction(self, colorv1font):
+        # One glyph per page
+        atlas = hb.GlyphAtlas(64, 64, format=hb.RasterFormat.BGRA32, max_pages=2)
+        first = atlas.add(colorv1font, 10, size=48)
+        atlas.add(colorv1font, 11, size=48)
+        entries = atlas.add_glyphs(colorv1font, [10, 12], size=48, threads=1)
+        assert entries[0] is first
+        assert entries[1].page == 1
+        # Packing 13 would evict a page holding an earlier glyph of the batch
+        with pytest.raises(ValueError):
+            atlas.add_glyphs(colorv1font, [10, 12, 13], size=48, threads=1)
+        assert atlas.add(colorv1font, 10, size=48) is first
+        assert [page.generation for page in atlas.pages] == [0, 1]
+        assert atlas.add(colorv1font, 13, size=48).page == 1
+
+
+class TestColorGlyphBitmapCache:
+    def test_get(self, colorv1font):
+        cache = hb.ColorGlyphBitmapCache()
+        paint = hb.RasterPaint()
+        paint.transform = (0.1, 0.0, 0.0, 0.1, 0.0, 0.0)
+        image = cache.get(paint, colorv1font, 10)
+        assert image.format is hb.RasterFormat.BGRA32
+        assert cache.get(paint, colorv1font, 10) is image
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        expected = paint.render()
+        assert image.extents == expected.extents
+        assert image.buffer == expected.buffer
+
+        paint.set_custom_palette_color(0, hb.Color(0, 255, 0, 255))
+        recolored = cache.get(paint, colorv1font, 10)
+        assert recolored is not image
+        assert recolored.buffer != image.buffer
+        paint.clear_custom_palette_colors()
+        assert cache.get(paint, colorv1font, 10) is image
+
+        paint.foreground = hb.Color(255, 0, 0, 255)
+        assert cache.get(paint, colorv1font, 10) is not image
+        assert len(cache) == 3
+
+        empty = cache.get(paint, colorv1font, 0)
+        assert empty.extents.width == empty.extents.height == 0
+
+    def test_render_buffer(self, colorv1font):
+        cache = hb.ColorGlyphBitmapCache()
+        paint = hb.RasterPaint()
+        paint.transform = (0.1, 0.0, 0.0, 0.1, 0.0, 0.0)
+        # Glyph 10 is 80 pixels wide and advances by 100 pixels
+        buf = shaped_buffer(colorv1font, "\U000F0102\U000F0102")
+        image = cache.render_buffer(paint, colorv1font, buf)
+        assert image.format is hb.RasterFormat.BGRA32
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 1
+        glyph = cache.get(paint, colorv1font, 10)
+        assert image.extents[:2] == glyph.extents[:2]
+        assert image.extents.height == glyph.extents.height
+        assert image.extents.width == 100 + glyph.extents.width
+        assert rows(image)[0][: glyph.extents.width * 4] == rows(glyph)[0]
+
+        image = cache.render_buffer(paint, colorv1font, hb.Buffer())
+        assert image.extents.width == image.extents.height == 0
+
+    def test_get_keeps_paint(self, colorv1font):
+        cache = hb.ColorGlyphBitmapCache()
+        paint = hb.RasterPaint()
+        paint.transform = (0.1, 0.0, 0.0, 0.1, 0.0, 0.0)
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        expected = paint.render()
+
+        paint.set_glyph_extents(colorv1font.get_glyph_extents(10))
+        paint.paint_glyph(colorv1font, 10)
+        cache.get(paint, colorv1font, 11)
+        cache.get(paint, colorv1font, 0)
+        image = paint.render()
+        assert image.extents == expected.extents
+        assert image.buffer == expected.buffer
+
+
+class TestGlyphBitmapCache:
+    def test_get(self, font):
+        cache = hb.GlyphBitmapCache(subpixel_positions=4)
+        assert cache.subpixel_positions == 4
+        image = cache.get(font, 1, size=100)
+        assert cache.get(font, 1, size=100) is image
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+        draw = hb.RasterDraw()
+        draw.transform = (100 / 2048, 0.0, 0.0, 100 / 2048, 0.25, 0.0)
+        draw.draw_glyph(font, 1)
+        shifted = cache.get(font, 1, size=100, phase=1)
+        assert shifted is not image
+        assert shifted.buffer == draw.render().buffer
+
+        font.synthetic_bold = 0.05
+        assert cache.get(font, 1, size=100) is not image
+        assert len(cache) == 3
+
+        with pytest.raises(ValueError):
+            cache.get(font, 1, phase=4)
+        with pytest.raises(ValueError):
+            hb.GlyphBitmapCache(subpixel_positions=0)
+
+    def test_render_buffer(self, font):
+        cache = hb.GlyphBitmapCache()
+        draw = hb.RasterDraw()
+        # 128 pixels per em puts the second glyph at a whole pixel
+        draw.transform = (1 / 16, 0.0, 0.0, 1 / 16, 0.0, 0.0)
+        buf = shaped_buffer(font, "AA")
+        expected = draw.render_buffer(font, buf)
+        image = cache.render_buffer(font, buf, size=128)
+        assert image.format is hb.RasterFormat.A8
+        assert image.extents[:4] == expected.extents[:4]
+        assert rows(image) == rows(expected)
+        assert cache.stats == hb.GlyphBitmapCacheStats(
+            hits=1,
+            misses=1,
+            evictions=0,
+            resident_bytes=cache.stats.resident_bytes,
+        )
+
+        # 1296 / 2048 * 100 = 63.28 pixels per advance: glyphs start at
+        # phases 0, 1, 2 and 3
+        image = cache.render_buffer(font, shaped_buffer(font, "AAAA"), size=100)
+        assert image.extents.width == 254
+        assert cache.stats.misses == 1 + 4
+
+        image = cache.render_buffer(font, hb.Buffer())
+        assert image.extents.width == image.extents.height == 0
+
+
+def get_glyph_bitmap(cache, font, i):
+    return cache.get(font, 1, size=64, phase=i)
+
+
+def get_color_glyph_bitmap(cache, font, i):
+    paint = hb.RasterPaint()
+    paint.transform = (0.1, 0.0, 0.0, 0.1, 0.0, 0.0)
+    return cache.get(paint, font, 10 + i)
+
+
+@pytest.mark.parametrize(
+    "cache_type, font_name, get",
+    [
+        (hb.GlyphBitmapCache, "font", get_glyph_bitmap),
+        (hb.ColorGlyphBitmapCache, "colorv1font", get_color_glyph_bitmap),
+    ],
+)
+def test_bitmap_cache_eviction(request, cache_type, font_name, get):
+    font = request.getfixturevalue(font_name)
+    cache = cache_type()
+    for i in range(3):
+        get(cache, font, i)
+    cache.max_bytes = cache.stats.resident_bytes - 1
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    # The least recently used bitmap was evicted
+    get(cache, font, 2)
+    assert cache.stats.hits == 1
+    get(cache, font, 0)
+    assert cache.stats.misses == 4
+    cache.max_bytes = 0
+    assert len(cache) == 0
+    assert cache.stats.resident_bytes == 0
+    with pytest.raises(ValueError):
+        cache.max_bytes = -1
+    with pytest.raises(ValueError):
+        cache_type(max_bytes=-1)
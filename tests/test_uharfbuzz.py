@@ -1,7 +1,11 @@
 import uharfbuzz as hb
 from pathlib import Path
 import sys
+import os
+import pickle
 import platform
+import struct
+import subprocess
 import pytest
 
 
@@ -15,6 +19,26 @@ COLORv0_FONT_TTF_PATH = TESTDATA / "chromacheck-colr.ttf"
 COLORv1_FONT_TTF_PATH = TESTDATA / "test_glyphs-glyf_colr_1.ttf"
 
 
+class RecordingPen:
+    def __init__(self):
+        self.value = []
+
+    def moveTo(self, p0):
+        self.value.append(("moveTo", (p0,)))
+
+    def lineTo(self, p1):
+        self.value.append(("lineTo", (p1,)))
+
+    def qCurveTo(self, *points):
+        self.value.append(("qCurveTo", points))
+
+    def curveTo(self, *points):
+        self.value.append(("curveTo", points))
+
+    def closePath(self):
+        self.value.append(("closePath", ()))
+
+
 @pytest.fixture
 def blankfont():
     """Return a subset of AdobeBlank.ttf containing the following glyphs/characters:
@@ -91,6 +115,58 @@ def colorv1font():
     return font
 
 
+def callback_font(font):
+    """Returns a font whose face loads the tables of ``font`` through a
+    Python callback."""
+    source = font.face
+
+    def reference_table(face, tag, user_data):
+        return source.reference_table(tag).data
+
+    return hb.Font(hb.Face.create_for_tables(reference_table, None))
+
+
+def shaped_buffer(font, text):
+    buf = hb.Buffer()
+    buf.add_str(text)
+    buf.guess_segment_properties()
+    hb.shape(font, buf)
+    return buf
+
+
+def make_collection(*paths):
+    """Packs the given sfnt files into a TrueType collection."""
+    fonts = [path.read_bytes() for path in paths]
+    header_size = 12 + 4 * len(fonts)
+    directory_sizes = [12 + 16 * struct.unpack(">H", f[4:6])[0] for f in fonts]
+    offset = header_size + sum(directory_sizes)
+    header = struct.pack(">4sHHI", b"ttcf", 1, 0, len(fonts))
+    directories = b""
+    tables = b""
+    directory_offset = header_size
+    for font, directory_size in zip(fonts, directory_sizes):
+        header += struct.pack(">I", directory_offset)
+        directory_offset += directory_size
+        num_tables = struct.unpack(">H", font[4:6])[0]
+        directories += font[:12]
+        for i in range(num_tables):
+            tag, checksum, table_offset, length = struct.unpack(
+                ">4sIII", font[12 + 16 * i : 28 + 16 * i])
+            directories += struct.pack(
+                ">4sIII", tag, checksum, offset + len(tables), length)
+            tables += font[table_offset : table_offset + length]
+            tables += b"\0" * (-len(tables) % 4)
+    return header + directories + tables
+
+
+@pytest.fixture
+def collection_path(tmp_path):
+    path = tmp_path / "collection.ttc"
+    path.write_bytes(make_collection(
+        OPEN_SANS_TTF_PATH, ADOBE_BLANK_TTF_PATH, MUTATOR_SANS_TTF_PATH))
+    return path
+
+
 class TestBuffer:
     def test_init(self):
         buf = hb.Buffer()
@@ -300,6 +376,28 @@ class TestBlob:
         with pytest.raises(hb.HarfBuzzError, match="Failed to open: DOES-NOT-EXIST"):
             blob = hb.Blob.from_file_path("DOES-NOT-EXIST")
 
+    def test_data_view(self):
+        blob = hb.Blob.from_file_path(ADOBE_BLANK_TTF_PATH)
+        view = blob.data_view
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert view.format == "B"
+        assert view == blob.data
+        # the view keeps the blob alive
+        data = blob.data
+        del blob
+        assert view.tobytes() == data
+        assert view[4:8] == data[4:8]
+
+    def test_data_view_empty(self):
+        assert hb.Blob().data_view == b""
+
+    def test_reference_table_data_view(self, blankfont):
+        face = blankfont.face
+        head = face.reference_table("head").data_view
+        assert len(head) == 54
+        assert head == face.reference_table("head").data
+
 
 class TestFace:
     def test_create_deprecated(self, blankfont):
@@ -319,6 +417,76 @@ class TestFace:
         face.set_get_table_tags_func(get_table_tags)
         assert face.table_tags == expected
 
+    def test_create_for_tables_keeps_data_alive(self, opensans):
+        source = opensans.face
+
+        def reference_table(face, tag, user_data):
+            return source.reference_table(tag).data
+
+        face = hb.Face.create_for_tables(reference_table, None)
+        font = hb.Font(face)
+        buf = hb.Buffer()
+        buf.add_str("AAA")
+        buf.guess_segment_properties()
+        hb.shape(font, buf)
+        assert [g.codepoint for g in buf.glyph_infos] == [1, 1, 1]
+
+    def test_create_for_table_data(self, opensans):
+        source = opensans.face
+        tables = {tag: source.reference_table(tag) for tag in source.table_tags}
+        tables["head"] = tables["head"].data
+        face = hb.Face.create_for_table_data(tables)
+        assert face.table_tags == source.table_tags
+        assert face.upem == source.upem
+        assert face.glyph_count == source.glyph_count
+        assert face.reference_table("head").data == tables["head"]
+        assert face.reference_table("cmap").data == tables["cmap"].data
+        assert face.reference_table("XXXX").data == b""
+
+        with pytest.raises(ValueError):
+            hb.Face.create_for_table_data(tables, ["head"])
+
+    @pytest.mark.parametrize("tags", [None, ["head", "cmap", "maxp", "hmtx", "hhea"]])
+    def test_create_for_table_data_loader(self, opensans, tags):
+        source = opensans.face
+        calls = []
+
+        def loader(tag):
+            calls.append(tag)
+            if tag not in source.table_tags:
+                return None
+            return bytearray(source.reference_table(tag).data)
+
+        face = hb.Face.create_for_table_data(loader, tags)
+        assert face.table_tags == (tags or [])
+        for _ in range(3):
+            assert face.upem == source.upem
+            assert face.reference_table("head").data == source.reference_table("head").data
+            assert face.reference_table("XXXX").data == b""
+        assert calls.count("head") == 1
+        assert "XXXX" in calls if tags is None else "XXXX" not in calls
+        assert len(calls) == len(set(calls))
+
+        font = hb.Font(face)
+        assert font.get_nominal_glyph(ord("A")) == 1
+
+    @pytest.mark.parametrize("tags", [None, ["name"]])
+    def test_create_for_table_data_loader_error(self, monkeypatch, tags):
+        calls = []
+        errors = []
+
+        def loader(tag):
+            calls.append(tag)
+            raise KeyError(tag)
+
+        monkeypatch.setattr(sys, "unraisablehook", errors.append)
+        face = hb.Face.create_for_table_data(loader, tags)
+        for _ in range(3):
+            assert face.reference_table("name").data == b""
+        assert calls == ["name"]
+        assert len(errors) == 1
+        assert isinstance(errors[0].exc_value, KeyError)
+
     def test_properties(self, blankfont):
         face = blankfont.face
 
@@ -902,6 +1070,39 @@ class TestFont:
         assert -1468 == extents.height
         assert opensans.get_glyph_extents(1000) is None
 
+    def test_get_buffer_extents(self, opensans):
+        buf = hb.Buffer()
+        buf.add_str("AA")
+        buf.guess_segment_properties()
+        hb.shape(opensans, buf)
+        assert opensans.get_buffer_extents(buf) == (0, 1468, 2592, -1468)
+        assert opensans.get_buffer_extents(buf, exact=True) == (0, 1468, 2592, -1468)
+        assert opensans.get_buffer_cluster_extents(buf) == {
+            0: (0, 1468, 1296, -1468),
+            1: (1296, 1468, 1296, -1468),
+        }
+        assert opensans.get_buffer_extents(hb.Buffer()) == (0, 0, 0, 0)
+        assert opensans.get_buffer_cluster_extents(hb.Buffer()) == {}
+
+        buf = hb.Buffer()
+        buf.add_str("A")
+        with pytest.raises(ValueError):
+            opensans.get_buffer_extents(buf)
+
+    def test_get_buffer_extents_exact(self):
+        face = hb.Face(hb.Blob.from_file_path(TESTDATA / "noto_handwriting-cff2_colr_1.otf"))
+        font = hb.Font(face)
+        buf = hb.Buffer()
+        buf.add_codepoints([13, 1])
+        buf.content_type = hb.BufferContentType.GLYPHS
+        # Glyph 13 has cubic curves whose control points lie outside the ink.
+        assert font.get_buffer_extents(buf) == (76, 577, 1124, -717)
+        assert font.get_buffer_extents(buf, exact=True) == (87, 571, 1113, -697)
+        assert font.get_buffer_cluster_extents(buf, exact=True) == {
+            0: (87, 571, 1113, -697),
+            1: (0, 0, 0, 0),
+        }
+
     def test_get_font_extents(self, blankfont):
         extents = blankfont.get_font_extents("ltr")
         assert (880, -120, 0) == extents
@@ -952,6 +1153,53 @@ class TestFont:
         with pytest.raises(TypeError):
             mutatorsans.set_var_coords_normalized(["a"])
 
+    def test_variation_instance_cache(self, mutatorsans):
+        mutatorsans.scale = (100, 100)
+        cache = hb.VariationInstanceCache(mutatorsans, maxsize=2)
+        assert cache.font is mutatorsans
+        assert cache.maxsize == 2
+
+        bold = cache.get({"wght": 500})
+        assert bold.get_var_coords_normalized() == [0, 0.5]
+        assert bold.scale == (100, 100)
+        mutatorsans.set_variations({"wght": 500})
+        expected = mutatorsans.get_glyph_h_advance(1)
+        mutatorsans.set_variations({})
+        assert bold.get_glyph_h_advance(1) == expected
+        assert mutatorsans.get_glyph_h_advance(1) != expected
+        assert cache.get({"wght": 500, "wdth": 0}) is bold
+        assert cache.get_normalized([0, 0.5]) is bold
+        assert mutatorsans.get_var_coords_normalized() == [0, 0]
+
+        default = cache.get()
+        assert default.get_var_coords_normalized() == [0, 0]
+        assert cache.get_normalized([]) is default
+        assert len(cache) == 2
+
+        wide = cache.get_normalized([1.0])
+        assert wide.get_var_coords_normalized() == [1.0, 0]
+        assert len(cache) == 2
+        assert cache.get() is default
+        assert cache.get({"wght": 500}) is not bold
+
+        cache.clear()
+        assert len(cache) == 0
+
+        with pytest.raises(ValueError):
+            cache.get_normalized([0, 0, 0])
+        with pytest.raises(ValueError):
+            hb.VariationInstanceCache(mutatorsans.face, maxsize=0)
+
+    def test_face_variation_instances(self, mutatorsans):
+        face = mutatorsans.face
+        cache = face.variation_instances
+        assert face.variation_instances is cache
+        assert cache.font.face is face
+        assert cache.font.scale == (face.upem, face.upem)
+        bold = cache.get({"wght": 500})
+        assert bold.get_var_coords_normalized() == [0, 0.5]
+        assert face.variation_instances.get_normalized([0, 0.5]) is bold
+
     def test_properties(self, blankfont):
         assert blankfont.scale == (1000, 1000)
         blankfont.scale = (1024, 1024)
@@ -1167,6 +1415,77 @@ class TestFontFuncs:
             hb.FontFuncs.create()
 
 
+class TestVariationSweep:
+    @pytest.fixture
+    def buffer(self):
+        buf = hb.Buffer()
+        buf.add_str("AAA")
+        buf.guess_segment_properties()
+        return buf
+
+    @staticmethod
+    def shaped_advance(font, text, variations):
+        font.set_variations(variations)
+        buf = hb.Buffer()
+        buf.add_str(text)
+        buf.guess_segment_properties()
+        hb.shape(font, buf)
+        font.set_variations({})
+        return sum(pos.x_advance for pos in buf.glyph_positions)
+
+    def test_measure_variations(self, mutatorsans, buffer):
+        locations = [{}, {"wght": 1000}, {"wdth": 500, "wght": 500}]
+        advances = hb.measure_variations(mutatorsans, buffer, locations)
+        assert advances == [
+            self.shaped_advance(mutatorsans, "AAA", location)
+            for location in locations
+        ]
+        assert advances[0] < advances[1]
+        # neither the font nor the buffer are modified
+        assert mutatorsans.get_var_coords_normalized() == [0, 0]
+        assert buffer.content_type == hb.BufferContentType.UNICODE
+        assert len(buffer.glyph_infos) == 3
+
+    def test_measure_variations_iterator(self, mutatorsans, buffer):
+        locations = [{}, {"wght": 1000}]
+        assert hb.measure_variations(
+            mutatorsans, buffer, (location for location in locations)
+        ) == hb.measure_variations(mutatorsans, buffer, locations)
+
+    def test_measure_variations_grid(self, mutatorsans, buffer):
+        grid = hb.measure_variations(
+            mutatorsans, buffer, {"wdth": [0, 1000], "wght": [0, 500, 1000]})
+        assert grid == hb.measure_variations(mutatorsans, buffer, [
+            {"wdth": wdth, "wght": wght}
+            for wdth in (0, 1000) for wght in (0, 500, 1000)
+        ])
+
+    def test_measure_variations_features(self, mutatorsans, buffer):
+        assert hb.measure_variations(
+            mutatorsans, buffer, [{}], features={"kern": False}) == [1188]
+
+    def test_measure_variations_shaped_buffer(self, mutatorsans, buffer):
+        hb.shape(mutatorsans, buffer)
+        with pytest.raises(ValueError):
+            hb.measure_variations(mutatorsans, buffer, [{}])
+
+    def test_fit_variation(self, mutatorsans, buffer):
+        value = hb.fit_variation(mutatorsans, buffer, "wdth", 3000)
+        assert 0 < value < 1000
+        assert self.shaped_advance(mutatorsans, "AAA", {"wdth": value}) <= 3000
+        assert self.shaped_advance(mutatorsans, "AAA", {"wdth": value + 1}) > 3000
+
+        assert hb.fit_variation(mutatorsans, buffer, "wdth", 10000) == 1000
+        assert hb.fit_variation(mutatorsans, buffer, "wdth", 1000) is None
+        assert hb.fit_variation(
+            mutatorsans, buffer, "wdth", 3000, max_value=500) == 500
+        assert hb.fit_variation(
+            mutatorsans, buffer, "wdth", 2000, variations={"wght": 1000}) is None
+
+        with pytest.raises(ValueError):
+            hb.fit_variation(mutatorsans, buffer, "XXXX", 3000)
+
+
 class TestCallbacks:
     def test_nominal_glyph_func(self, blankfont):
         string = "abcde"
@@ -1475,6 +1794,288 @@ class TestCallbacks:
             ("closePath", ()),
         ]
 
+    def test_glyph_outline(self, opensans):
+        outline = opensans.get_glyph_outline(1)
+        assert len(outline) == 17
+        assert outline.verbs.format == "B"
+        assert outline.verbs.readonly
+        assert list(outline.verbs[:3]) == [
+            hb.OutlineVerb.MOVE_TO, hb.OutlineVerb.LINE_TO, hb.OutlineVerb.LINE_TO]
+        assert outline.verbs[-1] == hb.OutlineVerb.CLOSE_PATH
+        assert outline.coords.format == "f"
+        assert len(outline.coords) == 2 * 13 + 4 * 2
+        assert list(outline.coords[:4]) == [1120, 0, 938, 465]
+
+        pen = RecordingPen()
+        outline.replay(pen)
+        assert pen.value == OPEN_SANS_GLYPH_1_PATH
+
+    def test_glyph_outline_cubic(self):
+        face = hb.Face(hb.Blob.from_file_path(TESTDATA / "noto_handwriting-cff2_colr_1.otf"))
+        font = hb.Font(face)
+        gid = 13
+        outline = font.get_glyph_outline(gid)
+        assert hb.OutlineVerb.CUBIC_TO in list(outline.verbs)
+        expected = RecordingPen()
+        font.draw_glyph_with_pen(gid, expected)
+        pen = RecordingPen()
+        outline.replay(pen)
+        assert pen.value == expected.value
+
+    def test_glyph_outline_empty(self, opensans):
+        outline = opensans.get_glyph_outline(0)
+        assert len(outline) == 0
+        assert bytes(outline.verbs) == b""
+        assert len(outline.coords) == 0
+
+    def test_glyph_outline_cache(self, mutatorsans):
+        assert mutatorsans.outline_cache_max_bytes == 0
+        assert mutatorsans.get_glyph_outline(1) is not mutatorsans.get_glyph_outline(1)
+        assert mutatorsans.outline_cache_stats == (0, 0, 0, 0)
+
+        mutatorsans.outline_cache_max_bytes = 1 << 20
+        outline = mutatorsans.get_glyph_outline(1)
+        assert mutatorsans.get_glyph_outline(1) is outline
+        stats = mutatorsans.outline_cache_stats
+        assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 0)
+        assert stats.resident_bytes > 0
+
+        mutatorsans.set_variations({"wght": 1000})
+        bold = mutatorsans.get_glyph_outline(1)
+        assert bytes(bold.coords) != bytes(outline.coords)
+        mutatorsans.synthetic_slant = 0.2
+        slanted = mutatorsans.get_glyph_outline(1)
+        assert bytes(slanted.coords) != bytes(bold.coords)
+        mutatorsans.synthetic_slant = 0
+        mutatorsans.set_variations({"wght": 0})
+        assert mutatorsans.get_glyph_outline(1) is outline
+
+        mutatorsans.clear_outline_cache()
+        assert mutatorsans.outline_cache_stats.resident_bytes == 0
+        assert mutatorsans.get_glyph_outline(1) is not outline
+
+    def test_glyph_outline_cache_eviction(self, mutatorsans):
+        mutatorsans.outline_cache_max_bytes = 1 << 20
+        first = mutatorsans.get_glyph_outline(1)
+        first_size = mutatorsans.outline_cache_stats.resident_bytes
+        second = mutatorsans.get_glyph_outline(2)
+        size = mutatorsans.outline_cache_stats.resident_bytes
+        mutatorsans.outline_cache_max_bytes = size - 1
+        stats = mutatorsans.outline_cache_stats
+        assert stats.evictions == 1
+        assert stats.resident_bytes == size - first_size
+        assert mutatorsans.get_glyph_outline(2) is second
+        assert mutatorsans.get_glyph_outline(1) is not first
+        with pytest.raises(ValueError):
+            mutatorsans.outline_cache_max_bytes = -1
+        mutatorsans.outline_cache_max_bytes = 0
+        assert mutatorsans.outline_cache_stats == (0, 0, 0, 0)
+
+    def test_glyph_outline_cache_sub_font(self, mutatorsans):
+        sub_font = hb.Font(mutatorsans)
+        sub_font.outline_cache_max_bytes = 1 << 20
+        outline = sub_font.get_glyph_outline(1)
+        mutatorsans.set_variations({"wght": 1000})
+        assert bytes(sub_font.get_glyph_outline(1).coords) != bytes(outline.coords)
+
+    def test_draw_buffer(self, opensans):
+        buf = hb.Buffer()
+        buf.add_str("AA")
+        buf.guess_segment_properties()
+        hb.shape(opensans, buf)
+        advance = buf.glyph_positions[0].x_advance
+
+        outline = hb.draw_buffer(opensans, buf)
+        assert len(outline) == 2 * len(opensans.get_glyph_outline(1))
+        pen = RecordingPen()
+        outline.replay(pen)
+        assert pen.value[: len(OPEN_SANS_GLYPH_1_PATH)] == OPEN_SANS_GLYPH_1_PATH
+        assert pen.value[len(OPEN_SANS_GLYPH_1_PATH)] == (
+            "moveTo",
+            ((1120 + advance, 0),),
+        )
+
+        outline = hb.draw_buffer(opensans, buf, transform=(0.5, 0, 0, -0.5, 10, 20))
+        pen = RecordingPen()
+        outline.replay(pen)
+        assert pen.value[:2] == [
+            ("moveTo", ((570, 20),)),
+            ("lineTo", ((479, 20 - 465 / 2),)),
+        ]
+        assert pen.value[len(OPEN_SANS_GLYPH_1_PATH)] == (
+            "moveTo",
+            ((10 + (1120 + advance) / 2, 20),),
+        )
+
+        assert len(hb.draw_buffer(opensans, hb.Buffer())) == 0
+        buf = hb.Buffer()
+        buf.add_str("A")
+        with pytest.raises(ValueError):
+            hb.draw_buffer(opensans, buf)
+
+    def test_draw_buffer_draw_funcs(self, opensans):
+        buf = hb.Buffer()
+        buf.add_str("AA")
+        buf.guess_segment_properties()
+        hb.shape(opensans, buf)
+        funcs = hb.DrawFuncs()
+        container = []
+        funcs.set_move_to_func(lambda x, y, c: c.append(f"M{x:g} {y:g}"))
+        funcs.set_line_to_func(lambda x, y, c: c.append(f"L{x:g} {y:g}"))
+        funcs.set_quadratic_to_func(
+            lambda c1x, c1y, x, y, c: c.append(f"Q{c1x:g} {c1y:g} {x:g} {y:g}")
+        )
+        funcs.set_close_path_func(lambda c: c.append("Z"))
+        assert hb.draw_buffer(opensans, buf, funcs, container) is None
+        assert "".join(container) == opensans.buffer_to_svg_path(buf)
+
+    def test_glyph_to_svg_path(self, opensans):
+        assert opensans.glyph_to_svg_path(1) == OPEN_SANS_GLYPH_1_SVG_PATH
+        assert opensans.glyph_to_svg_path(1, relative=True) == (
+            "m1120 0l-182 465l-586 0l-180 -465l-172 0l578 1468l143 0"
+            "l575 -1468l-176 0zm-235 618l-170 453q-33 86 -68 211"
+            "q-22 -96 -63 -211l-172 -453l473 0z"
+        )
+        assert opensans.glyph_to_svg_path(0) == ""
+        with pytest.raises(ValueError):
+            opensans.glyph_to_svg_path(1, precision=-1)
+
+    @pytest.mark.parametrize(
+        "font_name, call",
+        [
+            pytest.param(
+                "opensans",
+                lambda font: font.glyph_to_svg_path(1),
+                id="glyph_to_svg_path",
+            ),
+            pytest.param(
+                "opensans",
+                lambda font: font.buffer_to_svg_path(shaped_buffer(font, "AA")),
+                id="buffer_to_svg_path",
+            ),
+            pytest.param(
+                "opensans",
+                lambda font: bytes(
+                    hb.draw_buffer(font, shaped_buffer(font, "AA")).coords
+                ),
+                id="draw_buffer",
+            ),
+            pytest.param(
+                "opensans",
+                lambda font: font.get_buffer_extents(shaped_buffer(font, "AA")),
+                id="get_buffer_extents",
+            ),
+            pytest.param(
+                "opensans",
+                lambda font: font.get_buffer_extents(
+                    shaped_buffer(font, "AA"), exact=True
+                ),
+                id="get_buffer_extents_exact",
+            ),
+            pytest.param(
+                "opensans",
+                lambda font: font.get_buffer_cluster_extents(
+                    shaped_buffer(font, "AA")
+                ),
+                id="get_buffer_cluster_extents",
+            ),
+            pytest.param(
+                "colorv1font",
+                lambda font: list(font.get_glyph_paint(10)),
+                id="get_glyph_paint",
+            ),
+            pytest.param(
+                "colorv1font",
+                lambda font: font.paint_glyph_to_svg(10),
+                id="paint_glyph_to_svg",
+            ),
+            pytest.param(
+                "colorv1font",
+                lambda font: font.paint_glyphs_to_svg([10, 12]),
+                id="paint_glyphs_to_svg",
+            ),
+        ],
+    )
+    def test_nogil_callback_face(self, request, font_name, call):
+        # Fonts whose tables are loaded through Python keep the GIL
+        font = request.getfixturevalue(font_name)
+        assert call(callback_font(font)) == call(font)
+
+    def test_svg_path_font_changes(self, opensans):
+        # The private copy drawn on without the GIL follows the font
+        path = opensans.glyph_to_svg_path(1)
+        opensans.scale = (1024, 1024)
+        assert opensans.glyph_to_svg_path(1) != path
+        font = hb.Font(opensans.face)
+        font.scale = (1024, 1024)
+        assert opensans.glyph_to_svg_path(1) == font.glyph_to_svg_path(1)
+
+    def test_svg_path_threads(self, opensans):
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Threads that find the private copy in use draw with the GIL held
+        with ThreadPoolExecutor(4) as executor:
+            paths = list(executor.map(opensans.glyph_to_svg_path, [1] * 64))
+        assert paths == [OPEN_SANS_GLYPH_1_SVG_PATH] * 64
+
+    def test_glyph_to_svg_path_precision(self, opensans):
+        opensans.synthetic_slant = 0.2
+        path = opensans.glyph_to_svg_path(1, precision=1)
+        assert path.startswith("M1120 0L1031 465L445 465L172 0")
+        assert opensans.glyph_to_svg_path(1, precision=0).startswith(
+            "M1120 0L1031 465L445 465L172 0"
+        )
+
+    def test_buffer_to_svg_path(self, opensans):
+        buf = hb.Buffer()
+        buf.add_str("AA")
+        buf.guess_segment_properties()
+        hb.shape(opensans, buf)
+        advance = buf.glyph_positions[0].x_advance
+        path = opensans.buffer_to_svg_path(buf, precision=0)
+        assert path.startswith(OPEN_SANS_GLYPH_1_SVG_PATH)
+        assert path[len(OPEN_SANS_GLYPH_1_SVG_PATH):].startswith(
+            f"M{1120 + advance} 0L{938 + advance} 465"
+        )
+
+        relative = opensans.buffer_to_svg_path(buf, relative=True)
+        glyph = opensans.glyph_to_svg_path(1, relative=True)
+        # Relative to the start of the last contour of the first glyph.
+        move = f"m{1120 + advance - 885} -618"
+        assert relative == glyph + move + glyph[len("m1120 0"):]
+
+        buf = hb.Buffer()
+        buf.add_str("A")
+        with pytest.raises(ValueError):
+            opensans.buffer_to_svg_path(buf)
+        assert opensans.buffer_to_svg_path(hb.Buffer()) == ""
+
+
+OPEN_SANS_GLYPH_1_SVG_PATH = (
+    "M1120 0L938 465L352 465L172 0L0 0L578 1468L721 1468L1296 0L1120 0Z"
+    "M885 618L715 1071Q682 1157 647 1282Q625 1186 584 1071L412 618L885 618Z"
+)
+
+OPEN_SANS_GLYPH_1_PATH = [
+    ("moveTo", ((1120, 0),)),
+    ("lineTo", ((938, 465),)),
+    ("lineTo", ((352, 465),)),
+    ("lineTo", ((172, 0),)),
+    ("lineTo", ((0, 0),)),
+    ("lineTo", ((578, 1468),)),
+    ("lineTo", ((721, 1468),)),
+    ("lineTo", ((1296, 0),)),
+    ("lineTo", ((1120, 0),)),
+    ("closePath", ()),
+    ("moveTo", ((885, 618),)),
+    ("lineTo", ((715, 1071),)),
+    ("qCurveTo", ((682, 1157), (647, 1282))),
+    ("qCurveTo", ((625, 1186), (584, 1071))),
+    ("lineTo", ((412, 618),)),
+    ("lineTo", ((885, 618),)),
+    ("closePath", ()),
+]
+
 
 class TestPaintFuncs:
     @staticmethod
@@ -1631,6 +2232,98 @@ class TestPaintFuncs:
 
         assert result.strip() == expected.strip()
 
+    @pytest.mark.parametrize(
+        "fontpath, glyph, expectedpath",
+        [
+            ("noto_handwriting-cff2_colr_1.otf", 10, "hand-10"),
+            ("test_glyphs-glyf_colr_1.ttf", 10, "test-10"),
+            ("test_glyphs-glyf_colr_1.ttf", 106, "test-106"),
+            ("test_glyphs-glyf_colr_1.ttf", 154, "test-154"),
+            ("test_glyphs-glyf_colr_1.ttf", 175, "test-175"),
+        ],
+    )
+    def test_glyph_paint_replay(self, fontpath, glyph, expectedpath):
+        blob = hb.Blob.from_file_path(TESTDATA / fontpath)
+        face = hb.Face(blob)
+        font = hb.Font(face)
+
+        paint = font.get_glyph_paint(glyph)
+        assert paint.font is font
+        funcs, container = self.setup_funcs()
+        paint.replay(funcs, container)
+        result = container.value()
+
+        # Nested color glyphs are recorded inline
+        with open(TESTDATA / "expected" / expectedpath) as f:
+            expected = "".join(
+                line
+                for line in f.readlines()
+                if line[0] != "#" and "paint color glyph" not in line
+            )
+
+        assert result.strip() == expected.strip()
+
+    def test_glyph_paint_ops(self):
+        blob = hb.Blob.from_file_path(TESTDATA / "test_glyphs-glyf_colr_1.ttf")
+        face = hb.Face(blob)
+        font = hb.Font(face)
+
+        paint = font.get_glyph_paint(10)
+        ops = list(paint)
+        assert len(paint) == len(ops) == 11
+        assert list(paint.ops) == [op.op for op in ops]
+        assert ops[1] == (
+            hb.PaintOp.PUSH_CLIP_RECTANGLE,
+            (100.0, 250.0, 900.0, 950.0),
+        )
+        assert ops[3] == (hb.PaintOp.PUSH_CLIP_GLYPH, (10,))
+        op, (stops, extend, *points) = ops[5]
+        assert op == hb.PaintOp.LINEAR_GRADIENT
+        assert stops == [
+            hb.ColorStop(0.0, False, hb.Color(255, 0, 0, 255)),
+            hb.ColorStop(1.5, False, hb.Color(0, 0, 255, 255)),
+        ]
+        assert extend == hb.PaintExtend.REPEAT
+        assert points == [100.0, 250.0, 900.0, 250.0, 100.0, 300.0]
+        assert len(paint.params) == 3 * 6 + 4 + 6
+        assert list(paint.int_params) == [10, int(hb.PaintExtend.REPEAT), 0, 2]
+
+        # Glyphs without color paint fall back to the foreground color
+        paint = font.get_glyph_paint(6, foreground=hb.Color(1, 2, 3, 255))
+        assert list(paint) == [
+            (hb.PaintOp.FILL_GLYPH, (6, hb.Color(1, 2, 3, 255), True)),
+        ]
+
+    def test_paint_glyph_to_svg(self):
+        from xml.dom import minidom
+
+        blob = hb.Blob.from_file_path(TESTDATA / "test_glyphs-glyf_colr_1.ttf")
+        face = hb.Face(blob)
+        font = hb.Font(face)
+
+        svg = font.paint_glyph_to_svg(6, foreground=hb.Color(1, 2, 3, 255))
+        assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg"')
+        assert 'viewBox="200 -770 600 520"' in svg
+        assert '<path d="M200 250L500 770L800 250L200 250Z" fill="#010203"/>' in svg
+
+        svg = font.paint_glyph_to_svg(10)
+        assert '<clipPath id="g10">' in svg
+        assert 'spreadMethod="repeat"' in svg
+        assert '<stop offset="1" stop-color="#0000ff"/>' in svg
+        assert 'fill="url(#gr0)"' in svg
+
+        # Sweep gradients are approximated with wedges
+        assert "A32767" in font.paint_glyph_to_svg(12)
+
+        glyphs = range(face.glyph_count)
+        svgs = font.paint_glyphs_to_svg(glyphs, precision=1)
+        assert svgs == [font.paint_glyph_to_svg(gid, precision=1) for gid in glyphs]
+        for svg in svgs:
+            minidom.parseString(svg)
+
+        with pytest.raises(ValueError):
+            font.paint_glyph_to_svg(6, precision=17)
+
     def test_fill_glyph_fallback(self):
         blob = hb.Blob.from_file_path(TESTDATA / "test_glyphs-glyf_colr_1.ttf")
         face = hb.Face(blob)
@@ -1876,6 +2569,412 @@ class TestSubsetInput:
             assert new_info.default_value == def_value
             assert (expected_min, expected_max, def_value) == inp.get_axis_range(axis)
 
+    def test_subset_to_bytes(self, blankfont, tmp_path):
+        inp = hb.SubsetInput()
+        inp.unicode_set.update([ord("b"), ord("c")])
+        expected = hb.subset(blankfont.face, inp).blob.data
+
+        view = hb.subset_to_bytes(blankfont.face, inp)
+        assert isinstance(view, memoryview) and view.readonly
+        assert view == expected
+        assert hb.SubsetPlan(blankfont.face, inp).execute_to_bytes() == expected
+
+        buf = bytearray(len(expected) + 10)
+        assert hb.subset_to_bytes(blankfont.face, inp, buf) == len(expected)
+        assert buf[: len(expected)] == expected
+        with pytest.raises(ValueError):
+            hb.subset_to_bytes(blankfont.face, inp, bytearray(10))
+
+        path = tmp_path / "subset.ttf"
+        with open(path, "wb") as f:
+            plan = hb.SubsetPlan(blankfont.face, inp)
+            assert plan.execute_to_bytes(f) == len(expected)
+        assert path.read_bytes() == expected
+
+    def test_subset_batch(self, blankfont, mutatorsans):
+        face = blankfont.face
+        inp = hb.SubsetInput()
+        inp.unicode_set.add(ord("a"))
+        inp.flags = hb.SubsetFlags.NO_HINTING
+        unicodes = [[ord("b")], hb.Set({ord("c"), ord("d")}), []] * 4
+        results = hb.subset_batch(face, inp, unicodes, threads=3)
+        preprocessed = hb.subset_preprocess(face)
+        assert hb.subset_batch(preprocessed, inp, unicodes, threads=2) == results
+        assert len(results) == len(unicodes)
+        for data, chars in zip(results, unicodes):
+            expected = hb.SubsetInput()
+            expected.unicode_set.add(ord("a"))
+            expected.unicode_set.update(chars)
+            expected.flags = hb.SubsetFlags.NO_HINTING
+            assert data == hb.subset(face, expected).blob.data
+        # The base input is not modified
+        assert set(inp.unicode_set) == {ord("a")}
+
+        results = hb.subset_batch(face, inp, glyphs=[[2], [3]])
+        font = hb.Font(hb.Face(results[1]))
+        assert font.get_nominal_glyph(ord("c")) == 2
+        assert font.get_nominal_glyph(ord("b")) is None
+
+        # Axis ranges are carried over
+        inp = hb.SubsetInput()
+        inp.keep_everything()
+        inp.pin_axis_location(mutatorsans.face, "wght", 500)
+        (data,) = hb.subset_batch(mutatorsans.face, inp, [[ord("A")]])
+        assert data == hb.subset(mutatorsans.face, inp).blob.data
+        assert not [a for a in hb.Face(data).axis_infos if a.tag == "wght"]
+
+        assert hb.subset_batch(face, inp, []) == []
+        with pytest.raises(ValueError):
+            hb.subset_batch(face, inp)
+        with pytest.raises(ValueError):
+            hb.subset_batch(face, inp, [[1]], [[1], [2]])
+        with pytest.raises(ValueError):
+            hb.subset_batch(face, inp, [[1]], threads=0)
+        with pytest.raises(ValueError):
+            hb.subset_batch(callback_font(blankfont).face, inp, [[1]])
+
+    def test_subset_batch_reuse(self, blankfont):
+        face = blankfont.face
+        inp = hb.SubsetInput()
+        inp.unicode_set.add(ord("a"))
+        batch = hb.SubsetBatch(face, threads=2)
+        assert batch.face is face
+        assert batch.threads == 2
+        unicodes = [[ord("b")], [ord("c")], [ord("d")]]
+        results = batch.subset(inp, unicodes)
+        assert results == hb.subset_batch(face, inp, unicodes, threads=1)
+        assert batch.subset(inp, unicodes[:1]) == results[:1]
+        assert batch.subset(inp, glyphs=[[2], [3]]) == hb.subset_batch(
+            face, inp, glyphs=[[2], [3]]
+        )
+        assert batch.subset(inp, []) == []
+
+        # Concurrent calls run one after the other
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(4) as executor:
+            for data in executor.map(lambda _: batch.subset(inp, unicodes), range(8)):
+                assert data == results
+
+        with pytest.raises(ValueError):
+            batch.subset(inp)
+        with pytest.raises(ValueError):
+            hb.SubsetBatch(face, threads=0)
+        with pytest.raises(ValueError):
+            hb.SubsetBatch(callback_font(blankfont).face)
+
+    def test_subset_cache(self, blankfont, mutatorsans, tmp_path):
+        face = blankfont.face
+        inp = hb.SubsetInput()
+        inp.unicode_set.update([ord("a"), ord("b")])
+        same = hb.SubsetInput()
+        same.unicode_set.update([ord("b"), ord("a")])
+        other = hb.SubsetInput()
+        other.unicode_set.update([ord("a"), ord("b")])
+        other.flags = hb.SubsetFlags.NO_HINTING
+        key = hb.SubsetCache.key(face, inp)
+        assert key == hb.SubsetCache.key(hb.Face(face.blob), same)
+        assert key != hb.SubsetCache.key(face, other)
+        other = hb.SubsetInput()
+        other.unicode_set.update([ord("a"), ord("b")])
+        other.layout_script_tag_set.invert()
+        assert key != hb.SubsetCache.key(face, other)
+
+        # Axis ranges are part of the key
+        pinned = hb.SubsetInput()
+        pinned.pin_axis_location(mutatorsans.face, "wght", 500)
+        assert hb.SubsetCache.key(mutatorsans.face, pinned) != hb.SubsetCache.key(
+            mutatorsans.face, hb.SubsetInput()
+        )
+
+        # Faces that do not list their tables cannot be fingerprinted
+        with pytest.raises(ValueError):
+            hb.SubsetCache.key(callback_font(blankfont).face, inp)
+        tables = {tag: face.reference_table(tag) for tag in face.table_tags}
+        with pytest.raises(ValueError):
+            hb.SubsetCache.key(hb.Face.create_for_table_data(tables.get), inp)
+        closed = hb.Face.create_for_table_data(tables.get, tables)
+        assert hb.SubsetCache.key(closed, inp) == key
+
+        cache = hb.SubsetCache(directory=tmp_path / "subsets")
+        data = cache.subset(face, inp)
+        assert data == hb.subset(face, inp).blob.data
+        assert cache.subset(face, same) is data
+        assert cache.stats == hb.SubsetCacheStats(
+            hits=1, disk_hits=0, misses=1, evictions=0, resident_bytes=len(data)
+        )
+        assert (cache.directory / key).read_bytes() == data
+
+        cache = hb.SubsetCache(directory=tmp_path / "subsets")
+        assert cache.subset(face, inp) == data
+        assert cache.stats.disk_hits == 1
+        assert cache.stats.misses == 0
+
+        cache = hb.SubsetCache()
+        cache.subset(face, inp)
+        cache.subset(face, other)
+        cache.max_bytes = cache.stats.resident_bytes - 1
+        assert len(cache) == 1
+        assert cache.stats.evictions == 1
+        cache.clear()
+        assert len(cache) == 0 and cache.stats.resident_bytes == 0
+        with pytest.raises(ValueError):
+            hb.SubsetCache(max_bytes=-1)
+
+
+class TestPickle:
+    def test_blob(self):
+        blob = hb.Blob.from_file_path(ADOBE_BLANK_TTF_PATH)
+        assert pickle.loads(pickle.dumps(blob)).data == blob.data
+        assert len(pickle.loads(pickle.dumps(hb.Blob()))) == 0
+
+    def test_face(self, mutatorsans):
+        face = pickle.loads(pickle.dumps(mutatorsans.face))
+        assert face.blob.data == mutatorsans.face.blob.data
+        assert face.table_tags == mutatorsans.face.table_tags
+        assert face.axis_infos == mutatorsans.face.axis_infos
+
+    def test_face_from_tables(self, opensans):
+        source = opensans.face
+        tables = {tag: source.reference_table(tag) for tag in source.table_tags}
+        face = pickle.loads(pickle.dumps(hb.Face.create_for_table_data(tables)))
+        assert face.table_tags == source.table_tags
+        assert face.upem == source.upem
+
+        def reference_table(face, tag, user_data):
+            return None
+
+        face = hb.Face.create_for_tables(reference_table, None)
+        with pytest.raises(TypeError):
+            pickle.dumps(face)
+
+    def test_font(self, mutatorsans):
+        mutatorsans.scale = (2000, 1000)
+        mutatorsans.ppem = (16, 16)
+        mutatorsans.ptem = 12.0
+        mutatorsans.synthetic_bold = (0.02, 0.01, True)
+        mutatorsans.synthetic_slant = 0.25
+        mutatorsans.set_variations({"wdth": 250, "wght": 500})
+        font = pickle.loads(pickle.dumps(mutatorsans))
+        assert font.scale == (2000, 1000)
+        assert font.ppem == (16, 16)
+        assert font.ptem == 12.0
+        assert font.synthetic_bold == mutatorsans.synthetic_bold
+        assert font.synthetic_slant == mutatorsans.synthetic_slant
+        assert font.get_var_coords_normalized() == [0.25, 0.5]
+        assert font.get_glyph_h_advance(1) == mutatorsans.get_glyph_h_advance(1)
+
+    def test_fonts_share_face(self, mutatorsans):
+        fonts = pickle.loads(pickle.dumps([mutatorsans, hb.Font(mutatorsans.face)]))
+        assert fonts[0].face is fonts[1].face
+
+    def test_font_custom_funcs(self, blankfont):
+        funcs = hb.FontFuncs.create()
+        blankfont.funcs = funcs
+        with pytest.raises(TypeError):
+            pickle.dumps(blankfont)
+
+    def test_buffer_unshaped(self):
+        buf = hb.Buffer()
+        buf.add_str("abc")
+        buf.guess_segment_properties()
+        buf.cluster_level = hb.BufferClusterLevel.CHARACTERS
+        buf.flags = hb.BufferFlags.BOT | hb.BufferFlags.EOT
+        buf.not_found_glyph = 3
+        copy = pickle.loads(pickle.dumps(buf))
+        assert copy.content_type == hb.BufferContentType.UNICODE
+        assert [(i.codepoint, i.cluster) for i in copy.glyph_infos] == [
+            (i.codepoint, i.cluster) for i in buf.glyph_infos]
+        assert (copy.direction, copy.script, copy.language) == (
+            buf.direction, buf.script, buf.language)
+        assert copy.cluster_level == buf.cluster_level
+        assert copy.flags == buf.flags
+        assert copy.not_found_glyph == 3
+
+    def test_buffer_shaped(self, blankfont):
+        buf = hb.Buffer()
+        buf.add_str("abc")
+        buf.guess_segment_properties()
+        hb.shape(blankfont, buf)
+        copy = pickle.loads(pickle.dumps(buf))
+        assert copy.content_type == hb.BufferContentType.GLYPHS
+        assert [i.position for i in copy.glyph_positions] == [
+            i.position for i in buf.glyph_positions]
+        assert [(i.codepoint, i.cluster, i.flags) for i in copy.glyph_infos] == [
+            (i.codepoint, i.cluster, i.flags) for i in buf.glyph_infos]
+        assert copy.serialize(blankfont) == buf.serialize(blankfont)
+
+    def test_buffer_empty(self):
+        copy = pickle.loads(pickle.dumps(hb.Buffer()))
+        assert len(copy) == 0
+        assert copy.direction == "invalid"
+
+    def test_set(self):
+        s = hb.Set({1, 2, 3, 10})
+        s.add_range(1000, 0x10FFFF)
+        data = pickle.dumps(s)
+        assert len(data) < 200
+        assert pickle.loads(data) == s
+
+    def test_map(self):
+        m = hb.Map({1: 2, 3: 4, 5: 6})
+        assert pickle.loads(pickle.dumps(m)) == m
+
+    def test_shared_memory(self, mutatorsans):
+        blob = mutatorsans.face.blob.to_shared_memory()
+        assert blob.shared_memory_name is not None
+        assert blob.data == mutatorsans.face.blob.data
+        font = hb.Font(hb.Face(blob))
+        font.set_variations({"wght": 500})
+        data = pickle.dumps(font)
+        assert len(data) < 1000 < len(blob)
+        copy = pickle.loads(data)
+        assert copy.face.blob.data == blob.data
+        assert copy.get_var_coords_normalized() == [0, 0.5]
+        # each process maps the segment once
+        copy = pickle.loads(pickle.dumps(blob))
+        assert copy is blob
+
+        assert hb.Blob(b"abc").shared_memory_name is None
+        with pytest.raises(ValueError):
+            hb.Blob().to_shared_memory()
+
+    def test_shared_memory_subprocess(self, mutatorsans):
+        blob = mutatorsans.face.blob.to_shared_memory()
+        font = hb.Font(hb.Face(blob))
+        font.set_variations({"wght": 500})
+        code = (
+            "import pickle, sys\n"
+            "font = pickle.load(sys.stdin.buffer)\n"
+            "print(len(font.face.blob), font.get_var_coords_normalized())\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        # Exiting processes must not unlink the segment they attached
+        for _ in range(2):
+            result = subprocess.run(
+                [sys.executable, "-c", code],
+                input=pickle.dumps(font),
+                capture_output=True,
+                env=env,
+            )
+            assert result.returncode == 0, result.stderr.decode()
+            assert result.stdout.decode().strip() == f"{len(blob)} [0.0, 0.5]"
+
+        # The segment stays mapped after the unpickled blob is destroyed
+        code = (
+            "import gc, pickle, sys, weakref\n"
+            "data = sys.stdin.buffer.read()\n"
+            "ref = weakref.ref(pickle.loads(data))\n"
+            "gc.collect()\n"
+            "print(pickle.loads(data) is ref())\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            input=pickle.dumps(blob),
+            capture_output=True,
+            env=env,
+        )
+        assert result.returncode == 0, result.stderr.decode()
+        assert result.stdout.decode().strip() == "True"
+
+
+class TestFontCollection:
+    def test_faces(self, collection_path):
+        collection = hb.FontCollection(collection_path)
+        assert len(collection) == 3
+        faces = list(collection)
+        assert [face.index for face in faces] == [0, 1, 2]
+        assert all(face.blob.data == collection.blob.data for face in faces)
+        assert collection[0] is faces[0]
+        assert collection[-1] is faces[2]
+        assert [face.upem for face in faces] == [2048, 1000, 1000]
+        assert collection[1:] == faces[1:]
+        assert collection[::-2] == [faces[2], faces[0]]
+        assert collection[5:] == []
+        # Faces not accessed yet are created
+        assert [face.index for face in hb.FontCollection(collection_path)[1:]] == [1, 2]
+        with pytest.raises(IndexError):
+            collection[3]
+        with pytest.raises(TypeError):
+            collection["0"]
+
+    def test_single_font(self):
+        collection = hb.FontCollection(OPEN_SANS_TTF_PATH.read_bytes())
+        assert len(collection) == 1
+        assert collection[0].upem == 2048
+
+    def test_names(self, collection_path):
+        collection = hb.FontCollection(hb.Blob.from_file_path(collection_path))
+        assert collection.postscript_names == {
+            "OpenSans": 0,
+            "AdobeBlank": 1,
+            "MutatorMathTest-LightCondensed": 2,
+        }
+        assert collection.family_names == {"Open Sans": [0], "Adobe Blank": [1]}
+        assert collection.get_face_by_postscript_name("AdobeBlank") is collection[1]
+        assert collection.get_face_by_postscript_name("Missing") is None
+        assert collection.get_faces_by_family_name("Open Sans") == [collection[0]]
+        assert collection.get_faces_by_family_name("Missing") == []
+
+
+class TestFontRegistry:
+    def test_get_face_shared(self):
+        registry = hb.FontRegistry()
+        face = registry.get_face(OPEN_SANS_TTF_PATH)
+        assert registry.get_face(str(OPEN_SANS_TTF_PATH)) is face
+        assert face.upem == 2048
+        stats = registry.stats
+        assert (stats.face_hits, stats.face_misses) == (1, 1)
+        assert stats.resident_bytes == len(face.blob)
+
+    def test_get_face_from_bytes(self):
+        registry = hb.FontRegistry()
+        data = OPEN_SANS_TTF_PATH.read_bytes()
+        face = registry.get_face(data)
+        assert registry.get_face(bytes(data)) is face
+        assert registry.get_face(hb.Blob(data)) is face
+        assert registry.get_face(OPEN_SANS_TTF_PATH) is not face
+        assert len(registry) == 2
+
+    def test_get_font(self):
+        registry = hb.FontRegistry()
+        font = registry.get_font(MUTATOR_SANS_TTF_PATH, scale=(100, 100))
+        assert font.scale == (100, 100)
+        assert registry.get_font(MUTATOR_SANS_TTF_PATH, scale=(100, 100)) is font
+        assert registry.get_font(MUTATOR_SANS_TTF_PATH) is not font
+
+        bold = registry.get_font(MUTATOR_SANS_TTF_PATH, variations={"wght": 1000})
+        assert bold.get_var_coords_normalized() == [0.0, 1.0]
+        assert registry.get_font(
+            MUTATOR_SANS_TTF_PATH, variations={"wght": 1000}) is bold
+        assert bold.face is font.face
+
+        stats = registry.stats
+        assert (stats.font_hits, stats.font_misses) == (2, 3)
+        assert (stats.face_hits, stats.face_misses) == (4, 1)
+
+    def test_eviction(self):
+        size = OPEN_SANS_TTF_PATH.stat().st_size
+        registry = hb.FontRegistry(max_bytes=size)
+        face = registry.get_face(OPEN_SANS_TTF_PATH)
+        registry.get_face(MUTATOR_SANS_TTF_PATH)
+        assert len(registry) == 1
+        assert registry.stats.evictions == 1
+        assert registry.stats.resident_bytes == MUTATOR_SANS_TTF_PATH.stat().st_size
+        assert registry.get_face(OPEN_SANS_TTF_PATH) is not face
+
+    def test_clear(self):
+        registry = hb.FontRegistry()
+        registry.get_font(OPEN_SANS_TTF_PATH)
+        registry.clear()
+        assert len(registry) == 0
+        assert registry.stats.resident_bytes == 0
+        assert registry.stats.face_misses == 1
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(hb.HarfBuzzError):
+            hb.FontRegistry().get_face(tmp_path / "missing.ttf")
+
 
 def test_harfbuzz_version():
     v = hb.version_string()